@@ -13,6 +13,13 @@ remote agent contract:
 It is designed for *playback* and verification of trained DRL policies from Rust
 (TUI/headless backtest/paper) without changing any Rust code.
 
+Transport
+---------
+The server runs on a single `asyncio` event loop (stdlib HTTP/1.1 framing with
+keep-alive). If `uvloop` is installed it is used as the loop implementation.
+SB3 `predict()` calls are offloaded to a bounded thread pool so slow inference
+never blocks socket I/O.
+
 Runtime choice
 --------------
 This server supports:
@@ -27,25 +34,171 @@ No API keys are stored. This server does not require secrets.
 from __future__ import annotations
 
 import argparse
+import array
+import asyncio
+import concurrent.futures
+import functools
 import json
 import os
+import signal
+import socket
+import sys
+import threading
 import time
+import zipfile
 from dataclasses import dataclass
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+try:  # Optional at import-time; required by --runtime sb3 only.
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+try:  # Optional: C-accelerated JSON codec (bytes in/out).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # Optional: typed one-pass decode + validation of act requests.
+    import msgspec  # type: ignore
+except Exception:  # pragma: no cover
+    msgspec = None  # type: ignore
+
+try:  # Optional: faster event loop when available.
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover
+    uvloop = None  # type: ignore
 
 
 HDR_MODEL_PATH = "X-KAIROS-MODEL-PATH"
+SERVER_VERSION = "kairos-agent-drl/0.1"
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+CT_JSON = "application/json; charset=utf-8"
+CT_TEXT = "text/plain; charset=utf-8"
+
+# Discrete(3) action -> (action_type, reason, trades?); interned once at import.
+_ACTIONS = (
+    (sys.intern("HOLD"), sys.intern("sb3_hold"), False),
+    (sys.intern("BUY"), sys.intern("sb3_buy"), True),
+    (sys.intern("SELL"), sys.intern("sb3_sell"), True),
+)
+
+_STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _HttpRequest:
+    method: str
+    path: str
+    version: str
+    headers: dict[str, str]  # lower-cased header names
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        conn = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return conn == "keep-alive"
+        return conn != "close"
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[_HttpRequest]:
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise _BadRequest(400, "malformed request line")
+    method, path, version = parts
+
+    headers: dict[str, str] = {}
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            return None
+        if raw in (b"\r\n", b"\n"):
+            break
+        name, sep, value = raw.decode("latin-1").partition(":")
+        if not sep:
+            raise _BadRequest(400, "malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = await _read_chunked_body(reader)
+    else:
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = 0
+        if length > MAX_BODY_BYTES:
+            raise _BadRequest(413, "body too large")
+        # Content-Length bodies arrive in one buffered read from the stream.
+        body = await reader.readexactly(length) if length > 0 else b""
+    return _HttpRequest(method=method, path=path, version=version, headers=headers, body=body)
+
+
+async def _read_chunked_body(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        size_line = await reader.readline()
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError:
+            raise _BadRequest(400, "malformed chunk size") from None
+        if size == 0:
+            # Skip optional trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        total += size
+        if total > MAX_BODY_BYTES:
+            raise _BadRequest(413, "body too large")
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)  # CRLF after each chunk
+
+
+def _http_response(status: int, body: bytes, content_type: str, *, keep_alive: bool) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_STATUS_REASONS.get(status, 'Unknown')}\r\n"
+        f"Server: {SERVER_VERSION}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _json_body(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 
-def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _elapsed_ms(t0_ns: int) -> int:
+    return (time.monotonic_ns() - t0_ns) // 1_000_000
 
 
 def _hold(reason: str, model_version: Optional[str] = None, latency_ms: int = 0) -> dict:
@@ -59,14 +212,45 @@ def _hold(reason: str, model_version: Optional[str] = None, latency_ms: int = 0)
     }
 
 
-def _read_json_body(handler: BaseHTTPRequestHandler) -> Tuple[Optional[dict], Optional[str]]:
+if msgspec is not None:
+
+    class _ActSpec(msgspec.Struct):
+        observation: list[float] = []
+
+    class _ActBatchSpec(msgspec.Struct):
+        items: list[_ActSpec] = []
+
+    # strict=False keeps the contract's numeric-string coercion ("3" -> 3.0).
+    _SPEC_DECODERS: dict[str, Any] = {
+        "/v1/act": msgspec.json.Decoder(_ActSpec, strict=False),
+        "/v1/act_batch": msgspec.json.Decoder(_ActBatchSpec, strict=False),
+    }
+else:  # pragma: no cover
+    _SPEC_DECODERS = {}
+
+
+def _decode_spec(path: str, raw: bytes) -> Any:
+    """
+    Decode and validate a well-formed act request in a single C pass.
+
+    Returns None when msgspec is unavailable or the body does not match the
+    typed schema (nulls, bools, non-object roots, ...); callers then use the
+    generic JSON path, which keeps the per-item HOLD/400 semantics.
+    """
+    decoder = _SPEC_DECODERS.get(path)
+    if decoder is None:
+        return None
     try:
-        length = int(handler.headers.get("Content-Length", "0"))
-    except ValueError:
-        length = 0
-    raw = handler.rfile.read(length) if length > 0 else b"{}"
+        return decoder.decode(raw or b"{}")
+    except msgspec.DecodeError:
+        return None
+
+
+def _read_json_body(raw: bytes) -> Tuple[Optional[dict], Optional[str]]:
+    if not raw:
+        raw = b"{}"
     try:
-        obj = json.loads(raw.decode("utf-8"))
+        obj = _json_loads(raw)
     except Exception:
         return None, "invalid_json"
     if not isinstance(obj, dict):
@@ -74,54 +258,211 @@ def _read_json_body(handler: BaseHTTPRequestHandler) -> Tuple[Optional[dict], Op
     return obj, None
 
 
-def _normalize_observation(request: dict) -> Optional[list[float]]:
+def _normalize_observation(request: dict) -> Optional[array.array]:
     obs = request.get("observation", [])
     if not isinstance(obs, list):
         return None
-    out: list[float] = []
-    for x in obs:
-        try:
-            out.append(float(x))
-        except Exception:
-            return None
-    return out
+    # array('d') coerces numeric lists in C and exposes a buffer numpy copies
+    # without re-boxing; mixed content (e.g. numeric strings) goes through float().
+    try:
+        return array.array("d", obs)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        return array.array("d", map(float, obs))
+    except (TypeError, ValueError, OverflowError):
+        return None
 
 
 class _Policy:
-    def predict(self, obs: list[float]) -> Tuple[int, Optional[float]]:
+    def predict(self, obs: Sequence[float]) -> Tuple[int, Optional[float]]:
         raise NotImplementedError
 
+    def predict_batch(self, batch: list[Sequence[float]]) -> list[Tuple[int, Optional[float]]]:
+        return [self.predict(obs) for obs in batch]
+
     def model_version(self) -> str:
         return "unknown"
 
 
+# 0=HOLD, 1=BUY, 2=SELL
+_MOCK_HOLD = (0, 1.0)
+_MOCK_FLAT = (0, 0.5)
+_MOCK_BUY = (1, 0.55)
+_MOCK_SELL = (2, 0.55)
+
+
 class _MockPolicy(_Policy):
     def __init__(self, mode: str) -> None:
         self.mode = (mode or "hold").strip().lower()
+        # Resolve the mode once instead of string-comparing on every request.
+        self._decide = self._momentum if self.mode == "momentum" else self._hold
+        self._model_version = sys.intern(f"mock:{self.mode}")
+
+    @staticmethod
+    def _hold(obs: Sequence[float]) -> Tuple[int, Optional[float]]:
+        return _MOCK_HOLD
 
-    def predict(self, obs: list[float]) -> Tuple[int, Optional[float]]:
-        # 0=HOLD, 1=BUY, 2=SELL
-        if self.mode == "hold":
-            return 0, 1.0
-        if self.mode == "momentum":
-            x = obs[0] if obs else 0.0
-            if x > 0:
-                return 1, 0.55
-            if x < 0:
-                return 2, 0.55
-            return 0, 0.5
-        return 0, 1.0
+    @staticmethod
+    def _momentum(obs: Sequence[float]) -> Tuple[int, Optional[float]]:
+        x = obs[0] if obs else 0.0
+        if x > 0:
+            return _MOCK_BUY
+        if x < 0:
+            return _MOCK_SELL
+        return _MOCK_FLAT
+
+    def predict(self, obs: Sequence[float]) -> Tuple[int, Optional[float]]:
+        return self._decide(obs)
+
+    def predict_batch(self, batch: list[Sequence[float]]) -> list[Tuple[int, Optional[float]]]:
+        decide = self._decide
+        return [decide(obs) for obs in batch]
 
     def model_version(self) -> str:
-        return f"mock:{self.mode}"
+        return self._model_version
+
+
+# Off-policy algorithms keep their own policies module; PPO/A2C share
+# `common.policies`, so those are told apart by hyperparameters they persist.
+_SB3_POLICY_MODULES = (
+    ("stable_baselines3.dqn.", "dqn"),
+    ("stable_baselines3.sac.", "sac"),
+    ("stable_baselines3.td3.", "td3"),
+)
+_SB3_ALGO_KEYS = (
+    ("clip_range", "ppo"),
+    ("policy_delay", "td3"),
+    ("target_entropy", "sac"),
+    ("exploration_fraction", "dqn"),
+    ("n_steps", "a2c"),
+)
+
+
+def _sb3_algo_from_zip(path: Path) -> Optional[str]:
+    """Best-effort algo name from the `data` JSON header of an SB3 `.zip`."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            meta = json.loads(zf.read("data"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if not isinstance(meta, dict):
+        return None
+
+    policy_class = meta.get("policy_class")
+    module = policy_class.get("__module__", "") if isinstance(policy_class, dict) else ""
+    for prefix, name in _SB3_POLICY_MODULES:
+        if module.startswith(prefix):
+            return name
+    for key, name in _SB3_ALGO_KEYS:
+        if key in meta:
+            return name
+    return None
 
 
 class _Sb3Policy(_Policy):
-    def __init__(self, model_path: Path, algo: str, device: str) -> None:
+    def __init__(
+        self,
+        model_path: Path,
+        algo: str,
+        device: str,
+        max_batch: int = 1,
+        precision: str = "fp32",
+    ) -> None:
+        if np is None:  # pragma: no cover
+            raise RuntimeError("numpy is not installed. Install it to use --runtime sb3.")
         self.model_path = model_path
+        self._model_version = sys.intern(f"sb3:{model_path.name}")
         self.algo = algo
         self.device = device
+        self.max_batch = max(1, int(max_batch))
+        # predict() may run on several executor threads; one scratch buffer each.
+        self._local = threading.local()
         self._model = self._load_model(model_path, algo=algo, device=device)
+        self._torch = None
+        self._torch_device = None
+        self._torch_policy = self._direct_forward_policy()
+        self._cuda = self._torch_device is not None and self._torch_device.type == "cuda"
+        self._dev_dtype = None
+        self.precision = precision
+        if precision != "fp32":
+            self._apply_precision(precision)
+
+    def _direct_forward_policy(self):
+        """
+        Return the underlying torch policy when we can call it directly.
+
+        `model.predict()` re-validates shapes, converts numpy->tensor and
+        back, and toggles training mode on every call. For the Discrete
+        action / flat Box observation policies we serve, calling
+        `policy._predict()` under `torch.inference_mode()` is equivalent.
+        Anything else keeps the generic `model.predict()` path.
+        """
+        policy = getattr(self._model, "policy", None)
+        if policy is None or not hasattr(policy, "_predict"):
+            return None
+        action_space = getattr(policy, "action_space", None)
+        obs_shape = getattr(getattr(policy, "observation_space", None), "shape", None)
+        if type(action_space).__name__ != "Discrete" or obs_shape is None or len(obs_shape) != 1:
+            return None
+        try:
+            import torch  # type: ignore
+        except Exception:  # pragma: no cover
+            return None
+        policy.set_training_mode(False)
+        self._torch = torch
+        self._torch_device = policy.device
+        return policy
+
+    def _apply_precision(self, precision: str) -> None:
+        policy = self._torch_policy
+        if policy is None:
+            raise ValueError(
+                f"--precision {precision} requires a Discrete-action policy over flat Box observations"
+            )
+        torch = self._torch
+        if precision == "int8":
+            if self._cuda:
+                raise ValueError("--precision int8 is CPU-only (use fp16 with --device cuda)")
+            # Dynamic quantization: int8 Linear weights, activations quantized on the fly.
+            self._torch_policy = torch.ao.quantization.quantize_dynamic(
+                policy, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        elif precision == "fp16":
+            if not self._cuda:
+                raise ValueError("--precision fp16 requires --device cuda")
+            self._torch_policy = policy.half()
+            # The fp32 pinned scratch is cast during the H2D copy.
+            self._dev_dtype = torch.float16
+        else:
+            raise ValueError("unsupported --precision (use: fp32|fp16|int8)")
+
+    def _fill_scratch(self, batch: list[Sequence[float]]) -> "np.ndarray":
+        rows = len(batch)
+        dim = len(batch[0])
+        buf = getattr(self._local, "scratch", None)
+        if buf is None or buf.shape[1] != dim or buf.shape[0] < rows:
+            buf = self._alloc_scratch(max(self.max_batch, rows), dim)
+        view = buf[:rows]
+        # Raises ValueError on ragged rows, like np.asarray would.
+        view[...] = batch
+        return view
+
+    def _alloc_scratch(self, rows: int, dim: int) -> "np.ndarray":
+        if not self._cuda:
+            buf = np.empty((rows, dim), dtype=np.float32)
+        else:
+            # Scratch lives in pinned host memory so the H2D copy can be async;
+            # each thread also gets its own device buffer and CUDA stream.
+            torch = self._torch
+            device = self._torch_device
+            host = torch.empty((rows, dim), dtype=torch.float32, pin_memory=True)
+            self._local.host = host
+            self._local.dev = torch.empty((rows, dim), dtype=self._dev_dtype or torch.float32, device=device)
+            self._local.stream = torch.cuda.Stream(device=device)
+            buf = host.numpy()
+        self._local.scratch = buf
+        return buf
 
     def _load_model(self, path: Path, algo: str, device: str):
         try:
@@ -145,30 +486,65 @@ class _Sb3Policy(_Policy):
                 raise ValueError("unsupported --algo (use: auto|ppo|sac|dqn|a2c|td3)")
             return cls.load(str(path), device=device)
 
-        # Auto-detect by trying common loaders.
-        last_err: Optional[Exception] = None
-        for name, cls in algos.items():
-            try:
-                return cls.load(str(path), device=device)
-            except Exception as err:  # noqa: PERF203
-                last_err = err
-                continue
-        raise RuntimeError(f"failed to load sb3 model: {last_err}")
+        detected = _sb3_algo_from_zip(path)
+        if detected is None:
+            raise RuntimeError(
+                f"could not detect the sb3 algorithm from {path}; pass --algo ppo|sac|dqn|a2c|td3"
+            )
+        try:
+            return algos[detected].load(str(path), device=device)
+        except Exception as err:
+            raise RuntimeError(f"failed to load sb3 model as {detected}: {err}") from err
 
-    def predict(self, obs: list[float]) -> Tuple[int, Optional[float]]:
-        import numpy as np  # type: ignore
+    def _predict_actions(self, x: "np.ndarray") -> "np.ndarray":
+        policy = self._torch_policy
+        if policy is not None and self._cuda:
+            torch = self._torch
+            rows = x.shape[0]
+            local = self._local
+            with torch.cuda.stream(local.stream):
+                obs = local.dev[:rows]
+                obs.copy_(local.host[:rows], non_blocking=True)
+                with torch.inference_mode():
+                    actions = policy._predict(obs, deterministic=True)
+                out = actions.to("cpu", non_blocking=True)
+            local.stream.synchronize()
+            return out.numpy().reshape(rows, -1)[:, 0]
+        if policy is not None:
+            torch = self._torch
+            obs = torch.from_numpy(x).to(self._torch_device)
+            with torch.inference_mode():
+                actions = policy._predict(obs, deterministic=True)
+            return actions.cpu().numpy().reshape(x.shape[0], -1)[:, 0]
+        actions, _state = self._model.predict(x, deterministic=True)
+        return np.asarray(actions).reshape(x.shape[0], -1)[:, 0]
 
-        x = np.asarray(obs, dtype=np.float32)
-        # SB3 expects batch or single obs depending on algo; handle both.
-        action, _state = self._model.predict(x, deterministic=True)
-        try:
-            a = int(action)  # scalar
-        except Exception:
-            a = int(action[0])  # array-like
-        return a, None
+    def predict(self, obs: Sequence[float]) -> Tuple[int, Optional[float]]:
+        # Always a (1, D) batch so SB3 treats it as a vectorized observation.
+        a = self._predict_actions(self._fill_scratch([obs]))[0]
+        return int(a), None
+
+    def predict_batch(self, batch: list[Sequence[float]]) -> list[Tuple[int, Optional[float]]]:
+        # One (B, D) forward pass instead of B single-row calls.
+        actions = self._predict_actions(self._fill_scratch(batch))
+        return [(int(a), None) for a in actions]
+
+    def predict_dense(self, rows: list[list]) -> list[Tuple[int, Optional[float]]]:
+        """
+        Predict straight from raw JSON observation lists.
+
+        numpy coerces the nested lists into the scratch buffer in one C pass,
+        skipping per-item normalization. JSON `null` becomes NaN there, so any
+        NaN rejects the batch and the caller falls back to the per-item path.
+        """
+        x = self._fill_scratch(rows)
+        if np.isnan(x).any():
+            raise ValueError("observation contains null/NaN")
+        actions = self._predict_actions(x)
+        return [(int(a), None) for a in actions]
 
     def model_version(self) -> str:
-        return f"sb3:{self.model_path.name}"
+        return self._model_version
 
 
 @dataclass
@@ -176,95 +552,329 @@ class ServerState:
     policy: _Policy
     size: float
 
-    def act(self, request: dict, latency_ms: int) -> dict:
-        obs = _normalize_observation(request)
+    def act(self, request: dict, t0_ns: int) -> dict:
+        """`t0_ns` is the request's `time.monotonic_ns()`; latency is measured from it."""
+        return self.act_obs(_normalize_observation(request), t0_ns)
+
+    def act_obs(self, obs: Optional[Sequence[float]], t0_ns: int) -> dict:
+        mv = self.policy.model_version()
         if obs is None:
-            return _hold("invalid_obs", model_version=self.policy.model_version(), latency_ms=latency_ms)
+            return _hold("invalid_obs", model_version=mv, latency_ms=_elapsed_ms(t0_ns))
 
-        start = time.perf_counter()
         try:
             action, confidence = self.policy.predict(obs)
         except Exception:
-            return _hold("predict_error", model_version=self.policy.model_version(), latency_ms=latency_ms)
-        infer_ms = int((time.perf_counter() - start) * 1000.0)
-
-        # Map Discrete(3): 0=HOLD,1=BUY,2=SELL
-        if action == 1:
-            action_type = "BUY"
-            size = float(self.size)
-            reason = "sb3_buy"
-        elif action == 2:
-            action_type = "SELL"
-            size = float(self.size)
-            reason = "sb3_sell"
-        else:
-            action_type = "HOLD"
-            size = 0.0
-            reason = "sb3_hold"
+            return _hold("predict_error", model_version=mv, latency_ms=_elapsed_ms(t0_ns))
+        return self.action_response(action, confidence, latency_ms=_elapsed_ms(t0_ns), model_version=mv)
 
+    def action_response(
+        self, action: int, confidence: Optional[float], latency_ms: int, *, model_version: str
+    ) -> dict:
+        # Map Discrete(3): 0=HOLD,1=BUY,2=SELL; anything else holds.
+        action_type, reason, trades = _ACTIONS[action] if action in (1, 2) else _ACTIONS[0]
         return {
             "action_type": action_type,
-            "size": size,
+            "size": float(self.size) if trades else 0.0,
             "confidence": confidence,
-            "model_version": self.policy.model_version(),
-            "latency_ms": int(infer_ms or latency_ms or 0),
+            "model_version": model_version,
+            "latency_ms": int(latency_ms),
             "reason": reason,
         }
 
+    def act_batch(self, items: list, t0_ns: int) -> list[dict]:
+        dense = self._act_batch_dense(items, t0_ns)
+        if dense is not None:
+            return dense
 
-class Handler(BaseHTTPRequestHandler):
-    server_version = "kairos-agent-drl/0.1"
+        mv = self.policy.model_version()
+        out_items: list[Optional[dict]] = [None] * len(items)
+        invalid: list[tuple[int, str]] = []
+        valid_idx: list[int] = []
+        valid_obs: list[Sequence[float]] = []
+        for i, item in enumerate(items):
+            if not isinstance(item, dict):
+                invalid.append((i, "invalid_item"))
+                continue
+            obs = _normalize_observation(item)
+            if obs is None:
+                invalid.append((i, "invalid_obs"))
+                continue
+            valid_idx.append(i)
+            valid_obs.append(obs)
 
-    def do_GET(self):  # noqa: N802
-        if self.path == "/health":
-            body = b"OK\n"
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
-        self.send_error(404, "not found")
+        if valid_obs:
+            try:
+                results = self.policy.predict_batch(valid_obs)
+            except Exception:
+                # e.g. ragged observations: degrade to per-item predictions.
+                for i in valid_idx:
+                    out_items[i] = self.act(items[i], t0_ns)
+            else:
+                latency_ms = _elapsed_ms(t0_ns)
+                for i, (action, confidence) in zip(valid_idx, results):
+                    out_items[i] = self.action_response(action, confidence, latency_ms=latency_ms, model_version=mv)
+        if invalid:
+            latency_ms = _elapsed_ms(t0_ns)
+            for i, reason in invalid:
+                out_items[i] = _hold(reason, model_version=mv, latency_ms=latency_ms)
+        return out_items  # type: ignore[return-value]
 
-    def do_POST(self):  # noqa: N802
-        if self.path not in ("/v1/act", "/v1/act_batch"):
-            self.send_error(404, "not found")
-            return
+    def act_rows(self, rows: list[list[float]], t0_ns: int) -> list[dict]:
+        """Batch of observations that already passed typed validation."""
+        out = self._predict_rows(rows, t0_ns)
+        if out is not None:
+            return out
+        return [self.act_obs(array.array("d", row), t0_ns) for row in rows]
 
-        start = time.perf_counter()
-        request, err = _read_json_body(self)
-        if err is not None or request is None:
-            _json_response(self, 400, {"error": err or "invalid_request"})
-            return
+    def _act_batch_dense(self, items: list, t0_ns: int) -> Optional[list[dict]]:
+        """Fast path when every item is valid: one (B, D) array built directly from the JSON lists."""
+        if getattr(self.policy, "predict_dense", None) is None or not items:
+            return None
+        try:
+            rows = [item["observation"] for item in items]
+        except (TypeError, KeyError):
+            return None
+        if not all(type(row) is list for row in rows):
+            return None
+        return self._predict_rows(rows, t0_ns)
+
+    def _predict_rows(self, rows: list[list], t0_ns: int) -> Optional[list[dict]]:
+        if not rows:
+            return []
+        predict = getattr(self.policy, "predict_dense", None) or self.policy.predict_batch
+        try:
+            results = predict(rows)
+        except Exception:
+            return None
+        latency_ms = _elapsed_ms(t0_ns)
+        mv = self.policy.model_version()
+        return [
+            self.action_response(action, confidence, latency_ms=latency_ms, model_version=mv)
+            for action, confidence in results
+        ]
+
+
+class _MicroBatcher:
+    """
+    Coalesces concurrent `/v1/act` observations into one `predict_batch()` call.
+
+    The first queued observation opens a window of up to `max_wait_s`; the
+    window closes early once `max_batch` observations are pending. With
+    `max_wait_s == 0` only requests that are already queued get coalesced,
+    so sequential clients see no added latency.
+    """
+
+    def __init__(
+        self,
+        policy: _Policy,
+        *,
+        max_batch: int,
+        max_wait_s: float,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        self.policy = policy
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = max(0.0, float(max_wait_s))
+        self._executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def predict(self, obs: Sequence[float]) -> Tuple[int, Optional[float]]:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._full = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((obs, fut))
+        if self._queue.qsize() >= self.max_batch:
+            assert self._full is not None
+            self._full.set()
+        return await fut
+
+    async def _run(self) -> None:
+        assert self._queue is not None and self._full is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_wait_s > 0.0 and self._queue.qsize() < self.max_batch - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_wait_s)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                results = await self._predict_batch(loop, [obs for obs, _ in batch])
+            except Exception as err:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(err)
+                    continue
+                # e.g. one ragged observation: re-run each on its own so only the bad ones fail.
+                for obs, fut in batch:
+                    try:
+                        (result,) = await self._predict_batch(loop, [obs])
+                    except Exception as item_err:
+                        if not fut.done():
+                            fut.set_exception(item_err)
+                    else:
+                        if not fut.done():
+                            fut.set_result(result)
+                continue
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    async def _predict_batch(self, loop, obs_list: list[Sequence[float]]) -> list[Tuple[int, Optional[float]]]:
+        if self._executor is None:
+            return self.policy.predict_batch(obs_list)
+        return await loop.run_in_executor(self._executor, self.policy.predict_batch, obs_list)
+
+
+class AgentServer:
+    """
+    Minimal HTTP/1.1 server for the agent contract on top of `asyncio` streams.
+
+    Connections are kept alive until the client closes them (or sends
+    `Connection: close`), so the Rust `reqwest` pool reuses sockets across bars.
+    HTTP/1.1 pipelining is supported; responses are written in request order.
+    """
+
+    def __init__(
+        self,
+        state: ServerState,
+        executor: Optional[concurrent.futures.Executor] = None,
+        batcher: Optional[_MicroBatcher] = None,
+    ) -> None:
+        self.state = state
+        self._executor = executor
+        self._batcher = batcher
 
-        server = self.server  # type: ignore[assignment]
-        state: ServerState = server.state  # type: ignore[attr-defined]
-        latency_ms = int((time.perf_counter() - start) * 1000.0)
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            # Small JSON responses must not sit behind Nagle's algorithm.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            # Pipelined requests are answered in order: each loop iteration
+            # consumes exactly one request from the stream buffer.
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except _BadRequest as err:
+                    writer.write(_http_response(err.status, f"{err}\n".encode("utf-8"), CT_TEXT, keep_alive=False))
+                    await writer.drain()
+                    break
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if req is None:
+                    break
+
+                try:
+                    status, content_type, body = await self.dispatch(req)
+                except Exception:
+                    status, content_type, body = 500, CT_JSON, _json_body({"error": "internal_error"})
+                writer.write(_http_response(status, body, content_type, keep_alive=req.keep_alive))
+                await writer.drain()
+                if not req.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, req: _HttpRequest) -> Tuple[int, str, bytes]:
+        if req.method == "GET":
+            if req.path == "/health":
+                return 200, CT_TEXT, b"OK\n"
+            return 404, CT_TEXT, b"not found\n"
+        if req.method != "POST":
+            return 405, CT_TEXT, b"method not allowed\n"
+        if req.path not in ("/v1/act", "/v1/act_batch"):
+            return 404, CT_TEXT, b"not found\n"
+
+        t0_ns = time.monotonic_ns()
+        state = self.state
+        spec = _decode_spec(req.path, req.body)
+        if spec is not None:
+            if req.path == "/v1/act_batch":
+                rows = [item.observation for item in spec.items]
+                out_items = await self._offload(state.act_rows, rows, t0_ns)
+                return 200, CT_JSON, _json_body({"items": out_items})
+            obs = array.array("d", spec.observation)
+            return 200, CT_JSON, _json_body(await self._act_obs(obs, t0_ns))
+
+        request, err = _read_json_body(req.body)
+        if err is not None or request is None:
+            return 400, CT_JSON, _json_body({"error": err or "invalid_request"})
 
         # Optional: allow per-request override for experiments.
-        override = self.headers.get(HDR_MODEL_PATH)
+        override = req.headers.get(HDR_MODEL_PATH.lower())
         if override:
             # We keep this simple: ignore override unless runtime is sb3 and path exists.
             pass
 
-        if self.path == "/v1/act_batch":
+        if req.path == "/v1/act_batch":
             items = request.get("items", [])
             if not isinstance(items, list):
-                _json_response(self, 400, {"error": "invalid_items"})
-                return
-            out_items = []
-            for item in items:
-                if not isinstance(item, dict):
-                    out_items.append(_hold("invalid_item", model_version=state.policy.model_version(), latency_ms=latency_ms))
-                else:
-                    out_items.append(state.act(item, latency_ms=latency_ms))
-            _json_response(self, 200, {"items": out_items})
-            return
+                return 400, CT_JSON, _json_body({"error": "invalid_items"})
+            out_items = await self._offload(state.act_batch, items, t0_ns)
+            return 200, CT_JSON, _json_body({"items": out_items})
+
+        return 200, CT_JSON, _json_body(await self._act_obs(_normalize_observation(request), t0_ns))
 
-        _json_response(self, 200, state.act(request, latency_ms=latency_ms))
+    async def _act_obs(self, obs: Optional[Sequence[float]], t0_ns: int) -> dict:
+        if self._batcher is not None:
+            return await self._act_coalesced(obs, t0_ns)
+        return await self._offload(self.state.act_obs, obs, t0_ns)
 
-    def log_message(self, fmt, *args):  # noqa: N802
+    async def _act_coalesced(self, obs: Optional[Sequence[float]], t0_ns: int) -> dict:
+        assert self._batcher is not None
+        state = self.state
+        mv = state.policy.model_version()
+        if obs is None:
+            return _hold("invalid_obs", model_version=mv, latency_ms=_elapsed_ms(t0_ns))
+        try:
+            action, confidence = await self._batcher.predict(obs)
+        except Exception:
+            return _hold("predict_error", model_version=mv, latency_ms=_elapsed_ms(t0_ns))
+        return state.action_response(action, confidence, latency_ms=_elapsed_ms(t0_ns), model_version=mv)
+
+
+async def serve(
+    server: AgentServer,
+    host: str,
+    port: int,
+    *,
+    on_ready: Optional[Callable[[asyncio.AbstractServer], None]] = None,
+    reuse_port: bool = False,
+) -> None:
+    # With reuse_port every worker process binds its own listening socket on the
+    # same port and the kernel load-balances accepted connections between them.
+    srv = await asyncio.start_server(
+        server.handle_connection, host, port, reuse_port=reuse_port or None
+    )
+    if on_ready is not None:
+        on_ready(srv)
+    async with srv:
+        await srv.serve_forever()
+
+
+def _run_event_loop(coro) -> None:
+    if uvloop is not None:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(coro)
         return
+    asyncio.run(coro)
 
 
 def main() -> int:
@@ -275,31 +885,141 @@ def main() -> int:
     parser.add_argument("--model-path", default=None, help="SB3 .zip path (required for --runtime sb3).")
     parser.add_argument("--algo", default="auto", help="SB3 algorithm: auto|ppo|sac|dqn|a2c|td3")
     parser.add_argument("--device", default="cpu", help="SB3 device: cpu|cuda|auto")
+    parser.add_argument(
+        "--precision",
+        default="fp32",
+        choices=["fp32", "fp16", "int8"],
+        help="SB3 inference precision: fp32, fp16 (cuda only) or int8 dynamic quantization (cpu only).",
+    )
     parser.add_argument("--mock-mode", default="hold", choices=["hold", "momentum"])
     parser.add_argument("--size", type=float, default=1.0, help="Order size passed to Rust (interpreted by size_mode).")
+    parser.add_argument(
+        "--predict-threads",
+        type=int,
+        default=4,
+        help="Thread pool size for SB3 predict() calls (keeps the event loop responsive).",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=32,
+        help="Max /v1/act observations coalesced into one SB3 predict() call (1 disables batching).",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=0.0,
+        help="How long the first queued /v1/act waits for peers before predicting (0 = no added latency).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes sharing the port via SO_REUSEPORT (each loads its own model; >1 sidesteps the GIL).",
+    )
     args = parser.parse_args()
 
     if args.runtime == "sb3":
         if not args.model_path:
             raise SystemExit("--model-path is required for --runtime sb3")
-        model_path = Path(args.model_path)
-        if not model_path.exists():
-            raise SystemExit(f"model not found: {model_path}")
-        policy: _Policy = _Sb3Policy(model_path=model_path, algo=args.algo.lower(), device=args.device)
-    else:
-        policy = _MockPolicy(mode=args.mock_mode)
+        if not Path(args.model_path).exists():
+            raise SystemExit(f"model not found: {args.model_path}")
+
+    workers = max(1, int(args.workers))
+    if workers > 1:
+        if not hasattr(socket, "SO_REUSEPORT") or not hasattr(os, "fork"):
+            raise SystemExit("--workers > 1 requires SO_REUSEPORT and fork() (Linux/BSD)")
+        if int(args.port) == 0:
+            raise SystemExit("--workers > 1 requires an explicit --port")
+
+    # Fork before loading the model or starting any threads/event loop so every
+    # worker owns a clean interpreter (own GIL, own torch threads, own policy).
+    children: list[int] = []
+    for worker_id in range(1, workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(args, worker_id=worker_id, workers=workers)
+            except KeyboardInterrupt:
+                pass
+            except BaseException as e:  # pragma: no cover - surfaced on stderr
+                print(f"agent-drl: worker {worker_id} failed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                os._exit(code)
+        children.append(pid)
+    if children:
+        # Turn SIGTERM into a normal exit so the parent reaps its workers below.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
 
-    state = ServerState(policy=policy, size=float(args.size))
-    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
-    httpd.state = state  # type: ignore[attr-defined]
-    print(f"agent-drl: listening on http://{args.host}:{args.port} runtime={args.runtime} model={policy.model_version()}")
     try:
-        httpd.serve_forever()
+        _run_worker(args, worker_id=0, workers=workers)
     except KeyboardInterrupt:
         pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
     return 0
 
 
+def _run_worker(args: argparse.Namespace, *, worker_id: int, workers: int) -> None:
+    if args.runtime == "sb3":
+        policy: _Policy = _Sb3Policy(
+            model_path=Path(args.model_path),
+            algo=args.algo.lower(),
+            device=args.device,
+            max_batch=max(1, int(args.max_batch)),
+            precision=args.precision,
+        )
+    else:
+        policy = _MockPolicy(mode=args.mock_mode)
+
+    state = ServerState(policy=policy, size=float(args.size))
+    # The mock policy is a few comparisons; only offload real inference.
+    executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    if args.runtime == "sb3":
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(args.predict_threads)),
+            thread_name_prefix="agent-drl-predict",
+        )
+    batcher: Optional[_MicroBatcher] = None
+    if args.runtime == "sb3" and int(args.max_batch) > 1:
+        batcher = _MicroBatcher(
+            policy,
+            max_batch=int(args.max_batch),
+            max_wait_s=float(args.max_wait_ms) / 1000.0,
+            executor=executor,
+        )
+    server = AgentServer(state, executor=executor, batcher=batcher)
+
+    def on_ready(_srv) -> None:
+        if worker_id != 0:
+            return
+        loop_name = "uvloop" if uvloop is not None else "asyncio"
+        print(
+            f"agent-drl: listening on http://{args.host}:{args.port} runtime={args.runtime} "
+            f"model={policy.model_version()} loop={loop_name} workers={workers}",
+            flush=True,
+        )
+
+    try:
+        _run_event_loop(
+            serve(server, args.host, args.port, on_ready=on_ready, reuse_port=workers > 1)
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
 
@@ -3,19 +3,49 @@ import argparse
 import json
 import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+try:  # Optional: C-accelerated JSON codec (bytes in/out).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_HDR_JSON_PREFIX = b"Content-Type: application/json; charset=utf-8\r\nContent-Length: "
+_HDR_200_PREFIX = b"HTTP/1.1 200 OK\r\n" + _HDR_JSON_PREFIX
+
+def _json_body(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+    _json_response_bytes(handler, status, _json_body(payload))
+
+
+def _json_response_bytes(handler: BaseHTTPRequestHandler, status: int, body: bytes) -> None:
+    # Status line, headers and body leave in one write (one send() per reply).
+    if status == 200:
+        head = _HDR_200_PREFIX
+    else:
+        reason = handler.responses.get(status, ("",))[0]
+        head = b"HTTP/1.1 %d %s\r\n" % (status, reason.encode("latin-1")) + _HDR_JSON_PREFIX
+    tail = b"\r\nConnection: close\r\n\r\n" if handler.close_connection else b"\r\n\r\n"
+    handler.wfile.write(b"".join((head, b"%d" % len(body), tail, body)))
 
 
 class Handler(BaseHTTPRequestHandler):
     server_version = "kairos-agent-dummy/0.1"
+    # Keep-alive: the backtester reuses one connection across bars. Every response sets
+    # Content-Length, and idle connections are dropped after `timeout` seconds.
+    protocol_version = "HTTP/1.1"
+    timeout = 30
 
     def do_GET(self):  # noqa: N802
         if self.path == "/health":
@@ -34,14 +64,17 @@ class Handler(BaseHTTPRequestHandler):
             return
 
         start = time.perf_counter()
-        try:
-            length = int(self.headers.get("Content-Length", "0"))
-        except ValueError:
+        length = self.headers.get("Content-Length")
+        if length and length.isdigit() and "Transfer-Encoding" not in self.headers:
+            length = int(length)
+        else:
+            # No usable Content-Length: close, or unread body bytes would be parsed as the next request.
             length = 0
+            self.close_connection = True
         raw = self.rfile.read(length) if length > 0 else b"{}"
 
         try:
-            request = json.loads(raw.decode("utf-8"))
+            request = _json_loads(raw)
         except Exception:
             _json_response(self, 400, {"error": "invalid_json"})
             return
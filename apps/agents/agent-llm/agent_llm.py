@@ -1,97 +1,382 @@
 #!/usr/bin/env python3
 import argparse
+import array
+import asyncio
 import datetime as _dt
+import functools
 import hashlib
+import http.client
+import io
+import itertools
 import json
+import math
+import operator
 import os
 import random
+import signal
+import socket
+import sqlite3
+import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Optional, Tuple, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Tuple, Dict, Any, Callable, Mapping
 
+try:  # Optional: C-accelerated JSON codec (bytes in/out).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 PROMPT_VERSION = "v1"
 MAX_REASON_CHARS = 2000
 HDR_LLM_PROVIDER = "X-KAIROS-LLM-PROVIDER"
 HDR_LLM_API_KEY = "X-KAIROS-LLM-API-KEY"
 HDR_LLM_MODEL = "X-KAIROS-LLM-MODEL"
+MAX_BODY_BYTES = 16 * 1024 * 1024
+_HDR_JSON_PREFIX = b"Content-Type: application/json; charset=utf-8\r\nContent-Length: "
+_HDR_200_PREFIX = b"HTTP/1.1 200 OK\r\n" + _HDR_JSON_PREFIX
+_HEALTH_OK = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-8\r\nContent-Length: 3\r\n\r\nOK\n"
+_HEALTH_OK_CLOSE = _HEALTH_OK.replace(b"\r\n\r\n", b"\r\nConnection: close\r\n\r\n")
+
+# Mock decisions are read-only and shared by every call.
+_MOCK_SELL = MappingProxyType({"action_type": "SELL", "size": 0.25, "confidence": 0.55, "reason": "mock: sell"})
+_MOCK_BUY = MappingProxyType({"action_type": "BUY", "size": 0.25, "confidence": 0.55, "reason": "mock: buy"})
+_MOCK_HOLD = MappingProxyType({"action_type": "HOLD", "size": 0.0, "confidence": 0.55, "reason": "mock: hold"})
 
 
 def _utc_now_iso() -> str:
     return _dt.datetime.now(tz=_dt.timezone.utc).isoformat()
 
 
+def _json_body(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+    _json_response_bytes(handler, status, _json_body(payload))
+
 
+def _http_json_response(status: int, body: bytes, *, keep_alive: bool) -> bytes:
+    # Status line, headers and body as one buffer, so a reply is a single send().
+    if status == 200:
+        head = _HDR_200_PREFIX
+    else:
+        reason = BaseHTTPRequestHandler.responses.get(status, ("",))[0]
+        head = b"HTTP/1.1 %d %s\r\n" % (status, reason.encode("latin-1")) + _HDR_JSON_PREFIX
+    tail = b"\r\n\r\n" if keep_alive else b"\r\nConnection: close\r\n\r\n"
+    return b"".join((head, b"%d" % len(body), tail, body))
 
-def _canonical_json(obj: dict) -> str:
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
+def _json_response_bytes(handler: BaseHTTPRequestHandler, status: int, body: bytes) -> None:
+    handler.wfile.write(_http_json_response(status, body, keep_alive=not handler.close_connection))
 
-def _sha256_hex(data: str) -> str:
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
 
+def _canonical_json_bytes(obj: dict) -> bytes:
+    # Always stdlib json: request hashes key the on-disk replay cache, so the exact bytes must not
+    # depend on whether orjson is installed (float formatting differs between the two).
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
-def _clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
+
+def _cache_path(cache_dir: str, run_id: str) -> str:
+    return os.path.join(cache_dir, run_id, "agent_llm_cache.sqlite")
 
 
 class Cache:
+    """
+    Per-run record/replay store: one SQLite table (WAL journal) keyed by request hash.
+
+    Lookups go through the primary-key index instead of loading the whole history, and a put is a
+    single autocommitted INSERT on a long-lived connection. With WAL and `synchronous=NORMAL` a commit
+    is an append to the WAL without an fsync, so a killed process loses no record and other readers
+    (`--export-cache`) see it at once; only an OS crash can drop the most recent commits. A run recorded
+    with the former JSONL cache (same path with a `.jsonl` suffix) is imported on first open;
+    `export_jsonl` writes that format back out.
+    """
+
     def __init__(self, path: str) -> None:
         self.path = path
-        self._items = {}  # request_hash -> response dict
+        self.legacy_jsonl_path = os.path.splitext(path)[0] + ".jsonl"
+        self._db: Optional[sqlite3.Connection] = None
         self._loaded = False
+        self._lock = threading.Lock()  # one connection shared by the handler threads
 
-    def load(self) -> None:
-        if self._loaded:
+    def _open(self, create: bool) -> None:
+        # Caller holds self._lock.
+        if self._db is not None:
+            return
+        if not create and self._loaded:
             return
         self._loaded = True
-        if not os.path.exists(self.path):
+        if not create and not os.path.exists(self.path) and not os.path.exists(self.legacy_jsonl_path):
             return
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except Exception:
-                        continue
-                    h = rec.get("request_hash")
-                    resp = rec.get("response")
-                    if isinstance(h, str) and isinstance(resp, dict):
-                        self._items[h] = resp
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "request_hash TEXT PRIMARY KEY, response BLOB NOT NULL, created_at TEXT, meta BLOB)"
+            )
+            self._db = db
+            self._import_legacy_jsonl()
         except Exception:
             # If cache is unreadable, proceed without it (best-effort).
+            self._db = None
+
+    def _import_legacy_jsonl(self) -> None:
+        if not os.path.exists(self.legacy_jsonl_path):
             return
+        if self._db.execute("SELECT 1 FROM cache LIMIT 1").fetchone() is not None:
+            return
+        rows = []
+        with open(self.legacy_jsonl_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = _json_loads(line)
+                except Exception:
+                    continue
+                h = rec.pop("request_hash", None)
+                resp = rec.pop("response", None)
+                if isinstance(h, str) and isinstance(resp, dict):
+                    created_at = rec.pop("created_at", None)
+                    rows.append((h, _json_body(resp), created_at, _json_body(rec)))
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+
+    def load(self) -> None:
+        with self._lock:
+            self._open(create=False)
+
+    def get_bytes(self, request_hash: str) -> Optional[bytes]:
+        """The cached response exactly as stored: a JSON object ready to be sent as a body."""
+        with self._lock:
+            self._open(create=False)
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT response FROM cache WHERE request_hash = ?", (request_hash,)).fetchone()
+        return bytes(row[0]) if row is not None else None
 
     def get(self, request_hash: str):
-        self.load()
-        return self._items.get(request_hash)
-
-    def put(self, request_hash: str, response: dict, meta: dict) -> None:
-        self.load()
-        self._items[request_hash] = response
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        rec = {
-            "request_hash": request_hash,
-            "response": response,
-            "created_at": _utc_now_iso(),
-        }
-        rec.update(meta)
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(_canonical_json(rec))
-            f.write("\n")
+        raw = self.get_bytes(request_hash)
+        return _json_loads(raw) if raw is not None else None
+
+    def put(self, request_hash: str, response: dict | bytes, meta: dict) -> None:
+        body = response if isinstance(response, bytes) else _json_body(response)
+        with self._lock:
+            self._open(create=True)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (request_hash, body, _utc_now_iso(), _json_body(meta)),
+            )
+
+    def export_jsonl(self, out) -> int:
+        """Write every record as one canonical JSON line (the former on-disk format) to a binary stream."""
+        with self._lock:
+            self._open(create=False)
+            if self._db is None:
+                return 0
+            rows = self._db.execute("SELECT request_hash, response, created_at, meta FROM cache ORDER BY rowid").fetchall()
+        for request_hash, response, created_at, meta in rows:
+            rec = {"request_hash": request_hash, "response": _json_loads(response), "created_at": created_at}
+            rec.update(_json_loads(meta) if meta else {})
+            out.write(_canonical_json_bytes(rec) + b"\n")
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _unit_vector(values) -> Optional[Tuple[float, ...]]:
+    vec = tuple(values)
+    norm = math.hypot(*vec)
+    if not (0.0 < norm < math.inf):
+        return None
+    return tuple(v / norm for v in vec)
+
+
+class SemanticCache:
+    """Near-duplicate tier in front of the LLM: reuses the response of the most similar recent observation.
+
+    Keys are (run_id, symbol, timeframe); each keeps the last `window` raw named-feature vectors. Features
+    live on very different scales (returns vs. raw-price SMAs vs. RSI), so cosine similarity is taken after
+    standardizing every dimension with the mean/std of the stored window; constant dimensions are ignored
+    and nothing is reused until `min_entries` decisions give those statistics some support. In-memory only.
+    """
+
+    min_entries = 16
+
+    def __init__(self, threshold: float, window: int) -> None:
+        self.threshold = float(threshold)
+        self.window = max(1, int(window))
+        self._entries: Dict[Tuple[str, str, str], deque] = {}
+        # key -> (dims, means, stds, standardized unit vectors of the entries); rebuilt after each add
+        self._scaled: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def _standardized(self, key: Tuple[str, str, str], dim: int):
+        scaled = self._scaled.get(key)
+        if scaled is None or scaled[0] != dim:
+            rows = [(vec, body) for vec, body in self._entries.get(key, ()) if len(vec) == dim]
+            if len(rows) < self.min_entries:
+                return None
+            n = float(len(rows))
+            means = [math.fsum(col) / n for col in zip(*(vec for vec, _ in rows))]
+            stds = [
+                math.sqrt(math.fsum((x - m) ** 2 for x in col) / n)
+                for col, m in zip(zip(*(vec for vec, _ in rows)), means)
+            ]
+            keep = [i for i, sd in enumerate(stds) if sd > 0.0]
+            scaled = (dim, keep, means, stds, [])
+            for vec, body in rows:
+                unit = _unit_vector((vec[i] - means[i]) / stds[i] for i in keep)
+                if unit is not None:
+                    scaled[4].append((unit, body))
+            self._scaled[key] = scaled
+        return scaled
+
+    def lookup(self, key: Tuple[str, str, str], vec: Tuple[float, ...]) -> Optional[bytes]:
+        with self._lock:
+            scaled = self._standardized(key, len(vec))
+        if scaled is None:
+            return None
+        _, keep, means, stds, entries = scaled
+        query = _unit_vector((vec[i] - means[i]) / stds[i] for i in keep)
+        if query is None:
+            return None
+        best, hit = self.threshold, None
+        for other, body in reversed(entries):  # newest first wins ties
+            sim = sum(map(operator.mul, query, other))
+            if sim > best:
+                best, hit = sim, body
+        return hit
+
+    def add(self, key: Tuple[str, str, str], vec: Tuple[float, ...], body: bytes) -> None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries is None:
+                entries = self._entries[key] = deque(maxlen=self.window)
+            entries.append((vec, body))
+            self._scaled.pop(key, None)
+
+
+class _Endpoint:
+    """A POST target parsed once: connection key plus request target."""
+
+    __slots__ = ("url", "scheme", "host", "port", "target")
+
+    def __init__(self, url: str) -> None:
+        parts = urllib.parse.urlsplit(url)
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname or ""
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+
+class HttpPool:
+    """
+    Keep-alive HTTP(S) connections shared by the LLM provider clients.
+
+    Each call checks an idle `http.client` connection out for the duration of one request, so the
+    TCP/TLS handshake to the provider is paid once per connection instead of once per LLM call.
+    Error statuses raise `urllib.error.HTTPError`, like `urlopen`. Hosts routed through a proxy
+    (`*_proxy` env vars) go through `urllib.request` instead.
+    """
+
+    def __init__(self, timeout_s: float, max_idle_per_host: int = 8) -> None:
+        self.timeout_s = timeout_s
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+
+    def _connect(self, ep: _Endpoint) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if ep.scheme == "https" else http.client.HTTPConnection
+        return cls(ep.host, ep.port, timeout=self.timeout_s)
+
+    def _checkout(self, key: Tuple[str, str, int]) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _checkin(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close the idle keep-alive connections (once no call is in flight)."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _post_urllib(self, ep: _Endpoint, body: bytes, headers: Dict[str, str]) -> bytes:
+        req = urllib.request.Request(url=ep.url, data=body, method="POST", headers=headers)
+        with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            return resp.read()
+
+    def post(self, ep: _Endpoint, body: bytes, headers: Dict[str, str]) -> bytes:
+        if ep.scheme in self._proxies and not urllib.request.proxy_bypass(ep.host):
+            return self._post_urllib(ep, body, headers)
+
+        key = (ep.scheme, ep.host, ep.port)
+        conn = self._checkout(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._connect(ep)
+            try:
+                conn.request("POST", ep.target, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+                # The provider closed an idle keep-alive connection; retry once on a fresh one.
+                conn, reused = None, False
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(ep.url, resp.status, resp.reason, resp.headers, io.BytesIO(data))
+        return data
 
 
 class GeminiClient:
@@ -102,22 +387,23 @@ class GeminiClient:
         temperature: float,
         max_output_tokens: int,
         http_timeout_s: float,
+        http: Optional[HttpPool] = None,
     ) -> None:
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
         self.max_output_tokens = max_output_tokens
         self.http_timeout_s = http_timeout_s
-
-    def generate_json(self, prompt: str) -> Tuple[str, int]:
+        self.http = http if http is not None else HttpPool(http_timeout_s)
         # Gemini Generative Language API endpoint (v1beta).
-        url = (
+        self.endpoint = _Endpoint(
             "https://generativelanguage.googleapis.com/v1beta/models/"
             + urllib.parse.quote(self.model, safe="")
             + ":generateContent?key="
             + urllib.parse.quote(self.api_key, safe="")
         )
 
+    def generate_json(self, prompt: str) -> Tuple[str, int]:
         body = {
             "contents": [{"role": "user", "parts": [{"text": prompt}]}],
             "generationConfig": {
@@ -129,13 +415,11 @@ class GeminiClient:
         headers = {"Content-Type": "application/json; charset=utf-8"}
 
         def do_request(req_body: dict) -> Tuple[dict, int]:
-            raw = json.dumps(req_body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-            req = urllib.request.Request(url=url, data=raw, method="POST", headers=headers)
+            raw = _json_body(req_body)
             start = time.perf_counter()
-            with urllib.request.urlopen(req, timeout=self.http_timeout_s) as resp:
-                latency_ms = int((time.perf_counter() - start) * 1000.0)
-                payload = json.loads(resp.read().decode("utf-8"))
-            return payload, latency_ms
+            data = self.http.post(self.endpoint, raw, headers)
+            latency_ms = int((time.perf_counter() - start) * 1000.0)
+            return _json_loads(data), latency_ms
 
         try:
             payload, latency_ms = do_request(body)
@@ -177,6 +461,7 @@ class OpenAIClient:
         http_timeout_s: float,
         base_url: str,
         json_mode: bool,
+        http: Optional[HttpPool] = None,
     ) -> None:
         self.api_key = api_key
         self.model = model
@@ -185,10 +470,11 @@ class OpenAIClient:
         self.http_timeout_s = http_timeout_s
         self.base_url = base_url.rstrip("/")
         self.json_mode = json_mode
+        self.http = http if http is not None else HttpPool(http_timeout_s)
+        # Use Chat Completions for broad compatibility.
+        self.endpoint = _Endpoint(f"{self.base_url}/chat/completions")
 
     def generate_json(self, prompt: str) -> Tuple[str, int]:
-        # Use Chat Completions for broad compatibility.
-        url = f"{self.base_url}/chat/completions"
         headers = {
             "Content-Type": "application/json; charset=utf-8",
             "Authorization": f"Bearer {self.api_key}",
@@ -203,13 +489,11 @@ class OpenAIClient:
         if self.json_mode:
             body["response_format"] = {"type": "json_object"}
 
-        raw = json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-        req = urllib.request.Request(url=url, data=raw, method="POST", headers=headers)
-
+        raw = _json_body(body)
         start = time.perf_counter()
-        with urllib.request.urlopen(req, timeout=self.http_timeout_s) as resp:
-            latency_ms = int((time.perf_counter() - start) * 1000.0)
-            payload = json.loads(resp.read().decode("utf-8"))
+        data = self.http.post(self.endpoint, raw, headers)
+        latency_ms = int((time.perf_counter() - start) * 1000.0)
+        payload = _json_loads(data)
 
         text = ""
         try:
@@ -225,21 +509,23 @@ class OpenAIClient:
 def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
     if not isinstance(text, str):
         return None
-    text = text.strip()
-    if not text:
-        return None
-    if text.startswith("{") and text.endswith("}"):
-        try:
-            obj = json.loads(text)
-            return obj if isinstance(obj, dict) else None
-        except Exception:
-            return None
+    # Common case: the provider honoured JSON mode and the whole reply is the object
+    # (both codecs accept surrounding whitespace).
+    try:
+        obj = _json_loads(text)
+    except Exception:
+        obj = None
+    if isinstance(obj, dict):
+        return obj
+    # Otherwise take the outermost {...} span (prose or code fences around the object).
     start = text.find("{")
     end = text.rfind("}")
     if start == -1 or end == -1 or end <= start:
         return None
+    if start == 0 and end == len(text) - 1:
+        return None  # already tried as a whole
     try:
-        obj = json.loads(text[start : end + 1])
+        obj = _json_loads(text[start : end + 1])
         return obj if isinstance(obj, dict) else None
     except Exception:
         return None
@@ -268,48 +554,31 @@ def _parse_csv_ints(s: str) -> list[int]:
     return out
 
 
-def _name_observation(obs: list, args: argparse.Namespace) -> Dict[str, float]:
-    values = []
-    for x in obs:
-        try:
-            v = float(x)
-        except Exception:
-            v = 0.0
-        values.append(v)
-
-    sma_windows = _parse_csv_ints(args.sma_windows)
-    vol_windows = _parse_csv_ints(args.volatility_windows)
-    base_count = 1 + len(sma_windows) + len(vol_windows) + (1 if args.rsi_enabled else 0)
-    sentiment_dim = 0
-    if args.sentiment_dim != "auto":
-        try:
-            sentiment_dim = max(0, int(args.sentiment_dim))
-        except Exception:
-            sentiment_dim = 0
-    else:
-        sentiment_dim = max(0, len(values) - base_count)
-
-    named = {}
-    idx = 0
-    named["ret"] = values[idx] if idx < len(values) else 0.0
-    idx += 1
-    for w in sma_windows:
-        named[f"sma_{w}"] = values[idx] if idx < len(values) else 0.0
-        idx += 1
-    for w in vol_windows:
-        named[f"vol_{w}"] = values[idx] if idx < len(values) else 0.0
-        idx += 1
-    if args.rsi_enabled:
-        named["rsi_14"] = values[idx] if idx < len(values) else 0.0
-        idx += 1
-    for i in range(sentiment_dim):
-        named[f"sentiment_{i}"] = values[idx] if idx < len(values) else 0.0
-        idx += 1
-
-    return named
-
-
-def _build_prompt(request: Dict[str, Any], named_features: Dict[str, float], args: argparse.Namespace) -> str:
+def _name_observation(obs: list, server: "Server") -> Dict[str, float]:
+    # array('d') coerces an all-numeric list in one C pass; anything else
+    # (None, numeric strings, ...) goes element-wise, non-numbers become 0.0.
+    try:
+        values = array.array("d", obs).tolist()
+    except (TypeError, ValueError, OverflowError):
+        values = []
+        for x in obs:
+            try:
+                v = float(x)
+            except Exception:
+                v = 0.0
+            values.append(v)
+
+    sentiment_dim = server._sentiment_dim
+    if sentiment_dim is None:  # "auto": whatever follows the base features
+        sentiment_dim = max(0, len(values) - server._base_count)
+    keys = server._feature_keys(sentiment_dim)
+    if len(values) < len(keys):
+        values.extend([0.0] * (len(keys) - len(values)))
+    return dict(zip(keys, values))
+
+
+def _prompt_input_json(request: Dict[str, Any], named_features: Dict[str, float], server: "Server") -> str:
+    """Canonical JSON of one prompt INPUT object: the constant schema/constraints prefix plus the per-bar fields."""
     portfolio = request.get("portfolio_state") if isinstance(request.get("portfolio_state"), dict) else {}
     header = {
         "timestamp": request.get("timestamp"),
@@ -319,19 +588,8 @@ def _build_prompt(request: Dict[str, Any], named_features: Dict[str, float], arg
         "api_version": request.get("api_version"),
         "feature_version": request.get("feature_version"),
     }
-    schema = _feature_schema_fingerprint(args)
-
-    instructions = (
-        "You are a trading decision engine.\n"
-        "Return ONLY valid JSON with keys: action_type, size, confidence, reason.\n"
-        "action_type must be one of BUY, SELL, HOLD.\n"
-        "size must be a non-negative number.\n"
-        "If uncertain, return HOLD with size=0.\n"
-    )
-    if args.size_mode == "pct_equity":
-        instructions += "For pct_equity, size must be between 0 and 1.\n"
 
-    payload = {
+    varying = {
         "header": header,
         "portfolio_state": {
             "cash": portfolio.get("cash"),
@@ -340,17 +598,30 @@ def _build_prompt(request: Dict[str, Any], named_features: Dict[str, float], arg
             "equity": portfolio.get("equity"),
         },
         "features": named_features,
-        "feature_schema": schema,
-        "constraints": {
-            "size_mode": args.size_mode,
-            "max_size": args.max_size,
-        },
     }
-    return instructions + "\nINPUT:\n" + _canonical_json(payload)
+    # These keys all sort after "constraints" and "feature_schema", so splicing them after the
+    # precomputed prefix yields the same bytes as dumping the whole object with sort_keys.
+    tail = json.dumps(varying, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return server._prompt_input_prefix + tail[1:]
+
+
+def _build_prompt(request: Dict[str, Any], named_features: Dict[str, float], server: "Server") -> str:
+    return server._prompt_prefix + _prompt_input_json(request, named_features, server)
+
+
+def _build_batch_prompt(entries: list, server: "Server") -> str:
+    """One prompt for several (request, named_features) entries; the reply is `{"decisions": [...]}`."""
+    return (
+        server._batch_instructions
+        + f"INPUT contains {len(entries)} items.\n"
+        + "\nINPUT:\n["
+        + ",".join(_prompt_input_json(request, named, server) for request, named in entries)
+        + "]"
+    )
 
 
 def _normalize_llm_decision(
-    obj: Dict[str, Any], args: argparse.Namespace
+    obj: Mapping[str, Any], args: argparse.Namespace
 ) -> Tuple[str, float, Optional[float], Optional[str]]:
     action_type = str(obj.get("action_type", "HOLD")).upper().strip()
     if action_type not in ("BUY", "SELL", "HOLD"):
@@ -361,11 +632,13 @@ def _normalize_llm_decision(
         size = float(size)
     except Exception:
         size = 0.0
-    if not (size >= 0.0) or not (size < float("inf")):
+    if not math.isfinite(size) or size <= 0.0:  # also folds -0.0 to 0.0
         size = 0.0
 
     if args.size_mode == "pct_equity":
-        size = _clamp(size, 0.0, float(args.max_size))
+        max_size = float(args.max_size)
+        if size > max_size:
+            size = max_size if max_size > 0.0 else 0.0
 
     confidence = obj.get("confidence", None)
     if confidence is not None:
@@ -373,7 +646,7 @@ def _normalize_llm_decision(
             confidence = float(confidence)
         except Exception:
             confidence = None
-        if confidence is not None and (not (0.0 <= confidence <= 1.0) or not (confidence < float("inf"))):
+        if confidence is not None and not (0.0 <= confidence <= 1.0):  # also rejects NaN
             confidence = None
 
     reason = obj.get("reason", None)
@@ -385,34 +658,64 @@ def _normalize_llm_decision(
     return action_type, size, confidence, reason
 
 
+_Decision = Tuple[Mapping[str, Any], Optional[str], Optional[int], bool]
+_MISSING_API_KEY = MappingProxyType({"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": "missing_api_key"})
+_LLM_ERROR = MappingProxyType({"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": "llm_error"})
+
+
+class _Pending:
+    """A request that passed cadence and missed the caches, waiting for a decision."""
+
+    __slots__ = ("request", "key", "req_hash", "cache", "semantic_vec", "_named")
+
+    def __init__(self, request: dict, key: Tuple[str, str, str], req_hash: str, cache: Cache) -> None:
+        self.request = request
+        self.key = key
+        self.req_hash = req_hash
+        self.cache = cache
+        self.semantic_vec: Optional[Tuple[float, ...]] = None
+        self._named: Optional[Dict[str, float]] = None
+
+    def named_features(self, server: "Server") -> Dict[str, float]:
+        if self._named is None:
+            obs = self.request.get("observation", [])
+            self._named = _name_observation(obs if isinstance(obs, list) else [], server)
+        return self._named
+
+
 class Handler(BaseHTTPRequestHandler):
     server_version = "kairos-agent-llm/0.1"
+    # Keep-alive: the backtester reuses one connection across bars. Every response sets
+    # Content-Length, and idle connections are dropped after `timeout` seconds.
+    protocol_version = "HTTP/1.1"
+    timeout = 30
+
+    _POST_ROUTES = {"/v1/act": "_act_single_post", "/v1/act_batch": "_act_batch_post"}
 
     def do_GET(self):  # noqa: N802
         if self.path == "/health":
-            body = b"OK\n"
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+            self.wfile.write(_HEALTH_OK_CLOSE if self.close_connection else _HEALTH_OK)
             return
         self.send_error(404, "not found")
 
     def do_POST(self):  # noqa: N802
-        if self.path not in ("/v1/act", "/v1/act_batch"):
+        route = self._POST_ROUTES.get(self.path)
+        if route is None:
             self.send_error(404, "not found")
             return
 
         start = time.perf_counter()
-        try:
-            length = int(self.headers.get("Content-Length", "0"))
-        except ValueError:
+        length = self.headers.get("Content-Length")
+        if length and length.isdigit() and "Transfer-Encoding" not in self.headers:
+            length = int(length)
+        else:
+            # No usable Content-Length: close, or unread body bytes would be parsed as the next request.
             length = 0
-        raw = self.rfile.read(length) if length > 0 else b"{}"
+            self.close_connection = True
+        raw = self.rfile.read(length) if length else b"{}"
 
         try:
-            request = json.loads(raw.decode("utf-8"))
+            request = _json_loads(raw)
         except Exception:
             _json_response(self, 400, {"error": "invalid_json"})
             return
@@ -421,72 +724,148 @@ class Handler(BaseHTTPRequestHandler):
             _json_response(self, 400, {"error": "invalid_request"})
             return
 
-        server = self.server  # type: ignore[assignment]
-        latency_ms = int((time.perf_counter() - start) * 1000.0)
-        llm_provider = self.headers.get(HDR_LLM_PROVIDER)
-        llm_api_key = self.headers.get(HDR_LLM_API_KEY)
-        llm_model = self.headers.get(HDR_LLM_MODEL)
+        getattr(self, route)(request, int((time.perf_counter() - start) * 1000.0))
 
-        if self.path == "/v1/act_batch":
-            items = request.get("items", [])
-            if not isinstance(items, list):
-                _json_response(self, 400, {"error": "invalid_items"})
-                return
-            out_items = []
-            for idx, item in enumerate(items):
-                if not isinstance(item, dict):
-                    out_items.append(server.hold_response(reason="batch_invalid_item"))
-                    continue
-                # Evaluate only the last item (most recent); earlier items are holds.
-                if idx == len(items) - 1:
-                    out_items.append(
-                        server.act_single(
-                            item,
-                            latency_ms=latency_ms,
-                            llm_provider=llm_provider,
-                            llm_api_key=llm_api_key,
-                            llm_model=llm_model,
-                        )
-                    )
-                else:
-                    out_items.append(server.hold_response(reason="batch_hold"))
-            _json_response(self, 200, {"items": out_items})
-            return
+    def _act_single_post(self, request: dict, latency_ms: int) -> None:
+        headers = self.headers
+        body = self.server.act_single_bytes(  # type: ignore[attr-defined]
+            request,
+            latency_ms=latency_ms,
+            llm_provider=headers.get(HDR_LLM_PROVIDER),
+            llm_api_key=headers.get(HDR_LLM_API_KEY),
+            llm_model=headers.get(HDR_LLM_MODEL),
+        )
+        _json_response_bytes(self, 200, body)
 
-        _json_response(
-            self,
-            200,
-            server.act_single(
-                request,
-                latency_ms=latency_ms,
-                llm_provider=llm_provider,
-                llm_api_key=llm_api_key,
-                llm_model=llm_model,
-            ),
+    def _act_batch_post(self, request: dict, latency_ms: int) -> None:
+        items = request.get("items", [])
+        if not isinstance(items, list):
+            _json_response(self, 400, {"error": "invalid_items"})
+            return
+        headers = self.headers
+        # Items are already-encoded JSON objects (cache hits are passed through untouched).
+        out_items = self.server.act_batch_bytes(  # type: ignore[attr-defined]
+            items,
+            latency_ms=latency_ms,
+            llm_provider=headers.get(HDR_LLM_PROVIDER),
+            llm_api_key=headers.get(HDR_LLM_API_KEY),
+            llm_model=headers.get(HDR_LLM_MODEL),
         )
+        _json_response_bytes(self, 200, b'{"items":[' + b",".join(out_items) + b"]}")
 
     def log_message(self, fmt, *args):  # noqa: N802
         return
 
 
 class Server(ThreadingHTTPServer):
-    def __init__(self, addr, handler, args: argparse.Namespace) -> None:
-        super().__init__(addr, handler)
+    def __init__(self, addr, handler, args: argparse.Namespace, bind_and_activate: bool = True) -> None:
+        # bind_and_activate=False keeps only the agent state (used by the asyncio front end).
+        super().__init__(addr, handler, bind_and_activate)
         self.args = args
-        self._counters = {}  # (run_id, symbol, timeframe) -> int
+        # Connections are served by a fixed set of long-lived threads instead of one new thread per
+        # connection; with keep-alive each worker serves a client's whole session.
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-llm")
+        self._active: set = set()  # sockets currently being served
+        self._counters = {}  # (run_id, symbol, timeframe) -> itertools.count
+        self._eval_every = int(args.eval_every_n_bars)
+        self._hash_prefixes: Dict[Tuple[str, str], Any] = {}  # (provider, model) -> hashlib.sha256
         self._caches = {}  # run_id -> Cache
         self._rng = random.Random(0)
 
         self.http_timeout_s = float(os.environ.get("KAIROS_LLM_HTTP_TIMEOUT_S", "10"))
+        # One keep-alive pool for every provider client of this server.
+        self.http = HttpPool(self.http_timeout_s)
+        self._clients: Dict[Tuple[str, str, str], Any] = {}  # (provider, model, sha256(api_key)) -> client
+        self._clients_lock = threading.Lock()
+        # Returned between LLM evaluations (most bars), so encode it once.
+        self._cadence_hold_body = _json_body(self.hold_response(reason="cadence_hold"))
+
+        # Everything below depends only on args; build it once instead of per LLM call.
+        self._feature_schema = _feature_schema_fingerprint(args)
+        constant_input = {
+            "constraints": {"size_mode": args.size_mode, "max_size": args.max_size},
+            "feature_schema": self._feature_schema,
+        }
+        # '{"constraints":...,"feature_schema":...,' -- the per-bar fields are appended by _prompt_input_json.
+        self._prompt_input_prefix = json.dumps(constant_input, sort_keys=True, separators=(",", ":"), ensure_ascii=False)[:-1] + ","
+        rules = (
+            "action_type must be one of BUY, SELL, HOLD.\n"
+            "size must be a non-negative number.\n"
+            "If uncertain, return HOLD with size=0.\n"
+        )
+        if args.size_mode == "pct_equity":
+            rules += "For pct_equity, size must be between 0 and 1.\n"
+        self._instructions = (
+            "You are a trading decision engine.\n"
+            "Return ONLY valid JSON with keys: action_type, size, confidence, reason.\n" + rules
+        )
+        self._prompt_prefix = self._instructions + "\nINPUT:\n"
+        self._batch_instructions = (
+            "You are a trading decision engine.\n"
+            "INPUT is a JSON array of independent decision requests.\n"
+            'Return ONLY valid JSON of the form {"decisions": [...]} with exactly one decision per INPUT item, '
+            "in the same order; each decision has keys: action_type, size, confidence, reason.\n" + rules
+        )
+        self._record = args.cache_mode in ("record_replay", "record")
+
+        self._sma_windows = tuple(_parse_csv_ints(args.sma_windows))
+        self._vol_windows = tuple(_parse_csv_ints(args.volatility_windows))
+        self._base_keys = (
+            ["ret"]
+            + [f"sma_{w}" for w in self._sma_windows]
+            + [f"vol_{w}" for w in self._vol_windows]
+            + (["rsi_14"] if args.rsi_enabled else [])
+        )
+        self._base_count = len(self._base_keys)
+        self._sentiment_dim: Optional[int] = None  # None -> "auto"
+        if args.sentiment_dim != "auto":
+            try:
+                self._sentiment_dim = max(0, int(args.sentiment_dim))
+            except Exception:
+                self._sentiment_dim = 0
+        self._feature_keys_by_dim: Dict[int, list[str]] = {}  # sentiment_dim -> feature names
+
+        self._semantic: Optional[SemanticCache] = None
+        if args.cache_semantic == "on":
+            self._semantic = SemanticCache(args.sim_threshold, args.cache_semantic_window)
+
+    def _feature_keys(self, sentiment_dim: int) -> list[str]:
+        keys = self._feature_keys_by_dim.get(sentiment_dim)
+        if keys is None:
+            keys = self._base_keys + [f"sentiment_{i}" for i in range(sentiment_dim)]
+            keys = self._feature_keys_by_dim.setdefault(sentiment_dim, keys)
+        return keys
 
     def _cache_for_run(self, run_id: str) -> Cache:
         cache = self._caches.get(run_id)
         if cache is not None:
             return cache
-        path = os.path.join(self.args.cache_dir, run_id, "agent_llm_cache.jsonl")
-        cache = Cache(path)
-        self._caches[run_id] = cache
-        return cache
+        # setdefault keeps one Cache per run when handler threads race (a Cache opens lazily).
+        return self._caches.setdefault(run_id, Cache(_cache_path(self.args.cache_dir, run_id)))
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._serve_connection, request, client_address)
+
+    def _serve_connection(self, request, client_address) -> None:
+        self._active.add(request)
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            self._active.discard(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Wake workers blocked on idle keep-alive connections so the pool drains promptly.
+        for sock in list(self._active):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._pool.shutdown(wait=True)
+        self.http.close()
+        for cache in list(self._caches.values()):
+            cache.close()
 
     def hold_response(self, reason: str) -> dict:
         payload = {
@@ -500,40 +879,62 @@ class Server(ThreadingHTTPServer):
         return payload
 
     def _should_eval(self, key: tuple[str, str, str]) -> bool:
-        n = int(self.args.eval_every_n_bars)
+        n = self._eval_every
         if n <= 0:
             return True
-        c = self._counters.get(key, 0)
-        self._counters[key] = c + 1
-        return (c % n) == 0
+        # setdefault + next() are single C calls, so concurrent handler
+        # threads never lose an increment.
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters.setdefault(key, itertools.count())
+        return (next(counter) % n) == 0
+
+    def _hash_prefix(self, provider: str, model: str):
+        """sha256 state after the request-independent part of the hash envelope, one per (provider, model).
+
+        The canonical envelope sorts as agent, feature_schema, prompt_version, request, so everything up to
+        `"request":` is fixed for a given provider/model and only the request bytes are hashed per call.
+        """
+        h = self._hash_prefixes.get((provider, model))
+        if h is None:
+            envelope = {
+                "prompt_version": PROMPT_VERSION,
+                "agent": {
+                    "provider": provider,
+                    "model": model,
+                    "temperature": float(self.args.temperature),
+                    "max_output_tokens": int(self.args.max_output_tokens),
+                    "eval_every_n_bars": int(self.args.eval_every_n_bars),
+                    "size_mode": self.args.size_mode,
+                    "max_size": float(self.args.max_size),
+                },
+                "feature_schema": self._feature_schema,
+            }
+            if self._semantic is not None:
+                # Semantic hits are recorded under the request hash; keep them apart from exact answers.
+                envelope["agent"]["cache_semantic"] = {
+                    "sim_threshold": self._semantic.threshold,
+                    "window": self._semantic.window,
+                }
+            h = hashlib.sha256(_canonical_json_bytes(envelope)[:-1] + b',"request":')
+            h = self._hash_prefixes.setdefault((provider, model), h)
+        return h
 
     def _request_hash(self, request: dict, provider: str, model: str) -> str:
-        envelope = {
-            "prompt_version": PROMPT_VERSION,
-            "agent": {
-                "provider": provider,
-                "model": model,
-                "temperature": float(self.args.temperature),
-                "max_output_tokens": int(self.args.max_output_tokens),
-                "eval_every_n_bars": int(self.args.eval_every_n_bars),
-                "size_mode": self.args.size_mode,
-                "max_size": float(self.args.max_size),
-            },
-            "feature_schema": _feature_schema_fingerprint(self.args),
-            "request": request,
-        }
-        return _sha256_hex(_canonical_json(envelope))
-
-    def _mock_decision(self, request_hash: str) -> dict:
-        # Deterministic mock: use hash prefix as seed for stable pseudo-decisions.
-        seed = int(request_hash[:8], 16)
-        rng = random.Random(seed)
-        x = rng.random()
-        if x < 0.10:
-            return {"action_type": "SELL", "size": 0.25, "confidence": 0.55, "reason": "mock: sell"}
-        if x < 0.20:
-            return {"action_type": "BUY", "size": 0.25, "confidence": 0.55, "reason": "mock: buy"}
-        return {"action_type": "HOLD", "size": 0.0, "confidence": 0.55, "reason": "mock: hold"}
+        h = self._hash_prefix(provider, model).copy()
+        h.update(_canonical_json_bytes(request))
+        h.update(b"}")
+        return h.hexdigest()
+
+    def _mock_decision(self, request_hash: str) -> Mapping[str, Any]:
+        # Deterministic mock: the first hash byte is uniform, so 26/256 and
+        # 51/256 give ~10% sells and ~10% buys without seeding a PRNG.
+        x = int(request_hash[:2], 16)
+        if x < 26:
+            return _MOCK_SELL
+        if x < 51:
+            return _MOCK_BUY
+        return _MOCK_HOLD
 
     def _resolve_llm_settings(
         self,
@@ -563,6 +964,7 @@ class Server(ThreadingHTTPServer):
                 temperature=float(self.args.temperature),
                 max_output_tokens=int(self.args.max_output_tokens),
                 http_timeout_s=self.http_timeout_s,
+                http=self.http,
             )
         if provider == "openai":
             return OpenAIClient(
@@ -573,9 +975,21 @@ class Server(ThreadingHTTPServer):
                 http_timeout_s=self.http_timeout_s,
                 base_url=self.args.openai_base_url,
                 json_mode=bool(self.args.openai_json_mode),
+                http=self.http,
             )
         raise ValueError(f"unsupported provider: {provider}")
 
+    def _provider_client(self, provider: str, model: str, api_key: str):
+        key = (provider, model, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._make_provider(provider, model, api_key)
+            return client
+
     def act_single(
         self,
         request: dict,
@@ -584,59 +998,146 @@ class Server(ThreadingHTTPServer):
         llm_api_key: Optional[str] = None,
         llm_model: Optional[str] = None,
     ) -> dict:
+        return _json_loads(
+            self.act_single_bytes(
+                request,
+                latency_ms=latency_ms,
+                llm_provider=llm_provider,
+                llm_api_key=llm_api_key,
+                llm_model=llm_model,
+            )
+        )
+
+    def act_single_bytes(
+        self,
+        request: dict,
+        latency_ms: int,
+        llm_provider: Optional[str] = None,
+        llm_api_key: Optional[str] = None,
+        llm_model: Optional[str] = None,
+    ) -> bytes:
+        """`act_single` as an encoded JSON body; replay-cache hits are returned as stored, without a decode."""
+        provider, model, api_key = self._resolve_llm_settings(llm_provider, llm_model, llm_api_key)
+        pending = self._prepare(request, provider, model)
+        if isinstance(pending, bytes):
+            return pending
+        return self._finish(pending, latency_ms, *self._decide(pending, provider, model, api_key))
+
+    def act_batch_bytes(
+        self,
+        items: list,
+        latency_ms: int,
+        llm_provider: Optional[str] = None,
+        llm_api_key: Optional[str] = None,
+        llm_model: Optional[str] = None,
+    ) -> list[bytes]:
+        """Encoded responses for `/v1/act_batch`, one per item.
+
+        Cadence holds and cache hits are answered directly; in live mode the remaining items share a single
+        LLM call (falling back to one call per item if the reply does not line up with the input).
+        """
+        provider, model, api_key = self._resolve_llm_settings(llm_provider, llm_model, llm_api_key)
+        out: list = []
+        pending: list[_Pending] = []
+        slots: list[int] = []
+        for item in items:
+            if not isinstance(item, dict):
+                out.append(_json_body(self.hold_response(reason="batch_invalid_item")))
+                continue
+            r = self._prepare(item, provider, model)
+            if not isinstance(r, bytes):
+                pending.append(r)
+                slots.append(len(out))
+            out.append(r)
+
+        decisions = None
+        if len(pending) > 1 and self.args.llm_mode == "live" and api_key:
+            decisions = self._decide_batch(pending, provider, model, api_key)
+        for i, (slot, p) in enumerate(zip(slots, pending)):
+            decided = decisions[i] if decisions is not None else self._decide(p, provider, model, api_key)
+            out[slot] = self._finish(p, latency_ms, *decided)
+        return out
+
+    def _prepare(self, request: dict, provider: str, model: str):
+        """Answer from cadence/cache if possible (returns bytes), else a `_Pending` that needs a decision."""
         run_id = str(request.get("run_id") or "unknown")
         symbol = str(request.get("symbol") or "unknown")
         timeframe = str(request.get("timeframe") or "unknown")
         key = (run_id, symbol, timeframe)
 
         if not self._should_eval(key):
-            return self.hold_response(reason="cadence_hold")
+            return self._cadence_hold_body
 
-        provider, model, api_key = self._resolve_llm_settings(llm_provider, llm_model, llm_api_key)
         req_hash = self._request_hash(request, provider=provider, model=model)
         cache = self._cache_for_run(run_id)
-        cached = cache.get(req_hash) if self.args.cache_mode in ("record_replay", "replay") else None
-        if isinstance(cached, dict):
+        cached = cache.get_bytes(req_hash) if self.args.cache_mode in ("record_replay", "replay") else None
+        if cached is not None:
             return cached
 
-        # Generate (live or mock), then optionally record.
-        model_version = None
-        llm_latency_ms = None
-        reason = None
+        pending = _Pending(request, key, req_hash, cache)
+        if self._semantic is not None:
+            named = pending.named_features(self)
+            vec = tuple(named.values())
+            pending.semantic_vec = vec if all(map(math.isfinite, vec)) else None
+            hit = self._semantic.lookup(key, pending.semantic_vec) if pending.semantic_vec is not None else None
+            if hit is not None:
+                if self._record:
+                    try:
+                        cache.put(req_hash, hit, meta={"semantic_hit": True})
+                    except Exception:
+                        pass
+                return hit
+        return pending
+
+    def _decide(self, pending: "_Pending", provider: str, model: str, api_key: str) -> _Decision:
+        """One decision from the mock or a single LLM call: (decision, model_version, llm_latency_ms, reusable).
 
+        Only real decisions (not error holds) are `reusable` by the semantic tier.
+        """
         if self.args.llm_mode == "mock":
             llm_start = time.perf_counter()
-            decision = self._mock_decision(req_hash)
-            llm_latency_ms = int((time.perf_counter() - llm_start) * 1000.0)
-            model_version = "mock-0.1"
-        else:
-            if not api_key:
-                decision = {
-                    "action_type": "HOLD",
-                    "size": 0.0,
-                    "confidence": None,
-                    "reason": "missing_api_key",
-                }
-                model_version = model
-            else:
-                obs = request.get("observation", [])
-                if not isinstance(obs, list):
-                    obs = []
-                named = _name_observation(obs, self.args)
-                prompt = _build_prompt(request, named, self.args)
-                try:
-                    client = self._make_provider(provider, model, api_key)
-                    text, llm_latency_ms = client.generate_json(prompt)
-                    obj = _extract_json_object(text) or {}
-                    decision = obj
-                    model_version = model
-                except urllib.error.HTTPError as e:
-                    decision = {"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": f"llm_http_error:{e.code}"}
-                    model_version = model
-                except Exception:
-                    decision = {"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": "llm_error"}
-                    model_version = model
+            decision = self._mock_decision(pending.req_hash)
+            return decision, "mock-0.1", int((time.perf_counter() - llm_start) * 1000.0), True
+        if not api_key:
+            return _MISSING_API_KEY, model, None, False
+        prompt = _build_prompt(pending.request, pending.named_features(self), self)
+        try:
+            client = self._provider_client(provider, model, api_key)
+            text, llm_latency_ms = client.generate_json(prompt)
+            return _extract_json_object(text) or {}, model, llm_latency_ms, True
+        except urllib.error.HTTPError as e:
+            return {"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": f"llm_http_error:{e.code}"}, model, None, False
+        except Exception:
+            return _LLM_ERROR, model, None, False
 
+    def _decide_batch(
+        self, pending: list["_Pending"], provider: str, model: str, api_key: str
+    ) -> Optional[list[_Decision]]:
+        """Decisions for all `pending` items from one LLM call, or None if the reply cannot be matched up."""
+        prompt = _build_batch_prompt([(p.request, p.named_features(self)) for p in pending], self)
+        try:
+            client = self._provider_client(provider, model, api_key)
+            text, llm_latency_ms = client.generate_json(prompt)
+        except urllib.error.HTTPError as e:
+            err = {"action_type": "HOLD", "size": 0.0, "confidence": None, "reason": f"llm_http_error:{e.code}"}
+            return [(err, model, None, False)] * len(pending)
+        except Exception:
+            return [(_LLM_ERROR, model, None, False)] * len(pending)
+        obj = _extract_json_object(text) or {}
+        decisions = obj.get("decisions")
+        if not isinstance(decisions, list) or len(decisions) != len(pending):
+            return None
+        return [(d if isinstance(d, dict) else {}, model, llm_latency_ms, True) for d in decisions]
+
+    def _finish(
+        self,
+        pending: "_Pending",
+        latency_ms: int,
+        decision: Mapping[str, Any],
+        model_version: Optional[str],
+        llm_latency_ms: Optional[int],
+        reusable: bool,
+    ) -> bytes:
         action_type, size, confidence, reason = _normalize_llm_decision(decision, self.args)
         payload = {
             "action_type": action_type,
@@ -647,11 +1148,15 @@ class Server(ThreadingHTTPServer):
             "reason": reason,
         }
 
-        if self.args.cache_mode in ("record_replay", "record") and not isinstance(cached, dict):
+        body = _json_body(payload)
+        if pending.semantic_vec is not None and reusable:
+            self._semantic.add(pending.key, pending.semantic_vec, body)
+
+        if self._record:
             try:
-                cache.put(
-                    req_hash,
-                    payload,
+                pending.cache.put(
+                    pending.req_hash,
+                    body,
                     meta={
                         "model": model_version,
                         "llm_latency_ms": int(llm_latency_ms or 0),
@@ -660,13 +1165,174 @@ class Server(ThreadingHTTPServer):
             except Exception:
                 pass
 
-        return payload
+        return body
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_http_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bool, Dict[str, str], bytes]]:
+    """(method, path, keep_alive, lower-cased headers, body) of the next request, or None at EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise _BadRequest(400, "malformed request line")
+    method, path, version = parts
+
+    headers: Dict[str, str] = {}
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            return None
+        if raw in (b"\r\n", b"\n"):
+            break
+        name, sep, value = raw.decode("latin-1").partition(":")
+        if not sep:
+            raise _BadRequest(400, "malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise _BadRequest(411, "chunked bodies are not supported")
+    length = headers.get("content-length")
+    delimited = bool(length and length.isdigit()) and "transfer-encoding" not in headers
+    length = int(length) if delimited else 0
+    if length > MAX_BODY_BYTES:
+        raise _BadRequest(413, "body too large")
+    body = await reader.readexactly(length) if length else b"{}"
+
+    conn = headers.get("connection", "").lower()
+    keep_alive = conn == "keep-alive" if version == "HTTP/1.0" else conn != "close"
+    if method == "POST" and not delimited:
+        keep_alive = False  # unread body bytes would be parsed as the next request
+    return method, path, keep_alive, headers, body
+
+
+class AsyncFrontend:
+    """
+    `--server asyncio`: the same agent (`Server` state, caches, provider clients) behind one `asyncio`
+    event loop instead of a thread per connection.
+
+    Cadence holds, cache hits and mock decisions are answered on the loop; anything that may call the LLM
+    runs on the server's thread pool. Connections are kept alive until the client closes them.
+    """
+
+    def __init__(self, server: Server) -> None:
+        self.server = server
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                try:
+                    req = await _read_http_request(reader)
+                except _BadRequest as err:
+                    writer.write(_http_json_response(err.status, _json_body({"error": str(err)}), keep_alive=False))
+                    await writer.drain()
+                    break
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if req is None:
+                    break
+                method, path, keep_alive, headers, body = req
+
+                if method == "GET" and path == "/health":
+                    writer.write(_HEALTH_OK if keep_alive else _HEALTH_OK_CLOSE)
+                else:
+                    try:
+                        status, out = await self.dispatch(method, path, headers, body)
+                    except Exception:
+                        status, out = 500, _json_body({"error": "internal_error"})
+                    writer.write(_http_json_response(status, out, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Shutdown cancels idle keep-alive connections; end quietly (3.11's stream
+            # callback otherwise logs the cancellation as an unhandled error).
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, bytes]:
+        if method != "POST" or path not in ("/v1/act", "/v1/act_batch"):
+            return 404, _json_body({"error": "not_found"})
+        start = time.perf_counter()
+        try:
+            request = _json_loads(body)
+        except Exception:
+            return 400, _json_body({"error": "invalid_json"})
+        if not isinstance(request, dict):
+            return 400, _json_body({"error": "invalid_request"})
+
+        server = self.server
+        llm_provider = headers.get(HDR_LLM_PROVIDER.lower())
+        llm_model = headers.get(HDR_LLM_MODEL.lower())
+        llm_api_key = headers.get(HDR_LLM_API_KEY.lower())
+        latency_ms = int((time.perf_counter() - start) * 1000.0)
+        inline = server.args.llm_mode == "mock"
+
+        if path == "/v1/act_batch":
+            items = request.get("items", [])
+            if not isinstance(items, list):
+                return 400, _json_body({"error": "invalid_items"})
+            call = functools.partial(
+                server.act_batch_bytes,
+                items,
+                latency_ms=latency_ms,
+                llm_provider=llm_provider,
+                llm_api_key=llm_api_key,
+                llm_model=llm_model,
+            )
+            out_items = call() if inline else await self._offload(call)
+            return 200, b'{"items":[' + b",".join(out_items) + b"]}"
+
+        provider, model, api_key = server._resolve_llm_settings(llm_provider, llm_model, llm_api_key)
+        pending = server._prepare(request, provider, model)
+        if isinstance(pending, bytes):
+            return 200, pending
+
+        def decide() -> bytes:
+            return server._finish(pending, latency_ms, *server._decide(pending, provider, model, api_key))
+
+        return 200, decide() if inline else await self._offload(decide)
+
+    async def _offload(self, fn: Callable[[], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.server._pool, fn)
+
+
+async def serve_asyncio(
+    frontend: AsyncFrontend,
+    host: str,
+    port: int,
+    *,
+    on_ready: Optional[Callable[[asyncio.AbstractServer], None]] = None,
+) -> None:
+    srv = await asyncio.start_server(frontend.handle_connection, host, port)
+    if on_ready is not None:
+        on_ready(srv)
+    async with srv:
+        await srv.serve_forever()
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Kairos Alloy LLM agent (HTTP/JSON).")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--server",
+        default="threads",
+        choices=["threads", "asyncio"],
+        help="HTTP front end: thread pool (default) or a single asyncio event loop.",
+    )
 
     parser.add_argument("--provider", default="gemini", choices=["gemini", "openai"])
     parser.add_argument("--model", default=None)
@@ -679,6 +1345,20 @@ def main() -> int:
     parser.add_argument("--eval-every-n-bars", type=int, default=240)
     parser.add_argument("--cache-mode", default="record_replay", choices=["record_replay", "record", "replay", "off"])
     parser.add_argument("--cache-dir", default="runs")
+    parser.add_argument(
+        "--cache-semantic",
+        default="off",
+        choices=["off", "on"],
+        help="On an exact-cache miss, reuse the decision of a near-identical recent observation.",
+    )
+    parser.add_argument("--sim-threshold", type=float, default=0.95, help="Cosine similarity for a semantic hit.")
+    parser.add_argument("--cache-semantic-window", type=int, default=256, help="Recent entries per symbol/timeframe.")
+    parser.add_argument(
+        "--export-cache",
+        metavar="RUN_ID",
+        default=None,
+        help="Print the run's replay cache as JSONL to stdout and exit.",
+    )
 
     parser.add_argument("--size-mode", default="pct_equity", choices=["pct_equity", "qty"])
     parser.add_argument("--max-size", type=float, default=1.0)
@@ -699,12 +1379,44 @@ def main() -> int:
         else:
             args.model = "unknown"
 
+    if args.export_cache is not None:
+        cache = Cache(_cache_path(args.cache_dir, args.export_cache))
+        try:
+            cache.export_jsonl(sys.stdout.buffer)
+        finally:
+            cache.close()
+        return 0
+
+    if args.server == "asyncio":
+        state = Server((args.host, args.port), Handler, args, bind_and_activate=False)
+        print(
+            f"agent-llm: listening on http://{args.host}:{args.port} (asyncio) "
+            f"mode={args.llm_mode} model={args.model} n={args.eval_every_n_bars}"
+        )
+
+        async def run() -> None:
+            # SIGTERM cancels the serve task so we still reach server_close (cache close) below.
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            await serve_asyncio(AsyncFrontend(state), args.host, args.port)
+
+        try:
+            asyncio.run(run())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        finally:
+            state.server_close()
+        return 0
+
     httpd = Server((args.host, args.port), Handler, args)
+    # Exit through the finally below on SIGTERM too, so the cache is closed cleanly.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     print(f"agent-llm: listening on http://{args.host}:{args.port} mode={args.llm_mode} model={args.model} n={args.eval_every_n_bars}")
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         pass
+    finally:
+        httpd.server_close()
     return 0
 
 
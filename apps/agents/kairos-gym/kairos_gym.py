@@ -26,6 +26,14 @@ Limitations (current MVP constraints)
   run. `reset()` restarts the Rust process.
 - To run windowed episodes (walk-forward), use `mode="sweep"` with a single
   split (start/end). This reuses `kairos-application`'s in-memory split filter.
+- With `episode_splits=[(start, end), ...]` one sweep process runs every split
+  in order and each split is one episode; a new process is only spawned once
+  the splits are exhausted. Sweep runs splits serially with a distinct run_id,
+  so a change of run_id marks the episode boundary. Resetting mid-split answers
+  HOLD for the rest of that split instead of restarting Rust.
+- `KairosVecEnv(n_envs, **env_kwargs)` runs N `KairosGymEnv`s in worker
+  processes (each with its own Rust process and agent port) and steps them
+  in parallel; env kwargs must be picklable.
 
 Security / secrets
 ------------------
@@ -39,50 +47,74 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import queue
 import random
 import re
 import socket
 import subprocess
+import sys
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional, Tuple, Union
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
 try:
     import numpy as np
 except Exception as exc:  # pragma: no cover
     raise SystemExit("kairos_gym requires numpy. Install via notebooks/requirements.txt") from exc
 
+try:  # Optional: C-accelerated JSON codec (bytes in/out).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 JsonDict = dict[str, Any]
 Obs = np.ndarray
 
 
-def _now_ms() -> int:
-    return int(time.time() * 1000)
-
-
 def _free_tcp_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(("127.0.0.1", 0))
         return int(s.getsockname()[1])
 
 
+def _json_bytes(payload: JsonDict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+_HDR_JSON_PREFIX = b"Content-Type: application/json; charset=utf-8\r\nContent-Length: "
+_HDR_200_PREFIX = b"HTTP/1.1 200 OK\r\n" + _HDR_JSON_PREFIX
+
+
 def _json_response(handler, status: int, payload: JsonDict) -> None:
-    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+    _json_body_response(handler, status, _json_bytes(payload))
 
 
-def _hold(reason: str) -> JsonDict:
+def _json_body_response(handler, status: int, body: bytes) -> None:
+    # Status line, headers and body leave in one write (one send() per reply).
+    if status == 200:
+        head = _HDR_200_PREFIX
+    else:
+        reason = handler.responses.get(status, ("",))[0]
+        head = b"HTTP/1.1 %d %s\r\n" % (status, reason.encode("latin-1")) + _HDR_JSON_PREFIX
+    tail = b"\r\nConnection: close\r\n\r\n" if handler.close_connection else b"\r\n\r\n"
+    handler.wfile.write(b"".join((head, b"%d" % len(body), tail, body)))
+
+
+def _gym_action(action_type: str, size: float, reason: str) -> JsonDict:
     return {
-        "action_type": "HOLD",
-        "size": 0.0,
+        "action_type": action_type,
+        "size": size,
         "confidence": None,
         "model_version": "kairos_gym",
         "latency_ms": 0,
@@ -90,47 +122,95 @@ def _hold(reason: str) -> JsonDict:
     }
 
 
+# Default Discrete(3) action mapping (0=HOLD, 1=BUY, 2=SELL): (response, JSON body encoded once).
+# step() hands both to the bridge so the per-bar reply skips encoding; the dicts are never given out.
+_GYM_ACTIONS: Tuple[Tuple[JsonDict, bytes], ...] = tuple(
+    (r, _json_bytes(r))
+    for r in (
+        _gym_action("HOLD", 0.0, "gym_hold"),
+        _gym_action("BUY", 1.0, "gym_buy"),
+        _gym_action("SELL", 1.0, "gym_sell"),
+    )
+)
+
+
+def _gym_action_index(action: Any) -> Optional[int]:
+    try:
+        a = int(action)
+    except Exception:
+        return None
+    return a if 0 <= a < len(_GYM_ACTIONS) else None
+
+
+def _hold(reason: str) -> JsonDict:
+    return _gym_action("HOLD", 0.0, reason)
+
+
 def _patch_toml_value(raw: str, section: str, key: str, value_literal: str) -> str:
     """
     Patch a TOML key inside a single-level [section] block.
     If key is missing, append it to the section.
     """
-    lines = raw.splitlines(keepends=True)
+    return _patch_toml_many(raw, {(section, key): value_literal})
+
+
+_TOML_HEADER = re.compile(r"^\[(.*)\]$")
+_TOML_KEY = re.compile(r"^\s*([^\s=]+)\s*=")
+
+
+def _patch_toml_many(raw: str, patches: dict[tuple[str, str], str]) -> str:
+    """
+    Apply several `_patch_toml_value` edits in one pass over `raw`.
+    Missing keys are appended to their section (in patch order); missing sections go at the end.
+    """
+    by_section: dict[str, dict[str, str]] = {}
+    for (section, key), value_literal in patches.items():
+        by_section.setdefault(section, {})[key] = value_literal
+    patched: set[tuple[str, str]] = set()
     out: list[str] = []
-    in_section = False
-    patched = False
-    section_header = re.compile(rf"^\s*\[{re.escape(section)}\]\s*$")
-    any_section = re.compile(r"^\s*\[.*\]\s*$")
-    key_re = re.compile(rf"^\s*{re.escape(key)}\s*=")
-
-    for idx, line in enumerate(lines):
-        if section_header.match(line.strip()):
-            in_section = True
+    current: Optional[dict[str, str]] = None
+    current_name = ""
+
+    def flush_missing() -> None:
+        for key, value_literal in current.items():
+            if (current_name, key) not in patched:
+                if out and not out[-1].endswith("\n"):
+                    out[-1] += "\n"
+                out.append(f"{key} = {value_literal}\n")
+                patched.add((current_name, key))
+
+    for line in raw.splitlines(keepends=True):
+        header = _TOML_HEADER.match(line.strip())
+        if header is not None:
+            if current is not None:
+                flush_missing()
+            current_name = header.group(1)
+            current = by_section.get(current_name)
             out.append(line)
             continue
-        if in_section and any_section.match(line.strip()):
-            if not patched:
-                out.append(f'{key} = {value_literal}\n')
-                patched = True
-            in_section = False
-            out.append(line)
-            continue
-        if in_section and key_re.match(line):
-            out.append(f'{key} = {value_literal}\n')
-            patched = True
-            continue
+        if current is not None:
+            m = _TOML_KEY.match(line)
+            if m is not None and m.group(1) in current:
+                key = m.group(1)
+                out.append(f"{key} = {current[key]}\n")
+                patched.add((current_name, key))
+                continue
         out.append(line)
+    if current is not None:
+        flush_missing()
+
+    for section, keys in by_section.items():
+        missing = [(key, value) for key, value in keys.items() if (section, key) not in patched]
+        if missing:
+            # section not present; append at end
+            if out and not out[-1].endswith("\n"):
+                out[-1] += "\n"
+            out.append(f"\n[{section}]\n" + "".join(f"{key} = {value}\n" for key, value in missing))
+    return "".join(out)
 
-    if in_section and not patched:
-        out.append(f'{key} = {value_literal}\n')
-        patched = True
 
-    if not patched:
-        # section not present; append at end
-        if out and not out[-1].endswith("\n"):
-            out[-1] += "\n"
-        out.append(f"\n[{section}]\n{key} = {value_literal}\n")
-    return "".join(out)
+# Quoted run_id literal left in the cached config template; reset() swaps in the episode's run_id.
+_RUN_ID_PLACEHOLDER = '"__KAIROS_RUN_ID__"'
 
 
 def _patch_config_for_gym(
@@ -141,15 +221,16 @@ def _patch_config_for_gym(
     out_dir: Optional[str],
     force_report_html_off: bool = True,
 ) -> str:
-    raw = base_toml
-    raw = _patch_toml_value(raw, "run", "run_id", json.dumps(run_id, ensure_ascii=False))
-    raw = _patch_toml_value(raw, "agent", "mode", json.dumps("remote"))
-    raw = _patch_toml_value(raw, "agent", "url", json.dumps(agent_url, ensure_ascii=False))
+    patches = {
+        ("run", "run_id"): json.dumps(run_id, ensure_ascii=False),
+        ("agent", "mode"): json.dumps("remote"),
+        ("agent", "url"): json.dumps(agent_url, ensure_ascii=False),
+    }
     if out_dir is not None:
-        raw = _patch_toml_value(raw, "paths", "out_dir", json.dumps(out_dir, ensure_ascii=False))
+        patches[("paths", "out_dir")] = json.dumps(out_dir, ensure_ascii=False)
     if force_report_html_off:
-        raw = _patch_toml_value(raw, "report", "html", "false")
-    return raw
+        patches[("report", "html")] = "false"
+    return _patch_toml_many(base_toml, patches)
 
 
 def _make_single_split_sweep_toml(
@@ -160,16 +241,32 @@ def _make_single_split_sweep_toml(
     split_id: str,
     split_start: Optional[str],
     split_end: Optional[str],
+) -> str:
+    return _make_sweep_toml(
+        sweep_id=sweep_id,
+        mode=mode,
+        base_config_path=base_config_path,
+        splits=[(split_id, split_start, split_end)],
+    )
+
+
+def _make_sweep_toml(
+    *,
+    sweep_id: str,
+    mode: str,
+    base_config_path: Path,
+    splits: Sequence[Tuple[str, Optional[str], Optional[str]]],
 ) -> str:
     if mode not in ("backtest", "paper"):
         raise ValueError("mode must be backtest|paper")
     split_lines = []
-    split_lines.append('[[splits]]\n')
-    split_lines.append(f'id = {json.dumps(split_id)}\n')
-    if split_start is not None:
-        split_lines.append(f'start = {json.dumps(split_start)}\n')
-    if split_end is not None:
-        split_lines.append(f'end = {json.dumps(split_end)}\n')
+    for split_id, split_start, split_end in splits:
+        split_lines.append('[[splits]]\n')
+        split_lines.append(f'id = {json.dumps(split_id)}\n')
+        if split_start is not None:
+            split_lines.append(f'start = {json.dumps(split_start)}\n')
+        if split_end is not None:
+            split_lines.append(f'end = {json.dumps(split_end)}\n')
 
     return (
         f'[base]\nconfig = {json.dumps(str(base_config_path))}\n\n'
@@ -185,12 +282,14 @@ def _make_single_split_sweep_toml(
 @dataclass
 class _ActionCall:
     request: JsonDict
-    received_at_ms: int
     _event: threading.Event
     _response: Optional[JsonDict] = None
+    _body: Optional[bytes] = None
 
-    def set_response(self, response: JsonDict) -> None:
+    def set_response(self, response: JsonDict, body: Optional[bytes] = None) -> None:
+        """`body`, if given, is the already-encoded JSON of `response` and is sent as-is."""
         self._response = response
+        self._body = body
         self._event.set()
 
     def wait(self, timeout_s: float) -> Optional[JsonDict]:
@@ -203,14 +302,97 @@ class _ActionCall:
 class _Bridge:
     def __init__(self, timeout_s: float):
         self.timeout_s = timeout_s
-        self.incoming: "queue.Queue[_ActionCall]" = queue.Queue()
+        # Transport threads append calls and the RL loop waits on `cv` for either a call or the exit of
+        # the Rust process it is driving, so neither side polls.
+        self.cv = threading.Condition()
+        self._pending: "deque[_ActionCall]" = deque()
+        self._exited: Optional[object] = None
+
+    def call(self, request: JsonDict) -> bytes:
+        """Hand one ActionRequest to the RL loop and block until it answers (HOLD on timeout).
+
+        Returns the JSON-encoded ActionResponse.
+        """
+        call = _ActionCall(
+            request=request,
+            _event=threading.Event(),
+        )
+        with self.cv:
+            self._pending.append(call)
+            self.cv.notify()
+
+        response = call.wait(self.timeout_s)
+        if response is None:
+            return _json_bytes(_hold("gym_timeout"))
+        if call._body is not None:
+            return call._body
+        return _json_bytes(response)
+
+    def mark_exited(self, proc: object) -> None:
+        """Wake `next_call` waiters that are tracking `proc`."""
+        with self.cv:
+            self._exited = proc
+            self.cv.notify_all()
+
+    def next_call(self, timeout_s: float, proc: Optional[object] = None) -> Optional[_ActionCall]:
+        """Return the oldest pending call, or None on timeout or once `proc` has exited."""
+        with self.cv:
+            self.cv.wait_for(lambda: self._pending or (proc is not None and self._exited is proc), timeout_s)
+            if self._pending:
+                return self._pending.popleft()
+            return None
+
+
+def _make_http_server(bridge: _Bridge, host: str, port: int, max_workers: int = 4):
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+    class PooledHTTPServer(ThreadingMixIn, HTTPServer):
+        """Requests run on a fixed pool of pre-started threads instead of one new thread each."""
 
+        daemon_threads = True
+        allow_reuse_address = True
 
-def _make_http_server(bridge: _Bridge, host: str, port: int):
-    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kairos-gym")
+            self._active: set = set()  # sockets currently being served
+
+        def process_request(self, request, client_address):
+            self._pool.submit(self._serve_connection, request, client_address)
+
+        def _serve_connection(self, request, client_address):
+            self._active.add(request)
+            try:
+                self.process_request_thread(request, client_address)
+            finally:
+                self._active.discard(request)
+
+        def server_close(self):
+            super().server_close()
+            # Wake workers blocked on idle keep-alive connections; pool threads are joined at exit.
+            for sock in list(self._active):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+        def handle_error(self, request, client_address):
+            # close_episode() terminates Rust while its last call may still be answered.
+            if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+                return
+            super().handle_error(request, client_address)
 
     class Handler(BaseHTTPRequestHandler):
         server_version = "kairos-gym/0.1"
+        # HTTP/1.1 keeps the runner's connection open across bars (every response carries Content-Length);
+        # an idle connection is dropped after `timeout` so it does not pin a pool thread forever.
+        protocol_version = "HTTP/1.1"
+        timeout = 120
+        # Responses are a few hundred bytes; with Nagle on they can wait for the client's delayed ACK.
+        disable_nagle_algorithm = True
 
         def do_GET(self):  # noqa: N802
             if self.path == "/health":
@@ -232,9 +414,10 @@ def _make_http_server(bridge: _Bridge, host: str, port: int):
                 length = int(self.headers.get("Content-Length", "0"))
             except ValueError:
                 length = 0
+                self.close_connection = True  # unread body bytes would be parsed as the next request
             raw = self.rfile.read(length) if length > 0 else b"{}"
             try:
-                request = json.loads(raw.decode("utf-8"))
+                request = _json_loads(raw)
             except Exception:
                 _json_response(self, 400, {"error": "invalid_json"})
                 return
@@ -242,22 +425,35 @@ def _make_http_server(bridge: _Bridge, host: str, port: int):
                 _json_response(self, 400, {"error": "invalid_request"})
                 return
 
-            call = _ActionCall(
-                request=request,
-                received_at_ms=_now_ms(),
-                _event=threading.Event(),
-            )
-            bridge.incoming.put(call)
-
-            response = call.wait(bridge.timeout_s)
-            if response is None:
-                response = _hold("gym_timeout")
-            _json_response(self, 200, response)
+            _json_body_response(self, 200, bridge.call(request))
 
         def log_message(self, fmt, *args):  # noqa: N802
             return
 
-    return ThreadingHTTPServer((host, port), Handler)
+    return PooledHTTPServer((host, port), Handler)
+
+
+STDOUT_LOG_CHUNK = 64 * 1024
+STDOUT_LOG_MAX_BYTES = 10 * 1024 * 1024
+STDOUT_LOG_BACKUPS = 2
+
+
+def _pump_stdout_log(pipe, path: Path) -> None:
+    """Copy a child's stdout into `path`, rotating at STDOUT_LOG_MAX_BYTES; returns at EOF."""
+    import logging
+    from logging.handlers import RotatingFileHandler
+
+    handler = RotatingFileHandler(
+        path, maxBytes=STDOUT_LOG_MAX_BYTES, backupCount=STDOUT_LOG_BACKUPS, encoding="utf-8"
+    )
+    try:
+        for line in pipe:
+            handler.handle(logging.makeLogRecord({"msg": line.decode("utf-8", "replace").rstrip("\r\n")}))
+    except (OSError, ValueError):
+        pass
+    finally:
+        handler.close()
+        pipe.close()
 
 
 class KairosGymEnv:
@@ -276,6 +472,7 @@ class KairosGymEnv:
         mode: str = "backtest",
         split_start: Optional[str] = None,
         split_end: Optional[str] = None,
+        episode_splits: Optional[Sequence[Tuple[Optional[str], Optional[str]]]] = None,
         out_dir: Optional[Union[str, Path]] = None,
         agent_host: str = "127.0.0.1",
         agent_port: Optional[int] = None,
@@ -284,11 +481,15 @@ class KairosGymEnv:
         reward_fn: Optional[Callable[[JsonDict, JsonDict], float]] = None,
         action_to_response: Optional[Callable[[Any], JsonDict]] = None,
         seed: Optional[int] = None,
+        verbose: bool = False,
     ):
         self.base_config_path = Path(base_config_path)
         self.mode = mode.strip().lower()
         self.split_start = split_start
         self.split_end = split_end
+        self.episode_splits = list(episode_splits) if episode_splits else None
+        if self.episode_splits is not None and self.mode != "sweep":
+            raise ValueError('episode_splits requires mode="sweep"')
         self.out_dir = str(out_dir) if out_dir is not None else None
 
         self.agent_host = agent_host
@@ -304,10 +505,15 @@ class KairosGymEnv:
 
         self._rng = random.Random(seed if seed is not None else 0)
         self._episode_seed = seed
+        self.verbose = bool(verbose)
 
         self._observation_builder = observation_builder or self._default_observation_builder
         self._reward_fn = reward_fn or self._default_reward_fn
+        # The default reward is the equity delta; step() computes it from the tracked `_prev_equity`.
+        self._equity_reward = reward_fn is None
         self._action_to_response = action_to_response or self._default_action_to_response
+        # The default mapping replies with the pre-encoded _GYM_ACTIONS bodies (see step()).
+        self._gym_actions = action_to_response is None
 
         self._rust_cmd = rust_cmd or [
             "cargo",
@@ -322,20 +528,27 @@ class KairosGymEnv:
         ]
 
         self._proc: Optional[subprocess.Popen] = None
-        self._proc_stdout = None
         self._proc_stderr = None
         self._current_call: Optional[_ActionCall] = None
+        # First call of the next split, seen by step() at an episode boundary (episode_splits only).
+        self._next_episode_call: Optional[_ActionCall] = None
         self._prev_equity: Optional[float] = None
         self._obs_len: Optional[int] = None
         self._run_id: Optional[str] = None
         self._tmp_dir: Optional[Path] = None
+        # Patched base config with a run_id placeholder, keyed by the base file's (mtime_ns, size).
+        self._cfg_template: Optional[Tuple[Tuple[int, int], str]] = None
 
     def _default_observation_builder(self, request: JsonDict) -> Obs:
         obs = request.get("observation", [])
         if not isinstance(obs, list):
             obs = []
-        arr = np.asarray(obs, dtype=np.float32)
-        return arr
+        # fromiter with a known count fills a preallocated float32 array directly; fall back to
+        # asarray for anything it rejects (nested lists, non-numeric strings) to keep its errors.
+        try:
+            return np.fromiter(obs, dtype=np.float32, count=len(obs))
+        except (TypeError, ValueError):
+            return np.asarray(obs, dtype=np.float32)
 
     def _default_reward_fn(self, prev_req: JsonDict, next_req: JsonDict) -> float:
         prev_eq = float(prev_req.get("portfolio_state", {}).get("equity", 0.0))
@@ -345,39 +558,10 @@ class KairosGymEnv:
     def _default_action_to_response(self, action: Any) -> JsonDict:
         # Default: Discrete(3) -> HOLD/BUY/SELL with size=1.0.
         # 0=HOLD, 1=BUY, 2=SELL.
-        try:
-            a = int(action)
-        except Exception:
+        a = _gym_action_index(action)
+        if a is None:
             return _hold("invalid_action")
-
-        if a == 0:
-            return {
-                "action_type": "HOLD",
-                "size": 0.0,
-                "confidence": None,
-                "model_version": "kairos_gym",
-                "latency_ms": 0,
-                "reason": "gym_hold",
-            }
-        if a == 1:
-            return {
-                "action_type": "BUY",
-                "size": 1.0,
-                "confidence": None,
-                "model_version": "kairos_gym",
-                "latency_ms": 0,
-                "reason": "gym_buy",
-            }
-        if a == 2:
-            return {
-                "action_type": "SELL",
-                "size": 1.0,
-                "confidence": None,
-                "model_version": "kairos_gym",
-                "latency_ms": 0,
-                "reason": "gym_sell",
-            }
-        return _hold("invalid_action")
+        return dict(_GYM_ACTIONS[a][0])
 
     def _spawn_rust(self, config_path: Path, sweep_path: Optional[Path]) -> subprocess.Popen:
         repo_root = Path(__file__).resolve().parents[3]
@@ -400,35 +584,74 @@ class KairosGymEnv:
         else:
             cmd = cmd + ["--config", str(config_path)]
 
-        stdout_path = (config_path.parent / "rust_stdout.log").as_posix()
+        # stdout (run summaries) is only kept with verbose=True, through a size-capped rotating log since
+        # one process may serve many episodes; stderr holds the runner's `error: ...` lines, which are the
+        # only diagnostic when reset() fails, so it is always kept.
         stderr_path = (config_path.parent / "rust_stderr.log").as_posix()
-        self._proc_stdout = open(stdout_path, "wb")
         self._proc_stderr = open(stderr_path, "wb")
-        return subprocess.Popen(
+        proc = subprocess.Popen(
             cmd,
             cwd=str(repo_root),
-            stdout=self._proc_stdout,
+            stdout=subprocess.PIPE if self.verbose else subprocess.DEVNULL,
             stderr=self._proc_stderr,
+            bufsize=STDOUT_LOG_CHUNK,
         )
+        if self.verbose:
+            threading.Thread(
+                target=_pump_stdout_log,
+                args=(proc.stdout, config_path.parent / "rust_stdout.log"),
+                name="kairos-gym-stdout",
+                daemon=True,
+            ).start()
+        return proc
+
+    def _watch_proc(self, proc: subprocess.Popen) -> None:
+        proc.wait()
+        self.bridge.mark_exited(proc)
 
     def _wait_for_call_or_done(self, timeout_s: float) -> Optional[_ActionCall]:
-        deadline = time.time() + timeout_s
-        while time.time() < deadline:
-            try:
-                return self.bridge.incoming.get(timeout=0.05)
-            except queue.Empty:
-                pass
-            if self._proc is not None and self._proc.poll() is not None:
-                return None
-        return None
+        return self.bridge.next_call(timeout_s, proc=self._proc)
+
+    def _next_split_call(self) -> Optional[_ActionCall]:
+        """Finish the current split with HOLDs and return the first call of the next one."""
+        call, self._next_episode_call = self._next_episode_call, None
+        if call is not None:
+            return call
+        call, self._current_call = self._current_call, None
+        if call is None:
+            return self._wait_for_call_or_done(timeout_s=30.0)
+        run_id = call.request.get("run_id")
+        while call is not None and call.request.get("run_id") == run_id:
+            call.set_response(_hold("gym_reset"))
+            call = self._wait_for_call_or_done(timeout_s=30.0)
+        return call
+
+    def _config_template(self) -> str:
+        """Base config patched for the gym, with the run_id left as a placeholder; re-read when the file changes."""
+        try:
+            st = self.base_config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(str(self.base_config_path)) from None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._cfg_template is None or self._cfg_template[0] != stamp:
+            template = _patch_config_for_gym(
+                self.base_config_path.read_text(encoding="utf-8"),
+                run_id=_RUN_ID_PLACEHOLDER[1:-1],
+                agent_url=self.agent_url,
+                out_dir=self.out_dir,
+                force_report_html_off=True,
+            )
+            self._cfg_template = (stamp, template)
+        return self._cfg_template[1]
 
     def reset(self) -> Tuple[Obs, JsonDict]:
-        self.close_episode()
+        if self.episode_splits is not None and self._proc is not None and self._proc.poll() is None:
+            call = self._next_split_call()
+            if call is not None:
+                return self._begin_episode(call)
 
-        if not self.base_config_path.exists():
-            raise FileNotFoundError(str(self.base_config_path))
+        self.close_episode()
 
-        base_toml = self.base_config_path.read_text(encoding="utf-8")
         run_id = f"gym_{int(time.time())}_{self._rng.randint(0, 10_000_000):07d}"
         self._run_id = run_id
 
@@ -436,36 +659,43 @@ class KairosGymEnv:
         tmp_dir.mkdir(parents=True, exist_ok=True)
         self._tmp_dir = tmp_dir
 
-        patched = _patch_config_for_gym(
-            base_toml,
-            run_id=run_id,
-            agent_url=self.agent_url,
-            out_dir=self.out_dir,
-            force_report_html_off=True,
-        )
+        patched = self._config_template().replace(_RUN_ID_PLACEHOLDER, json.dumps(run_id, ensure_ascii=False))
         cfg_path = tmp_dir / "config.toml"
         cfg_path.write_text(patched, encoding="utf-8")
 
         sweep_path: Optional[Path] = None
         if self.mode == "sweep":
             sweep_path = tmp_dir / "sweep.toml"
-            sweep_toml = _make_single_split_sweep_toml(
-                sweep_id=f"gym_sweep_{run_id}",
-                mode="backtest",
-                base_config_path=cfg_path,
-                split_id="episode",
-                split_start=self.split_start,
-                split_end=self.split_end,
-            )
+            if self.episode_splits is not None:
+                sweep_toml = _make_sweep_toml(
+                    sweep_id=f"gym_sweep_{run_id}",
+                    mode="backtest",
+                    base_config_path=cfg_path,
+                    splits=[
+                        (f"episode_{i:04d}", start, end) for i, (start, end) in enumerate(self.episode_splits)
+                    ],
+                )
+            else:
+                sweep_toml = _make_single_split_sweep_toml(
+                    sweep_id=f"gym_sweep_{run_id}",
+                    mode="backtest",
+                    base_config_path=cfg_path,
+                    split_id="episode",
+                    split_start=self.split_start,
+                    split_end=self.split_end,
+                )
             sweep_path.write_text(sweep_toml, encoding="utf-8")
 
         self._proc = self._spawn_rust(cfg_path, sweep_path)
+        threading.Thread(target=self._watch_proc, args=(self._proc,), name="kairos-gym-proc", daemon=True).start()
 
         call = self._wait_for_call_or_done(timeout_s=30.0)
         if call is None:
             code = self._proc.poll() if self._proc is not None else None
-            raise RuntimeError(f"rust process did not request action (exit={code})")
+            raise RuntimeError(f"rust process did not request action (exit={code}, see {tmp_dir / 'rust_stderr.log'})")
+        return self._begin_episode(call)
 
+    def _begin_episode(self, call: _ActionCall) -> Tuple[Obs, JsonDict]:
         self._current_call = call
         req = call.request
         obs = self._observation_builder(req)
@@ -494,8 +724,12 @@ class KairosGymEnv:
         call = self._current_call
         prev_req = call.request
 
-        response = self._action_to_response(action)
-        call.set_response(response)
+        a = _gym_action_index(action) if self._gym_actions else None
+        if a is not None:
+            response, body = _GYM_ACTIONS[a]
+        else:
+            response, body = self._action_to_response(action), None
+        call.set_response(response, body)
 
         next_call = self._wait_for_call_or_done(timeout_s=30.0)
         if next_call is None:
@@ -513,7 +747,27 @@ class KairosGymEnv:
             return obs, reward, terminated, truncated, info
 
         next_req = next_call.request
-        reward = float(self._reward_fn(prev_req, next_req))
+        if self.episode_splits is not None and next_req.get("run_id") != prev_req.get("run_id"):
+            # The sweep moved on to the next split: end this episode and keep the call for reset().
+            self._next_episode_call = next_call
+            self._current_call = None
+            info = {
+                "run_id": prev_req.get("run_id"),
+                "timestamp": prev_req.get("timestamp"),
+                "terminated_reason": "split_end",
+                "last_equity": float(prev_req.get("portfolio_state", {}).get("equity", 0.0)),
+            }
+            return self._observation_builder(prev_req), 0.0, True, False, info
+
+        next_state = next_req.get("portfolio_state", {})
+        equity = float(next_state.get("equity", 0.0))
+        if not self._equity_reward:
+            reward = float(self._reward_fn(prev_req, next_req))
+        elif "equity" in next_state:
+            reward = equity - self._prev_equity
+        else:
+            reward = 0.0  # same as _default_reward_fn: a missing equity carries the previous one forward
+        self._prev_equity = equity
         self._current_call = next_call
 
         obs = self._observation_builder(next_req)
@@ -522,18 +776,20 @@ class KairosGymEnv:
         info = {
             "run_id": next_req.get("run_id"),
             "timestamp": next_req.get("timestamp"),
-            "equity": float(next_req.get("portfolio_state", {}).get("equity", 0.0)),
+            "equity": equity,
             "agent_reason": response.get("reason"),
         }
         return obs, reward, terminated, truncated, info
 
     def close_episode(self) -> None:
-        if self._current_call is not None:
-            try:
-                self._current_call.set_response(_hold("gym_close"))
-            except Exception:
-                pass
+        for pending in (self._current_call, self._next_episode_call):
+            if pending is not None:
+                try:
+                    pending.set_response(_hold("gym_close"))
+                except Exception:
+                    pass
         self._current_call = None
+        self._next_episode_call = None
         self._prev_equity = None
 
         if self._proc is not None:
@@ -547,12 +803,6 @@ class KairosGymEnv:
                         self._proc.wait(timeout=2.0)
             finally:
                 self._proc = None
-                if self._proc_stdout is not None:
-                    try:
-                        self._proc_stdout.close()
-                    except Exception:
-                        pass
-                    self._proc_stdout = None
                 if self._proc_stderr is not None:
                     try:
                         self._proc_stderr.close()
@@ -564,6 +814,7 @@ class KairosGymEnv:
         self.close_episode()
         try:
             self._httpd.shutdown()
+            self._httpd.server_close()
         except Exception:
             pass
 
@@ -610,6 +861,168 @@ class KairosGymEnv:
         return _Wrapped()
 
 
+# Runs in each KairosVecEnv worker. This module is usually loaded from its file path under an ad-hoc name
+# (see tests/ and train/), which spawn/forkserver children cannot import by name, so the worker re-loads
+# it from `path` and `exec` (picklable by reference) is the process target.
+_VEC_BOOTSTRAP = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("kairos_gym", path)
+module = importlib.util.module_from_spec(spec)
+sys.modules["kairos_gym"] = module
+spec.loader.exec_module(module)
+module._vec_worker(conn, index, env_kwargs)
+"""
+
+
+def _vec_worker(conn, index: int, env_kwargs: JsonDict) -> None:
+    from multiprocessing import shared_memory
+
+    env = KairosGymEnv(**env_kwargs)
+    shm = None
+    obs_buf: Optional[np.ndarray] = None
+    try:
+        while True:
+            try:
+                cmd, data = conn.recv()
+            except EOFError:
+                break
+            if cmd == "close":
+                break
+            try:
+                if cmd == "attach":
+                    shm = shared_memory.SharedMemory(name=data[0])
+                    obs_buf = np.ndarray(data[1], dtype=np.float32, buffer=shm.buf)
+                    reply: Any = None
+                elif cmd == "reset":
+                    obs, info = env.reset()
+                    if obs_buf is None:
+                        reply = (obs, info)
+                    else:
+                        obs_buf[index] = obs
+                        reply = (None, info)
+                elif cmd == "step":
+                    obs, reward, terminated, truncated, info = env.step(data)
+                    if terminated or truncated:
+                        info["final_observation"] = obs
+                        obs, info["reset_info"] = env.reset()
+                    obs_buf[index] = obs
+                    reply = (reward, terminated, truncated, info)
+                else:
+                    raise ValueError(f"unknown command: {cmd!r}")
+            except Exception as exc:
+                conn.send(("error", f"{type(exc).__name__}: {exc}"))
+                continue
+            conn.send(("ok", reply))
+    finally:
+        env.close()
+        obs_buf = None
+        if shm is not None:
+            shm.close()
+        conn.close()
+
+
+class KairosVecEnv:
+    """
+    N `KairosGymEnv`s stepped in parallel, one per worker process.
+
+    Observations are written by the workers into one shared `(n_envs, obs_len)` float32 block, so only
+    rewards/flags/info cross the pipes; `reset()`/`step()` return a copy of that block, so callers may
+    keep it across steps. Finished episodes are reset inside the worker: the returned row is the new
+    episode's first observation, and `infos[i]` carries `final_observation` and `reset_info`.
+    """
+
+    def __init__(self, n_envs: int, *, start_method: Optional[str] = None, **env_kwargs: Any):
+        import multiprocessing as mp
+
+        if n_envs < 1:
+            raise ValueError("n_envs must be >= 1")
+        if env_kwargs.get("agent_port") is not None and n_envs > 1:
+            raise ValueError("agent_port cannot be shared by several envs; leave it unset")
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.n_envs = int(n_envs)
+        self._shm = None
+        self._obs: Optional[np.ndarray] = None
+        self._conns = []
+        self._procs = []
+        # Distinct seeds also keep the workers' run_ids (and so their /tmp/kairos_gym dirs) apart.
+        base_seed = int(env_kwargs.pop("seed", None) or 0)
+        for index in range(self.n_envs):
+            kwargs = dict(env_kwargs, seed=base_seed + index)
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(
+                target=exec,
+                args=(_VEC_BOOTSTRAP, {"path": __file__, "conn": child_conn, "index": index, "env_kwargs": kwargs}),
+                name=f"kairos-vec-{index}",
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+    def _broadcast(self, cmd: str, data: Sequence[Any]) -> list[Any]:
+        for conn, item in zip(self._conns, data):
+            conn.send((cmd, item))
+        replies = []
+        for i, conn in enumerate(self._conns):
+            try:
+                replies.append(conn.recv())
+            except (EOFError, OSError):
+                replies.append(("error", f"worker exited (exitcode={self._procs[i].exitcode})"))
+        errors = [f"env {i}: {payload}" for i, (status, payload) in enumerate(replies) if status != "ok"]
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return [payload for _, payload in replies]
+
+    def reset(self) -> Tuple[np.ndarray, list[JsonDict]]:
+        replies = self._broadcast("reset", [None] * self.n_envs)
+        infos = [info for _, info in replies]
+        if self._obs is None:
+            from multiprocessing import shared_memory
+
+            first = np.stack([obs for obs, _ in replies]).astype(np.float32, copy=False)
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, first.nbytes))
+            self._obs = np.ndarray(first.shape, dtype=np.float32, buffer=self._shm.buf)
+            self._obs[:] = first
+            self._broadcast("attach", [(self._shm.name, first.shape)] * self.n_envs)
+        return self._obs.copy(), infos
+
+    def step(self, actions: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list[JsonDict]]:
+        if self._obs is None:
+            raise RuntimeError("KairosVecEnv.step() called before reset()")
+        if len(actions) != self.n_envs:
+            raise ValueError(f"expected {self.n_envs} actions, got {len(actions)}")
+        replies = self._broadcast("step", list(actions))
+        rewards = np.fromiter((r[0] for r in replies), dtype=np.float32, count=self.n_envs)
+        terminated = np.fromiter((r[1] for r in replies), dtype=bool, count=self.n_envs)
+        truncated = np.fromiter((r[2] for r in replies), dtype=bool, count=self.n_envs)
+        return self._obs.copy(), rewards, terminated, truncated, [r[3] for r in replies]
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=10.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=2.0)
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._procs = []
+        self._obs = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
 def _cli() -> int:
     parser = argparse.ArgumentParser(description="Kairos Gym (research wrapper).")
     parser.add_argument("--base-config", required=True, help="Base TOML config path.")
@@ -618,6 +1031,7 @@ def _cli() -> int:
     parser.add_argument("--split-end", default=None, help="Sweep split end (RFC3339).")
     parser.add_argument("--out-dir", default=None, help="Override paths.out_dir for the run.")
     parser.add_argument("--steps", type=int, default=25, help="Smoke steps to run.")
+    parser.add_argument("--verbose", action="store_true", help="Also keep the Rust process stdout log.")
     args = parser.parse_args()
 
     env = KairosGymEnv(
@@ -626,6 +1040,7 @@ def _cli() -> int:
         split_start=args.split_start,
         split_end=args.split_end,
         out_dir=args.out_dir,
+        verbose=args.verbose,
     )
 
     obs, info = env.reset()
@@ -23,8 +23,11 @@ class TestAgentDrl(unittest.TestCase):
         m = self._load_impl()
         _normalize_observation = m._normalize_observation
 
-        self.assertEqual(_normalize_observation({"observation": [1, 2.0, "3"]}), [1.0, 2.0, 3.0])
+        self.assertEqual(list(_normalize_observation({"observation": [1, 2.0, "3"]})), [1.0, 2.0, 3.0])
+        self.assertEqual(list(_normalize_observation({"observation": [0.5, True]})), [0.5, 1.0])
         self.assertIsNone(_normalize_observation({"observation": "nope"}))
+        self.assertIsNone(_normalize_observation({"observation": [1.0, None]}))
+        self.assertIsNone(_normalize_observation({"observation": [1.0, "x"]}))
 
     def test_mock_policy_momentum(self):
         m = self._load_impl()
@@ -38,6 +41,221 @@ class TestAgentDrl(unittest.TestCase):
         a, c = p.predict([0.0])
         self.assertEqual(a, 0)
 
+    def test_server_roundtrip_reuses_connection(self):
+        import asyncio
+        import http.client
+        import json
+
+        m = self._load_impl()
+        state = m.ServerState(policy=m._MockPolicy("momentum"), size=0.5)
+        server = m.AgentServer(state)
+
+        def client(port):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                conn.request("GET", "/health")
+                r = conn.getresponse()
+                health = (r.status, r.read())
+                sock = conn.sock
+
+                conn.request("POST", "/v1/act", body=json.dumps({"observation": [0.2]}))
+                r = conn.getresponse()
+                act = (r.status, json.loads(r.read()))
+
+                body = json.dumps({"items": [{"observation": [-1.0]}, "bad"]})
+                conn.request("POST", "/v1/act_batch", body=body)
+                r = conn.getresponse()
+                batch = (r.status, json.loads(r.read()))
+
+                conn.request("POST", "/v1/act", body=b"{nope")
+                r = conn.getresponse()
+                invalid = (r.status, json.loads(r.read()))
+
+                chunks = iter([b'{"observation"', b": [-0.5]}"])
+                conn.request("POST", "/v1/act", body=chunks, encode_chunked=True)
+                r = conn.getresponse()
+                chunked = json.loads(r.read())["action_type"]
+                return health, act, batch, invalid, chunked, conn.sock is sock
+            finally:
+                conn.close()
+
+        async def scenario():
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(
+                m.serve(server, "127.0.0.1", 0, on_ready=lambda srv: ready.set_result(srv))
+            )
+            srv = await ready
+            port = srv.sockets[0].getsockname()[1]
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, client, port)
+            finally:
+                task.cancel()
+
+        health, act, batch, invalid, chunked, same_socket = asyncio.run(scenario())
+        self.assertEqual(health, (200, b"OK\n"))
+        self.assertEqual(act[0], 200)
+        self.assertEqual(act[1]["action_type"], "BUY")
+        self.assertEqual(act[1]["size"], 0.5)
+        self.assertEqual(batch[0], 200)
+        self.assertEqual([it["action_type"] for it in batch[1]["items"]], ["SELL", "HOLD"])
+        self.assertEqual(batch[1]["items"][1]["reason"], "invalid_item")
+        self.assertEqual(invalid, (400, {"error": "invalid_json"}))
+        self.assertEqual(chunked, "SELL")
+        self.assertTrue(same_socket)
+
+    def test_server_answers_pipelined_requests_in_order(self):
+        import asyncio
+
+        m = self._load_impl()
+        server = m.AgentServer(m.ServerState(policy=m._MockPolicy("momentum"), size=1.0))
+
+        def request(obs, close=False):
+            body = ('{"observation": [%s]}' % obs).encode()
+            conn = b"Connection: close\r\n" if close else b""
+            return (
+                b"POST /v1/act HTTP/1.1\r\nHost: x\r\n" + conn
+                + b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+
+        async def scenario():
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(
+                m.serve(server, "127.0.0.1", 0, on_ready=lambda srv: ready.set_result(srv))
+            )
+            port = (await ready).sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(request("1.0") + request("-1.0") + request("0.0", close=True))
+                await writer.drain()
+                raw = await reader.read()  # server closes after the last request
+                writer.close()
+                return raw
+            finally:
+                task.cancel()
+
+        raw = asyncio.run(scenario())
+        self.assertEqual(raw.count(b"HTTP/1.1 200 OK"), 3)
+        order = [raw.index(t) for t in (b'"BUY"', b'"SELL"', b'"HOLD"')]
+        self.assertEqual(order, sorted(order))
+
+    def test_micro_batcher_coalesces_concurrent_requests(self):
+        import asyncio
+
+        m = self._load_impl()
+
+        class RecordingPolicy(m._MockPolicy):
+            def __init__(self):
+                super().__init__("momentum")
+                self.batch_sizes = []
+
+            def predict_batch(self, batch):
+                self.batch_sizes.append(len(batch))
+                return super().predict_batch(batch)
+
+        policy = RecordingPolicy()
+        batcher = m._MicroBatcher(policy, max_batch=8, max_wait_s=0.05)
+
+        async def scenario():
+            obs = [[1.0], [-1.0], [0.0], [2.0], [-3.0]]
+            return await asyncio.gather(*(batcher.predict(o) for o in obs))
+
+        results = asyncio.run(scenario())
+        self.assertEqual([a for a, _ in results], [1, 2, 0, 1, 2])
+        self.assertEqual(policy.batch_sizes, [5])
+
+    def test_micro_batcher_isolates_a_failing_observation(self):
+        import asyncio
+
+        m = self._load_impl()
+
+        class DimCheckingPolicy(m._MockPolicy):
+            def __init__(self):
+                super().__init__("momentum")
+                self.batch_sizes = []
+
+            def predict_batch(self, batch):
+                self.batch_sizes.append(len(batch))
+                if any(len(obs) != 2 for obs in batch):
+                    raise ValueError("observation dim mismatch")
+                return super().predict_batch(batch)
+
+        policy = DimCheckingPolicy()
+        batcher = m._MicroBatcher(policy, max_batch=8, max_wait_s=0.05)
+
+        async def scenario():
+            obs = [[1.0, 0.0], [1.0, 0.0, 5.0], [-1.0, 0.0]]
+            return await asyncio.gather(*(batcher.predict(o) for o in obs), return_exceptions=True)
+
+        good, bad, other = asyncio.run(scenario())
+        self.assertEqual((good[0], other[0]), (1, 2))
+        self.assertIsInstance(bad, ValueError)
+        self.assertEqual(policy.batch_sizes, [3, 1, 1, 1])
+
+    def test_sb3_policy_reuses_scratch_buffer(self):
+        import threading
+        from pathlib import Path
+
+        import numpy as np
+
+        m = self._load_impl()
+
+        class FakeModel:
+            def __init__(self):
+                self.inputs = []
+
+            def predict(self, x, deterministic=True):
+                self.inputs.append(x)
+                return np.where(x[..., 0] > 0, 1, 2), None
+
+        policy = m._Sb3Policy.__new__(m._Sb3Policy)
+        policy.model_path = Path("model.zip")
+        policy._model_version = "sb3:model.zip"
+        policy.max_batch = 4
+        policy._local = threading.local()
+        policy._model = FakeModel()
+        policy._torch_policy = None
+        policy._cuda = False
+
+        self.assertEqual(policy.predict([0.5, 1.0]), (1, None))
+        self.assertEqual(policy.predict_batch([[-1.0, 0.0], [2.0, 0.0]]), [(2, None), (1, None)])
+        first, second = policy._model.inputs
+        self.assertEqual(first.dtype, np.float32)
+        self.assertIs(first.base, second.base)
+
+        # /v1/act_batch: one dense call when every item is valid...
+        state = m.ServerState(policy=policy, size=1.0)
+        out = state.act_batch([{"observation": [1, 0]}, {"observation": ["-2", 0]}], 0)
+        self.assertEqual([it["action_type"] for it in out], ["BUY", "SELL"])
+        self.assertEqual(len(policy._model.inputs), 3)
+
+        # ...and per-item semantics (null -> invalid_obs) otherwise.
+        out = state.act_batch([{"observation": [1, None]}, {"observation": [-1, 0]}, 7], 0)
+        self.assertEqual([it["reason"] for it in out], ["invalid_obs", "sb3_sell", "invalid_item"])
+
+
+    def test_sb3_algo_from_zip_header(self):
+        import json
+        import tempfile
+        import zipfile
+        from pathlib import Path
+
+        m = self._load_impl()
+        cases = [
+            ({"policy_class": {"__module__": "stable_baselines3.dqn.policies"}}, "dqn"),
+            ({"policy_class": {"__module__": "stable_baselines3.sac.policies"}}, "sac"),
+            ({"policy_class": {"__module__": "stable_baselines3.common.policies"}, "clip_range": {}}, "ppo"),
+            ({"policy_class": {"__module__": "stable_baselines3.common.policies"}, "n_steps": 5}, "a2c"),
+            ({"policy_class": {"__module__": "elsewhere"}}, None),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.zip"
+            for meta, expected in cases:
+                with zipfile.ZipFile(path, "w") as zf:
+                    zf.writestr("data", json.dumps(meta))
+                self.assertEqual(m._sb3_algo_from_zip(path), expected)
+
+            path.write_bytes(b"not a zip")
+            self.assertIsNone(m._sb3_algo_from_zip(path))
 
 if __name__ == "__main__":
     unittest.main()
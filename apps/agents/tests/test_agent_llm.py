@@ -0,0 +1,361 @@
+import unittest
+
+
+class TestAgentLlm(unittest.TestCase):
+    def _load_impl(self):
+        import importlib.machinery
+        import importlib.util
+        import sys
+        from pathlib import Path
+
+        path = Path(__file__).resolve().parents[1] / "agent-llm" / "agent_llm.py"
+        spec = importlib.util.spec_from_loader(
+            "kairos_agent_llm_impl",
+            importlib.machinery.SourceFileLoader("kairos_agent_llm_impl", str(path)),
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return module
+
+    def _args(self, **overrides):
+        import argparse
+
+        args = argparse.Namespace(
+            provider="gemini",
+            model="gemini-1.5-flash",
+            llm_mode="mock",
+            temperature=0.0,
+            max_output_tokens=256,
+            openai_base_url="https://api.openai.com/v1",
+            openai_json_mode=False,
+            eval_every_n_bars=1,
+            cache_mode="off",
+            cache_dir="runs",
+            cache_semantic="off",
+            sim_threshold=0.95,
+            cache_semantic_window=256,
+            size_mode="pct_equity",
+            max_size=1.0,
+            return_mode="log",
+            sma_windows="10,50",
+            volatility_windows="10",
+            rsi_enabled=False,
+            sentiment_dim="auto",
+        )
+        for k, v in overrides.items():
+            setattr(args, k, v)
+        return args
+
+    def test_request_hash_is_stable(self):
+        # Recorded replay caches are keyed by this hash: its bytes must not drift between versions.
+        m = self._load_impl()
+        server = m.Server(("127.0.0.1", 0), m.Handler, self._args())
+        try:
+            request = {
+                "run_id": "r1",
+                "symbol": "BTCUSD",
+                "timeframe": "1m",
+                "timestamp": 1700000000,
+                "observation": [0.01, 1.5, -2.25, 1e-05, 0.1],
+                "portfolio_state": {"cash": 1000.0, "position_qty": 0.0},
+            }
+            h = server._request_hash(request, provider="gemini", model="gemini-1.5-flash")
+        finally:
+            server.server_close()
+        self.assertEqual(h, "d3e2bcbb5e03d4da5f5c2dc51e2be61abdabc77cac8419e10d5ce9f02eecdf2c")
+
+    def test_cache_imports_legacy_jsonl_and_roundtrips(self):
+        import io
+        import json
+        import os
+        import tempfile
+
+        m = self._load_impl()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "r1", "agent_llm_cache.sqlite")
+            self.assertIsNone(m.Cache(path).get("missing"))
+            self.assertFalse(os.path.exists(path))  # replay lookups never create the store
+
+            os.makedirs(os.path.dirname(path))
+            legacy = {"request_hash": "h1", "response": {"action_type": "BUY", "size": 0.25}, "created_at": "t0", "model": "m"}
+            with open(os.path.join(tmp, "r1", "agent_llm_cache.jsonl"), "w", encoding="utf-8") as f:
+                f.write(json.dumps(legacy) + "\n\n{broken\n")
+
+            cache = m.Cache(path)
+            self.assertEqual(cache.get("h1"), legacy["response"])
+            cache.put("h2", {"action_type": "HOLD", "size": 0.0}, meta={"model": "m", "llm_latency_ms": 3})
+            reader = m.Cache(path)  # e.g. --export-cache while the server is still running
+            self.assertIsNotNone(reader.get("h2"))
+            reader.close()
+            cache.close()
+
+            reopened = m.Cache(path)
+            self.assertEqual(reopened.get("h2"), {"action_type": "HOLD", "size": 0.0})
+            out = io.BytesIO()
+            self.assertEqual(reopened.export_jsonl(out), 2)
+            reopened.close()
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[0], legacy)
+        self.assertEqual(records[1]["request_hash"], "h2")
+        self.assertEqual(records[1]["llm_latency_ms"], 3)
+
+    def test_semantic_cache_reuses_near_identical_observation(self):
+        import math
+        import random
+        import tempfile
+
+        m = self._load_impl()
+        # Realistic scale: [log return, sma_10, sma_50, vol_10] on a BTC-like random walk around 40k.
+        rng = random.Random(7)
+        prices = [40000.0]
+        for _ in range(120):
+            prices.append(prices[-1] * math.exp(rng.gauss(0.0, 0.004)))
+        observations = []
+        for t in range(60, len(prices)):
+            rets = [math.log(prices[i] / prices[i - 1]) for i in range(t - 9, t + 1)]
+            mean = sum(rets) / len(rets)
+            vol = math.sqrt(sum((r - mean) ** 2 for r in rets) / len(rets))
+            observations.append([rets[-1], sum(prices[t - 9 : t + 1]) / 10, sum(prices[t - 49 : t + 1]) / 50, vol])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = self._args(cache_mode="record_replay", cache_dir=tmp, cache_semantic="on", sim_threshold=0.99)
+            server = m.Server(("127.0.0.1", 0), m.Handler, args)
+            calls = []
+            mock = server._mock_decision
+            server._mock_decision = lambda h: calls.append(h) or mock(h)
+            try:
+                base = {"run_id": "r1", "symbol": "BTCUSD", "timeframe": "1m"}
+                # Raw-price SMAs must not make every bar look alike: nearly all of these reach the LLM.
+                for ts, obs in enumerate(observations):
+                    server.act_single_bytes(dict(base, timestamp=ts, observation=obs), 0)
+                self.assertGreater(len(calls), 0.8 * len(observations))
+
+                before = len(calls)
+                far = dict(base, timestamp=1000, observation=[-0.03, 30000.0, 31000.0, 0.02])
+                server.act_single_bytes(far, 0)
+                self.assertEqual(len(calls), before + 1)
+
+                last = observations[-1]
+                near = dict(base, timestamp=1001, observation=[last[0] * 1.001, last[1] + 0.01, last[2], last[3]])
+                body = server.act_single_bytes(near, 0)
+                self.assertEqual(len(calls), before + 1)
+
+                # The hit is recorded under a hash that includes the semantic settings, so a run without
+                # the tier never replays the approximate answer as an exact one.
+                h = server._request_hash(near, provider="gemini", model="gemini-1.5-flash")
+                self.assertEqual(server._cache_for_run("r1").get_bytes(h), body)
+            finally:
+                server.server_close()
+
+        exact = m.Server(("127.0.0.1", 0), m.Handler, self._args())
+        try:
+            self.assertNotEqual(exact._request_hash(near, provider="gemini", model="gemini-1.5-flash"), h)
+        finally:
+            exact.server_close()
+
+    def test_act_batch_makes_one_llm_call(self):
+        import json
+
+        m = self._load_impl()
+        prompts = []
+
+        class FakeClient:
+            def __init__(self, decisions):
+                self.decisions = decisions
+
+            def generate_json(self, prompt):
+                prompts.append(prompt)
+                if "INPUT is a JSON array" in prompt:
+                    return json.dumps({"decisions": self.decisions}), 7
+                return json.dumps({"action_type": "SELL", "size": 0.1}), 3
+
+        server = m.Server(("127.0.0.1", 0), m.Handler, self._args(llm_mode="live"))
+        try:
+            items = [{"run_id": "r1", "symbol": "BTCUSD", "timeframe": "1m", "timestamp": t} for t in range(3)]
+            server._provider_client = lambda *a: FakeClient(
+                [{"action_type": "BUY", "size": 0.5}, {"action_type": "HOLD", "size": 0}, {"action_type": "SELL", "size": 0.2}]
+            )
+            out = [json.loads(b) for b in server.act_batch_bytes(items + ["bad"], 0, llm_api_key="k")]
+            self.assertEqual([o["action_type"] for o in out], ["BUY", "HOLD", "SELL", "HOLD"])
+            self.assertEqual(out[0]["latency_ms"], 7)
+            self.assertEqual(out[3]["reason"], "batch_invalid_item")
+            self.assertEqual(len(prompts), 1)
+
+            # A reply that does not line up with the input falls back to one call per item.
+            prompts.clear()
+            server._provider_client = lambda *a: FakeClient([{"action_type": "BUY", "size": 0.5}])
+            out = [json.loads(b) for b in server.act_batch_bytes(items, 0, llm_api_key="k")]
+            self.assertEqual([o["action_type"] for o in out], ["SELL"] * 3)
+            self.assertEqual(len(prompts), 4)
+        finally:
+            server.server_close()
+
+    def test_server_reuses_connection(self):
+        import http.client
+        import json
+        import tempfile
+        import threading
+
+        m = self._load_impl()
+        with tempfile.TemporaryDirectory() as tmp:
+            server = m.Server(("127.0.0.1", 0), m.Handler, self._args(cache_mode="record_replay", cache_dir=tmp))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+                conn.request("GET", "/health")
+                r = conn.getresponse()
+                self.assertEqual((r.status, r.read()), (200, b"OK\n"))
+                sock = conn.sock
+
+                request = {"run_id": "r1", "symbol": "BTCUSD", "timeframe": "1m", "observation": [0.1]}
+                replies = []
+                for _ in range(2):
+                    conn.request("POST", "/v1/act", body=json.dumps(request))
+                    r = conn.getresponse()
+                    replies.append((r.status, json.loads(r.read())))
+
+                conn.request("POST", "/v1/act", body=b"{nope")
+                r = conn.getresponse()
+                invalid = (r.status, json.loads(r.read()))
+                same_socket = conn.sock is sock
+
+                conn.request("POST", "/v1/act", body=iter([json.dumps(request).encode()]), encode_chunked=True)
+                r = conn.getresponse()
+                r.read()
+                chunked_closes = (r.getheader("Connection"), r.will_close)
+                conn.close()
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join(timeout=5)
+
+        self.assertTrue(same_socket)
+        self.assertEqual(replies[0][0], 200)
+        self.assertEqual(replies[0], replies[1])
+        self.assertEqual(replies[0][1]["model_version"], "mock-0.1")
+        self.assertEqual(invalid, (400, {"error": "invalid_json"}))
+        self.assertEqual(chunked_closes, ("close", True))
+
+    def test_asyncio_frontend_serves_cache_hits(self):
+        import asyncio
+        import http.client
+        import json
+        import tempfile
+
+        m = self._load_impl()
+
+        def client(port):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                conn.request("GET", "/health")
+                r = conn.getresponse()
+                health = (r.status, r.read())
+                sock = conn.sock
+
+                body = json.dumps({"run_id": "r1", "symbol": "BTCUSD", "timeframe": "1m", "observation": [0.1]})
+                acts = []
+                for _ in range(2):
+                    conn.request("POST", "/v1/act", body=body)
+                    r = conn.getresponse()
+                    acts.append((r.status, r.read()))
+
+                conn.request("POST", "/v1/act_batch", body=json.dumps({"items": [json.loads(body), "bad"]}))
+                r = conn.getresponse()
+                batch = (r.status, json.loads(r.read()))
+
+                conn.request("POST", "/v1/act", body=b"{nope")
+                r = conn.getresponse()
+                invalid = (r.status, json.loads(r.read()))
+                return health, acts, batch, invalid, conn.sock is sock
+            finally:
+                conn.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            state = m.Server(
+                ("127.0.0.1", 0), m.Handler, self._args(cache_mode="record_replay", cache_dir=tmp), bind_and_activate=False
+            )
+
+            async def scenario():
+                ready = asyncio.get_running_loop().create_future()
+                task = asyncio.create_task(
+                    m.serve_asyncio(m.AsyncFrontend(state), "127.0.0.1", 0, on_ready=lambda srv: ready.set_result(srv))
+                )
+                srv = await ready
+                port = srv.sockets[0].getsockname()[1]
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(None, client, port)
+                finally:
+                    task.cancel()
+
+            try:
+                health, acts, batch, invalid, same_socket = asyncio.run(scenario())
+            finally:
+                state.server_close()
+
+        self.assertEqual(health, (200, b"OK\n"))
+        self.assertEqual(acts[0][0], 200)
+        self.assertEqual(acts[1], acts[0])  # replayed from the cache byte-for-byte
+        self.assertEqual(json.loads(acts[0][1])["model_version"], "mock-0.1")
+        self.assertEqual(batch[0], 200)
+        self.assertEqual(batch[1]["items"][0], json.loads(acts[0][1]))
+        self.assertEqual(batch[1]["items"][1]["reason"], "batch_invalid_item")
+        self.assertEqual(invalid, (400, {"error": "invalid_json"}))
+        self.assertTrue(same_socket)
+
+    def test_openai_client_reuses_pooled_connection(self):
+        import json
+        import threading
+        import urllib.error
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        m = self._load_impl()
+        peers = []
+
+        class Provider(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802
+                req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                peers.append(self.client_address)
+                status = 400 if req["model"] == "bad" else 200
+                content = json.dumps({"action_type": "BUY", "size": 0.5})
+                body = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):  # noqa: N802
+                return
+
+        provider = ThreadingHTTPServer(("127.0.0.1", 0), Provider)
+        thread = threading.Thread(target=provider.serve_forever, daemon=True)
+        thread.start()
+        pool = m.HttpPool(5.0)
+        try:
+            base_url = f"http://127.0.0.1:{provider.server_address[1]}/v1"
+
+            def client(model):
+                return m.OpenAIClient("k", model, 0.0, 64, 5.0, base_url=base_url, json_mode=True, http=pool)
+
+            texts = [client("gpt").generate_json("prompt")[0] for _ in range(3)]
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                client("bad").generate_json("prompt")
+        finally:
+            pool.close()
+            provider.shutdown()
+            provider.server_close()
+            thread.join(timeout=5)
+
+        self.assertEqual(ctx.exception.code, 400)
+        self.assertEqual([json.loads(t)["action_type"] for t in texts], ["BUY"] * 3)
+        self.assertEqual(len(set(peers)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,18 @@ feature_version = "v1"
         self.assertIn("[report]", out)
         self.assertIn("html = false", out)
 
+    def test_patch_toml_many_is_single_pass_equivalent(self):
+        m = self._load_impl()
+        raw = '[agent]\nmode = "hold"\n[[splits]]\nid = "a"\n[report]\nhtml = true'
+        out = m._patch_toml_many(
+            raw,
+            {("agent", "mode"): '"remote"', ("agent", "url"): '"u"', ("report", "html"): "false", ("run", "run_id"): '"r"'},
+        )
+        self.assertEqual(
+            out,
+            '[agent]\nmode = "remote"\nurl = "u"\n[[splits]]\nid = "a"\n[report]\nhtml = false\n\n[run]\nrun_id = "r"\n',
+        )
+
     def test_make_single_split_sweep_toml(self):
         m = self._load_impl()
         _make_single_split_sweep_toml = m._make_single_split_sweep_toml
@@ -71,6 +83,171 @@ feature_version = "v1"
         self.assertIn('start = "2024-01-01T00:00:00Z"', raw)
         self.assertIn('end = "2024-02-01T00:00:00Z"', raw)
 
+    def test_default_actions_use_preserialized_bytes(self):
+        import json
+        import threading
+
+        m = self._load_impl()
+        for action, (action_type, size) in enumerate((("HOLD", 0.0), ("BUY", 1.0), ("SELL", 1.0))):
+            response = m.KairosGymEnv._default_action_to_response(None, action)
+            self.assertIs(type(response), dict)
+            self.assertEqual(json.loads(m._json_bytes(response)), response)
+            self.assertEqual((response["action_type"], response["size"]), (action_type, size))
+            self.assertEqual(json.loads(m._GYM_ACTIONS[action][1]), response)
+        self.assertEqual(m.KairosGymEnv._default_action_to_response(None, 3)["reason"], "invalid_action")
+
+        bridge = m._Bridge(timeout_s=5.0)
+        replies = []
+        caller = threading.Thread(target=lambda: replies.append(bridge.call({"timestamp": 1})))
+        caller.start()
+        response, body = m._GYM_ACTIONS[1]
+        bridge.next_call(5).set_response(response, body)
+        caller.join(timeout=5)
+        self.assertIs(replies[0], body)
+
+    def test_http_bridge_hands_request_to_rl_loop(self):
+        import http.client
+        import json
+        import threading
+
+        m = self._load_impl()
+        bridge = m._Bridge(timeout_s=5.0)
+        httpd = m._make_http_server(bridge, "127.0.0.1", 0)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        replies = []
+        sockets = []
+
+        def rust_side():
+            conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+            try:
+                for ts in (1, 2):
+                    conn.request("POST", "/v1/act", body=json.dumps({"timestamp": ts, "observation": [0.5]}))
+                    r = conn.getresponse()
+                    replies.append((r.status, json.loads(r.read())))
+                    sockets.append(conn.sock)
+            finally:
+                conn.close()
+
+        client = threading.Thread(target=rust_side)
+        client.start()
+        try:
+            seen = []
+            for action in ("BUY", "SELL"):
+                call = bridge.next_call(5)
+                seen.append(call.request["timestamp"])
+                call.set_response({"action_type": action, "size": 1.0})
+            client.join(timeout=5)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join(timeout=5)
+
+        self.assertEqual(seen, [1, 2])
+        self.assertIsNotNone(sockets[0])
+        self.assertIs(sockets[0], sockets[1])  # HTTP/1.1 keep-alive: both bars on one connection
+        self.assertEqual(replies, [(200, {"action_type": "BUY", "size": 1.0}), (200, {"action_type": "SELL", "size": 1.0})])
+
+    def test_bridge_wakes_when_tracked_process_exits(self):
+        import subprocess
+        import sys
+        import threading
+        import time
+
+        m = self._load_impl()
+        bridge = m._Bridge(timeout_s=5.0)
+        self.assertIsNone(bridge.next_call(0.01, proc=object()))
+
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        threading.Thread(target=lambda: (proc.wait(), bridge.mark_exited(proc)), daemon=True).start()
+        started = time.monotonic()
+        self.assertIsNone(bridge.next_call(10.0, proc=proc))
+        self.assertLess(time.monotonic() - started, 5.0)
+
+        # An exit recorded for an earlier process must not end a wait on a new one.
+        started = time.monotonic()
+        self.assertIsNone(bridge.next_call(0.2, proc=object()))
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_episode_splits_reuse_one_process(self):
+        import subprocess
+        import sys
+        import tempfile
+        from pathlib import Path
+
+        m = self._load_impl()
+        fake_sweep = (
+            "import json, sys, urllib.request\n"
+            "for run_id, n in (('a', 3), ('b', 2), ('c', 2)):\n"
+            "    for i in range(n):\n"
+            "        body = json.dumps({'run_id': run_id, 'timestamp': i, 'observation': [float(i)],\n"
+            "                           'portfolio_state': {'equity': 100.0 + i}}).encode()\n"
+            "        urllib.request.urlopen(sys.argv[1] + '/v1/act', data=body, timeout=10).read()\n"
+        )
+        spawned = []
+
+        class Env(m.KairosGymEnv):
+            def _spawn_rust(self, config_path, sweep_path):
+                spawned.append(sweep_path.read_text(encoding="utf-8").count("[[splits]]"))
+                return subprocess.Popen([sys.executable, "-c", fake_sweep, self.agent_url])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = Path(tmp) / "base.toml"
+            cfg.write_text('[run]\nrun_id = "x"\n', encoding="utf-8")
+            env = Env(base_config_path=cfg, mode="sweep", episode_splits=[(None, None)] * 3)
+            try:
+                _, info = env.reset()
+                self.assertEqual((info["run_id"], info["timestamp"]), ("a", 0))
+                env.step(0)
+                # Mid-split reset skips the rest of "a" without restarting the process.
+                _, info = env.reset()
+                self.assertEqual((info["run_id"], info["timestamp"]), ("b", 0))
+                env.step(0)
+                _, reward, terminated, _, info = env.step(0)
+                self.assertEqual((reward, terminated, info["terminated_reason"]), (0.0, True, "split_end"))
+                _, info = env.reset()
+                self.assertEqual((info["run_id"], info["timestamp"]), ("c", 0))
+                _, reward, terminated, _, info = env.step(0)
+                self.assertEqual((reward, terminated), (1.0, False))
+                _, _, terminated, _, info = env.step(0)
+                self.assertEqual((terminated, info["terminated_reason"]), (True, "rust_exit"))
+            finally:
+                env.close()
+
+        self.assertEqual(spawned, [3])
+
+    def test_vec_env_steps_workers_and_autoresets(self):
+        import sys
+        import tempfile
+        from pathlib import Path
+
+        m = self._load_impl()
+        fake_rust = (
+            "import json, re, sys, urllib.request\n"
+            "cfg = open(sys.argv[sys.argv.index('--config') + 1]).read()\n"
+            "url = re.search(r'^url = \"([^\"]+)\"', cfg, re.M).group(1)\n"
+            "for i in range(3):\n"
+            "    body = json.dumps({'timestamp': i, 'observation': [float(i), 7.0],\n"
+            "                       'portfolio_state': {'equity': 100.0 + i}}).encode()\n"
+            "    urllib.request.urlopen(url + '/v1/act', data=body, timeout=10).read()\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = Path(tmp) / "base.toml"
+            cfg.write_text('[run]\nrun_id = "x"\n', encoding="utf-8")
+            env = m.KairosVecEnv(2, base_config_path=cfg, rust_cmd=[sys.executable, "-c", fake_rust])
+            try:
+                obs, infos = env.reset()
+                self.assertEqual(obs.tolist(), [[0.0, 7.0], [0.0, 7.0]])
+                for _ in range(2):
+                    obs, rewards, terminated, _, _ = env.step([1, 2])
+                self.assertEqual((obs[:, 0].tolist(), rewards.tolist(), terminated.tolist()), ([2.0, 2.0], [1.0, 1.0], [False, False]))
+                obs, rewards, terminated, _, infos = env.step([0, 0])
+                self.assertEqual(terminated.tolist(), [True, True])
+                self.assertEqual(infos[0]["final_observation"].tolist(), [2.0, 7.0])
+                self.assertEqual(obs.tolist(), [[0.0, 7.0], [0.0, 7.0]])
+            finally:
+                env.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+
+class TestNotebooksBootstrap(unittest.TestCase):
+    def _load_impl(self):
+        import importlib.machinery
+        import importlib.util
+        import sys
+        from pathlib import Path
+
+        path = Path(__file__).resolve().parents[3] / "notebooks" / "_lib" / "bootstrap.py"
+        spec = importlib.util.spec_from_loader(
+            "kairos_notebooks_bootstrap_impl",
+            importlib.machinery.SourceFileLoader("kairos_notebooks_bootstrap_impl", str(path)),
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return module
+
+    def test_linear_quantiles_match_np_quantile(self):
+        import numpy as np
+
+        m = self._load_impl()
+        qs = (0.025, 0.5, 0.975)
+        rng = np.random.default_rng(0)
+        for n in (10, 511, 512, 1000, 2001):
+            stats = rng.random(n)
+            np.testing.assert_allclose(m._linear_quantiles(stats, qs), np.quantile(stats, qs), rtol=0, atol=1e-15)
+            stats[n // 3] = np.nan
+            self.assertTrue(all(np.isnan(m._linear_quantiles(stats, qs))))
+            self.assertTrue(all(np.isnan(np.quantile(stats, qs))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,15 @@
+import os
 import threading
 import time
 import unittest
 
 
+def _pid_objective(params):
+    _ = float(params["x"])
+    time.sleep(0.02)
+    return 1.0, f"pid={os.getpid()}"
+
+
 class TestOptimizeBayes(unittest.TestCase):
     def _load_impl(self):
         import importlib.machinery
@@ -99,5 +106,113 @@ class TestOptimizeBayes(unittest.TestCase):
         self.assertIn("0.001", rendered)
 
 
+    def test_surrogate_incremental_fit_matches_full_fit(self):
+        import numpy as np
+
+        m = self._load_impl()
+        rng = np.random.default_rng(3)
+        x = rng.random((12, 3))
+        y = rng.standard_normal(12)
+
+        incremental = m.RbfSurrogate()
+        incremental.fit(x[:5], y[:5])
+        incremental.fit(x[:9], y[:9])
+        incremental.fit(x, y)
+        full = m.RbfSurrogate()
+        full.fit(x, y)
+
+        cand = rng.random((20, 3))
+        mu_a, sigma_a = incremental.predict(cand)
+        mu_b, sigma_b = full.predict(cand)
+        np.testing.assert_allclose(incremental._chol, full._chol, atol=1e-8)
+        np.testing.assert_allclose(incremental._chol_inv, full._chol_inv, atol=1e-6)
+        np.testing.assert_allclose(incremental._chol_inv @ incremental._chol, np.eye(12), atol=1e-6)
+        np.testing.assert_allclose(mu_a, mu_b, atol=1e-6)
+        np.testing.assert_allclose(sigma_a, sigma_b, atol=1e-6)
+
+    def test_batch_encoder_matches_param_spec_encode(self):
+        import numpy as np
+
+        m = self._load_impl()
+        specs = [
+            m.ParamSpec(name="a", kind="float", low=0.0, high=2.0),
+            m.ParamSpec(name="b", kind="log_float", low=1e-5, high=1e-2),
+            m.ParamSpec(name="c", kind="int", low=64, high=512),
+            m.ParamSpec(name="d", kind="categorical", choices=["s", "m", "l"]),
+            m.ParamSpec(name="e", kind="categorical", choices=[[1], [2]]),
+        ]
+        batch = m._sample_batch(specs, np.random.default_rng(5), 16)
+        batch.append({"a": 1.0, "b": 1e-3, "c": 100, "d": "unknown", "e": [3]})
+
+        got = m._Encoder(specs).encode(batch)
+        want = [[spec.encode(params.get(spec.name)) for spec in specs] for params in batch]
+        for row, expected in zip(got.tolist(), want):
+            for a, b in zip(row, expected):
+                self.assertAlmostEqual(a, b, places=12)
+
+    def test_use_processes_runs_trials_in_worker_processes(self):
+        m = self._load_impl()
+        out = m.optimize(
+            specs=[m.ParamSpec(name="x", kind="float", low=0.0, high=1.0)],
+            objective=_pid_objective,
+            n_trials=8,
+            init_random=3,
+            parallelism=2,
+            maximize=True,
+            seed=11,
+            candidate_pool=32,
+            exploration=0.0,
+            use_processes=True,
+        )
+        self.assertEqual(out["successful_trials"], 8)
+        pids = {t["command"] for t in out["trials"]}
+        self.assertNotIn(f"pid={os.getpid()}", pids)
+
+    def test_ard_shortens_length_scale_of_relevant_dimension(self):
+        import numpy as np
+
+        m = self._load_impl()
+        rng = np.random.default_rng(0)
+        x = rng.random((30, 3))
+        y = np.sin(6.0 * x[:, 0])
+        y = (y - y.mean()) / y.std()
+
+        surrogate = m.RbfSurrogate(ard=True)
+        surrogate.fit(x, y)
+        scales = surrogate.length_scales
+        self.assertEqual(scales.shape, (3,))
+        self.assertLess(scales[0], scales[1])
+        self.assertLess(scales[0], scales[2])
+
+    def test_log_expected_improvement_matches_ei_and_ranks_its_tail(self):
+        import numpy as np
+
+        m = self._load_impl()
+        if m.sp_special is None:
+            self.skipTest("scipy not installed")
+        mu = np.array([0.0, 0.4, -3.0, -40.0, -60.0])
+        sigma = np.array([1.0, 0.5, 1.0, 1.0, 1.0])
+        log_ei = m._log_expected_improvement(mu, sigma, 0.5, exploration=0.01)
+        ei = m._expected_improvement(mu, sigma, 0.5, exploration=0.01)
+
+        np.testing.assert_allclose(log_ei[:3], np.log(ei[:3]), rtol=1e-10)
+        self.assertEqual(ei[4], 0.0)  # plain EI underflows...
+        self.assertTrue(np.all(np.isfinite(log_ei)))  # ...log-EI still ranks it
+        self.assertGreater(log_ei[3], log_ei[4])
+
+    def test_command_template_matches_render_command(self):
+        m = self._load_impl()
+        cmd = (
+            "python3 train.py --lr {learning_rate} --arch={net_arch} "
+            "--tag 'run {net_arch}' --keep {missing} --bs {batch_size}"
+        )
+        template = m._CommandTemplate(cmd)
+        for params in (
+            {"learning_rate": 0.001, "net_arch": "small", "batch_size": 64},
+            {"learning_rate": 1e-5, "net_arch": "two words", "batch_size": 128},
+            {"learning_rate": 0.5, "net_arch": "", "batch_size": 1},
+        ):
+            self.assertEqual(template.render(params), m._render_command(cmd, params))
+
 if __name__ == "__main__":
     unittest.main()
@@ -60,5 +60,17 @@ class TestTrainDrlSb3(unittest.TestCase):
         self.assertTrue(str(a).endswith(".zip"))
 
 
+    def test_eval_actor_falls_back_to_model_predict(self):
+        m = self._load_impl()
+
+        class FakeModel:
+            def predict(self, obs, deterministic=False):
+                assert deterministic
+                return 2 if obs[0] < 0 else 1, None
+
+        act = m._make_eval_actor(FakeModel())
+        self.assertEqual(act([-1.0, 0.0]), 2)
+        self.assertEqual(act([1.0, 0.0]), 1)
+
 if __name__ == "__main__":
     unittest.main()
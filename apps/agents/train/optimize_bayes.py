@@ -57,11 +57,14 @@ import argparse
 import concurrent.futures
 import json
 import math
-import random
+import multiprocessing
+import os
 import re
 import shlex
 import subprocess
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Optional
@@ -76,6 +79,26 @@ try:
 except Exception as exc:  # pragma: no cover
     raise SystemExit("optimize_bayes requires numpy (pip install numpy)") from exc
 
+try:  # Optional: C JSON parser for trial output (falls back to json).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # Optional: C ufuncs for the normal CDF (falls back to math.erf).
+    from scipy import special as sp_special  # type: ignore
+except Exception:  # pragma: no cover
+    sp_special = None  # type: ignore
+
+try:  # Optional: scrambled Sobol candidates (falls back to IID sampling).
+    from scipy.stats import qmc as sp_qmc  # type: ignore
+except Exception:  # pragma: no cover
+    sp_qmc = None  # type: ignore
+
+try:  # Optional: LAPACK triangular solves (falls back to np.linalg.solve).
+    from scipy import linalg as sp_linalg  # type: ignore
+except Exception:  # pragma: no cover
+    sp_linalg = None  # type: ignore
+
 
 def _to_float(value: Any, *, key: str) -> float:
     try:
@@ -105,21 +128,36 @@ class ParamSpec:
     high: Optional[float] = None
     choices: Optional[list[Any]] = None
 
-    def sample(self, rng: random.Random) -> Any:
+    def sample_batch(self, n: int, gen: np.random.Generator) -> list[Any]:
+        """`n` IID draws, uniform in this spec's space, in one vectorized call."""
+        if self.kind == "int":
+            assert self.low is not None and self.high is not None
+            return gen.integers(int(self.low), int(self.high) + 1, size=n).tolist()
+        if self.kind == "categorical":
+            assert self.choices is not None and len(self.choices) > 0
+            return [self.choices[i] for i in gen.integers(0, len(self.choices), size=n).tolist()]
+        return self.from_unit(gen.random(n))
+
+    def from_unit(self, u: np.ndarray) -> list[Any]:
+        """Map unit-interval samples to parameter values (uniform in this spec's space)."""
         if self.kind == "float":
             assert self.low is not None and self.high is not None
-            return rng.uniform(self.low, self.high)
+            return (self.low + u * (self.high - self.low)).tolist()
         if self.kind == "log_float":
             assert self.low is not None and self.high is not None
             lo = math.log(self.low)
             hi = math.log(self.high)
-            return math.exp(rng.uniform(lo, hi))
+            return np.exp(lo + u * (hi - lo)).tolist()
         if self.kind == "int":
             assert self.low is not None and self.high is not None
-            return rng.randint(int(self.low), int(self.high))
+            lo = int(self.low)
+            n = int(self.high) - lo + 1
+            return (lo + np.minimum((u * n).astype(np.int64), n - 1)).tolist()
         if self.kind == "categorical":
             assert self.choices is not None and len(self.choices) > 0
-            return rng.choice(self.choices)
+            n = len(self.choices)
+            idx = np.minimum((u * n).astype(np.int64), n - 1)
+            return [self.choices[i] for i in idx.tolist()]
         raise ValueError(f"unsupported param kind: {self.kind}")
 
     def encode(self, value: Any) -> float:
@@ -187,10 +225,65 @@ class TrialResult:
     duration_ms: int
     command: str
     error: Optional[str] = None
+    # Surrogate encoding of `params`, attached by optimize() (not serialized).
+    encoded: Optional[np.ndarray] = None
+
+
+@dataclass
+class _History:
+    """Encoded successful trials for the surrogate, grown one row per completion."""
+
+    x: np.ndarray
+    y: np.ndarray
+    n: int = 0
+    finite: bool = True
+    # Welford running moments of y (population std, like np.std).
+    y_mean: float = 0.0
+    y_m2: float = 0.0
+    y_max: float = -math.inf
+
+    @classmethod
+    def allocate(cls, capacity: int, dim: int) -> "_History":
+        return cls(
+            x=np.empty((capacity, dim), dtype=np.float64),
+            y=np.empty((capacity,), dtype=np.float64),
+        )
+
+    def append(self, x_row: np.ndarray, y: float) -> None:
+        self.x[self.n] = x_row
+        self.y[self.n] = y
+        self.n += 1
+        if not math.isfinite(y):
+            self.finite = False
+            return
+        delta = y - self.y_mean
+        self.y_mean += delta / self.n
+        self.y_m2 += delta * (y - self.y_mean)
+        self.y_max = max(self.y_max, y)
+
+    def normalized(self) -> tuple[np.ndarray, np.ndarray, float]:
+        """Return (x, standardized y, standardized best y) for the first n rows."""
+        y_sigma = math.sqrt(self.y_m2 / self.n) if self.n > 0 else 0.0
+        if y_sigma < 1e-12:
+            y_sigma = 1.0
+        y_norm = (self.y[: self.n] - self.y_mean) / y_sigma
+        return self.x[: self.n], y_norm, (self.y_max - self.y_mean) / y_sigma
 
 
-def _hash_params(params: dict[str, Any]) -> str:
-    return json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+def _freeze(value: Any) -> Any:
+    if isinstance(value, float):
+        # Trials differing only past 12 significant digits render the same CLI command.
+        return float(format(value, ".12g"))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _hash_params(params: dict[str, Any]) -> tuple:
+    """Hashable dedup key for a param dict (compared in-process only)."""
+    return tuple(sorted((k, _freeze(v)) for k, v in params.items()))
 
 
 def _build_specs(raw_space: dict[str, Any]) -> list[ParamSpec]:
@@ -267,61 +360,194 @@ def _load_config(path: Path) -> tuple[StudyConfig, RunnerConfig, list[ParamSpec]
     return study, runner, specs
 
 
-def _kernel_rbf(x1: np.ndarray, x2: np.ndarray, length_scale: float) -> np.ndarray:
-    diff = x1[:, None, :] - x2[None, :, :]
-    d2 = np.sum(diff * diff, axis=2)
-    return np.exp(-0.5 * d2 / (length_scale * length_scale))
+def _kernel_rbf(x1: np.ndarray, x2: np.ndarray, length_scale: Any) -> np.ndarray:
+    """RBF kernel; `length_scale` is a scalar or a per-dimension (ARD) array."""
+    if np.ndim(length_scale) > 0:
+        x1 = x1 / length_scale
+        x2 = x2 / length_scale
+        length_scale = 1.0
+    # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b: one GEMM instead of an (n1, n2, d) temporary.
+    s1 = np.einsum("ij,ij->i", x1, x1)
+    s2 = np.einsum("ij,ij->i", x2, x2)
+    d2 = x1 @ x2.T
+    d2 *= -2.0
+    d2 += s1[:, None]
+    d2 += s2[None, :]
+    np.maximum(d2, 0.0, out=d2)
+    d2 *= -0.5 / (length_scale * length_scale)
+    return np.exp(d2, out=d2)
+
+
+def _solve_lower(chol: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if sp_linalg is not None:
+        return sp_linalg.solve_triangular(chol, b, lower=True, check_finite=False)
+    return np.linalg.solve(chol, b)
+
+
+def _cho_solve(chol: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Solve (L L^T) x = b given the lower Cholesky factor L."""
+    if sp_linalg is not None:
+        return sp_linalg.cho_solve((chol, True), b, check_finite=False)
+    return np.linalg.solve(chol.T, np.linalg.solve(chol, b))
+
+
+# Per-dimension length scales tried by the ARD search (inputs live in [0, 1]).
+_ARD_GRID = np.geomspace(0.05, 5.0, 11)
+_ARD_SWEEPS = 2
+
+
+def _neg_log_marginal_likelihood(
+    x: np.ndarray, y: np.ndarray, length_scale: Any, noise: float
+) -> float:
+    k = _kernel_rbf(x, x, length_scale)
+    k[np.diag_indices_from(k)] += noise
+    try:
+        chol = np.linalg.cholesky(k)
+    except np.linalg.LinAlgError:
+        return math.inf
+    alpha = _cho_solve(chol, y)
+    n = y.shape[0]
+    return 0.5 * float(y @ alpha) + float(np.sum(np.log(np.diag(chol)))) + 0.5 * n * math.log(2.0 * math.pi)
 
 
 @dataclass
 class RbfSurrogate:
     length_scale: float = 0.25
     noise: float = 1e-6
+    # ARD: when enabled, per-dimension length scales are re-estimated by
+    # maximizing the marginal likelihood each time the data grows by ~25%.
+    ard: bool = False
+    length_scales: Optional[np.ndarray] = None
+    _tuned_n: int = 0
     _x: Optional[np.ndarray] = None
     _chol: Optional[np.ndarray] = None
-    _alpha: Optional[np.ndarray] = None
+    _chol_inv: Optional[np.ndarray] = None  # L^-1: predict() needs one GEMM, not a solve per fit
+    _z: Optional[np.ndarray] = None  # L^-1 y, so mu = (L^-1 K*)^T z
+    _alpha: Optional[np.ndarray] = None  # K^-1 y, only when the Cholesky failed
+
+    def _scale(self) -> Any:
+        return self.length_scales if self.length_scales is not None else self.length_scale
 
     def fit(self, x: np.ndarray, y: np.ndarray) -> None:
-        self._x = np.asarray(x, dtype=np.float64)
+        xv = np.asarray(x, dtype=np.float64)
         yv = np.asarray(y, dtype=np.float64)
-        k = _kernel_rbf(self._x, self._x, self.length_scale)
-        k = k + np.eye(k.shape[0], dtype=np.float64) * self.noise
+        n = xv.shape[0]
+        if self.ard and n >= 2 and (self._tuned_n == 0 or 4 * n >= 5 * self._tuned_n):
+            self.length_scales = self._tune_length_scales(xv, yv)
+            self._tuned_n = n
+            self._chol = None  # kernel changed: no incremental update
+        extended = self._extend_chol(xv)
+        if extended is not None:
+            chol, chol_inv = extended
+        else:
+            k = _kernel_rbf(xv, xv, self._scale())
+            k = k + np.eye(k.shape[0], dtype=np.float64) * self.noise
+            try:
+                chol = np.linalg.cholesky(k)
+            except np.linalg.LinAlgError:
+                self._x = xv
+                self._chol = None
+                self._chol_inv = None
+                self._z = None
+                self._alpha = np.linalg.solve(k, yv)
+                return
+            chol_inv = _solve_lower(chol, np.eye(chol.shape[0], dtype=np.float64))
+        self._x = xv
+        self._chol = chol
+        self._chol_inv = chol_inv
+        self._z = chol_inv @ yv
+        self._alpha = None
+
+    def _extend_chol(self, x: np.ndarray) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """
+        Reuse the previous factor and its inverse when `x` only appends rows to the last fit.
+
+        The kernel depends on x alone, so for K = [[K11, K12], [K21, K22]] the
+        new factor is [[L11, 0], [L21, L22]] with L21 = (L11^-1 K12)^T and
+        L22 = chol(K22 - L21 L21^T), and its inverse is
+        [[L11^-1, 0], [-L22^-1 L21 L11^-1, L22^-1]]: O(n^2 m) instead of a fresh O(n^3).
+        """
+        old_x, chol, chol_inv = self._x, self._chol, self._chol_inv
+        if old_x is None or chol is None or chol_inv is None:
+            return None
+        n = old_x.shape[0]
+        if x.shape[0] < n or x.shape[1] != old_x.shape[1] or not np.array_equal(x[:n], old_x):
+            return None
+        if x.shape[0] == n:
+            return chol, chol_inv
+
+        new = x[n:]
+        m = new.shape[0]
+        l21t = chol_inv @ _kernel_rbf(old_x, new, self._scale())  # [n, m]
+        k22 = _kernel_rbf(new, new, self._scale()) + np.eye(m, dtype=np.float64) * self.noise
         try:
-            chol = np.linalg.cholesky(k)
-            z = np.linalg.solve(chol, yv)
-            alpha = np.linalg.solve(chol.T, z)
-            self._chol = chol
-            self._alpha = alpha
+            l22 = np.linalg.cholesky(k22 - l21t.T @ l21t)
         except np.linalg.LinAlgError:
-            self._chol = None
-            self._alpha = np.linalg.solve(k, yv)
+            return None
+        l22_inv = _solve_lower(l22, np.eye(m, dtype=np.float64))
+        out = np.zeros((n + m, n + m), dtype=np.float64)
+        out[:n, :n] = chol
+        out[n:, :n] = l21t.T
+        out[n:, n:] = l22
+        out_inv = np.zeros((n + m, n + m), dtype=np.float64)
+        out_inv[:n, :n] = chol_inv
+        out_inv[n:, :n] = -l22_inv @ (l21t.T @ chol_inv)
+        out_inv[n:, n:] = l22_inv
+        return out, out_inv
+
+    def _tune_length_scales(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Coordinate search over a log grid of per-dimension length scales (min NLL)."""
+        if self.length_scales is not None and self.length_scales.shape == (x.shape[1],):
+            scales = self.length_scales.copy()
+        else:
+            scales = np.full((x.shape[1],), self.length_scale, dtype=np.float64)
+        best = _neg_log_marginal_likelihood(x, y, scales, self.noise)
+        for _ in range(_ARD_SWEEPS):
+            for j in range(scales.shape[0]):
+                current = scales[j]
+                for value in _ARD_GRID:
+                    if value == current:
+                        continue
+                    scales[j] = value
+                    nll = _neg_log_marginal_likelihood(x, y, scales, self.noise)
+                    if nll < best:
+                        best = nll
+                        current = value
+                scales[j] = current
+        return scales
 
     def predict(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-        if self._x is None or self._alpha is None:
+        if self._x is None or (self._z is None and self._alpha is None):
             mu = np.zeros((x.shape[0],), dtype=np.float64)
             sigma = np.ones((x.shape[0],), dtype=np.float64)
             return mu, sigma
 
         xc = np.asarray(x, dtype=np.float64)
-        k_star = _kernel_rbf(self._x, xc, self.length_scale)  # [n_train, n_cand]
-        mu = np.matmul(k_star.T, self._alpha)
+        k_star = _kernel_rbf(self._x, xc, self._scale())  # [n_train, n_cand]
 
-        if self._chol is not None:
-            v = np.linalg.solve(self._chol, k_star)
-            var = 1.0 - np.sum(v * v, axis=0)
+        if self._chol_inv is not None and self._z is not None:
+            # One GEMM gives v = L^-1 K*; mean and variance both reduce from it.
+            v = self._chol_inv @ k_star
+            mu = v.T @ self._z
+            var = 1.0 - np.einsum("ij,ij->j", v, v)
         else:
+            mu = np.matmul(k_star.T, self._alpha)
             var = np.ones((xc.shape[0],), dtype=np.float64) * 0.25
         var = np.maximum(var, 1e-12)
         sigma = np.sqrt(var)
         return mu, sigma
 
 
-def _normal_pdf(z: np.ndarray) -> np.ndarray:
-    return np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_INV_SQRT_2 = 1.0 / math.sqrt(2.0)
 
 
 def _normal_cdf(z: np.ndarray) -> np.ndarray:
-    return 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    if sp_special is not None:
+        return sp_special.ndtr(z)
+    zv = np.asarray(z, dtype=np.float64)
+    erf = np.fromiter(map(math.erf, (zv * _INV_SQRT_2).ravel()), dtype=np.float64, count=zv.size)
+    return 0.5 * (1.0 + erf.reshape(zv.shape))
 
 
 def _expected_improvement(
@@ -332,19 +558,145 @@ def _expected_improvement(
     exploration: float,
 ) -> np.ndarray:
     sigma = np.maximum(sigma, 1e-12)
-    imp = mu - best - exploration
+    imp = mu - (best + exploration)
     z = imp / sigma
-    ei = imp * _normal_cdf(z) + sigma * _normal_pdf(z)
-    ei[sigma <= 1e-12] = np.maximum(0.0, imp[sigma <= 1e-12])
+    ei = _normal_cdf(z)
+    ei *= imp
+    # sigma * pdf(z), computed in place over z's buffer.
+    z *= z
+    z *= -0.5
+    np.exp(z, out=z)
+    z *= sigma
+    z *= _INV_SQRT_2PI
+    ei += z
+    flat = sigma <= 1e-12
+    if flat.any():
+        ei[flat] = np.maximum(0.0, imp[flat])
     return ei
 
 
-def _sample_params(specs: list[ParamSpec], rng: random.Random) -> dict[str, Any]:
-    return {spec.name: spec.sample(rng) for spec in specs}
+_LOG_SQRT_2PI = 0.5 * math.log(2.0 * math.pi)
+_SQRT_HALF_PI = math.sqrt(0.5 * math.pi)
+
 
+def _log_h(z: np.ndarray) -> np.ndarray:
+    """log(phi(z) + z * Phi(z)), accurate far into the left tail (requires scipy)."""
+    out = np.empty_like(z)
+    right = z > -1.0
+    zr = z[right]
+    out[right] = np.log(np.exp(-0.5 * zr * zr) * _INV_SQRT_2PI + zr * sp_special.ndtr(zr))
+    # z = -x < -1: h = phi(x) * (1 - x * R(x)), R the Mills ratio sqrt(pi/2) * erfcx(x / sqrt(2)).
+    x = -z[~right]
+    tail = -0.5 * x * x - _LOG_SQRT_2PI
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inner = np.log1p(-x * _SQRT_HALF_PI * sp_special.erfcx(x * _INV_SQRT_2))
+    # Past |z| ~ 1e4 the subtraction above loses precision; use 1 - xR(x) ~ 1/x^2.
+    out[~right] = tail + np.where(x > 1e4, -2.0 * np.log(x), inner)
+    return out
+
+
+def _log_expected_improvement(
+    mu: np.ndarray,
+    sigma: np.ndarray,
+    best: float,
+    *,
+    exploration: float,
+) -> np.ndarray:
+    """
+    log(EI), same argmax as `_expected_improvement` where EI is representable.
+
+    Plain EI underflows to exactly 0 over most of the pool once the surrogate is
+    confident, turning argmax into a tie-break; log-EI keeps those ranked.
+    """
+    sigma = np.maximum(sigma, 1e-12)
+    imp = mu - (best + exploration)
+    log_ei = np.log(sigma) + _log_h(imp / sigma)
+    flat = sigma <= 1e-12
+    if flat.any():
+        with np.errstate(divide="ignore"):
+            log_ei[flat] = np.log(np.maximum(0.0, imp[flat]))
+    return log_ei
+
+
+def _sample_batch(specs: list[ParamSpec], gen: np.random.Generator, n: int) -> list[dict[str, Any]]:
+    columns = [spec.sample_batch(n, gen) for spec in specs]
+    names = [spec.name for spec in specs]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _sample_candidates(specs: list[ParamSpec], gen: np.random.Generator, n: int) -> list[dict[str, Any]]:
+    """
+    Candidate pool for the acquisition step.
+
+    With scipy, a freshly scrambled Sobol sequence (scrambled by `gen`) covers
+    the search box far more evenly than IID draws of the same size.
+    """
+    if sp_qmc is None:
+        return _sample_batch(specs, gen, n)
+    m = max(0, (n - 1).bit_length())
+    unit = sp_qmc.Sobol(d=len(specs), scramble=True, seed=gen).random_base2(m)[:n]
+    columns = [spec.from_unit(unit[:, j]) for j, spec in enumerate(specs)]
+    names = [spec.name for spec in specs]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class _Encoder:
+    """`ParamSpec.encode` over a batch of param dicts, one NumPy pass per column."""
+
+    def __init__(self, specs: list[ParamSpec]) -> None:
+        self.specs = specs
+        self._choice_index: list[Optional[dict[Any, int]]] = []
+        for spec in specs:
+            index: Optional[dict[Any, int]] = None
+            if spec.kind == "categorical" and spec.choices is not None:
+                index = {}
+                try:
+                    for i, choice in enumerate(spec.choices):
+                        index.setdefault(choice, i)  # first match, like list.index
+                except TypeError:
+                    index = None  # unhashable choices: use ParamSpec.encode
+            self._choice_index.append(index)
+
+    def encode(self, batch: list[dict[str, Any]]) -> np.ndarray:
+        out = np.empty((len(batch), len(self.specs)), dtype=np.float64)
+        for j, spec in enumerate(self.specs):
+            values = [params.get(spec.name) for params in batch]
+            out[:, j] = self._encode_column(spec, self._choice_index[j], values)
+        return out
+
+    @staticmethod
+    def _encode_column(spec: ParamSpec, index: Optional[dict[Any, int]], values: list[Any]) -> Any:
+        if spec.kind in ("float", "log_float"):
+            assert spec.low is not None and spec.high is not None
+            x = np.asarray(values, dtype=np.float64)
+            if spec.kind == "log_float":
+                x = np.log(np.maximum(1e-18, x))
+                lo = math.log(spec.low)
+                hi = math.log(spec.high)
+            else:
+                lo = spec.low
+                hi = spec.high
+            return (x - lo) / max(1e-12, hi - lo)
+
+        if spec.kind == "int":
+            assert spec.low is not None and spec.high is not None
+            lo = float(int(spec.low))
+            hi = float(int(spec.high))
+            return (np.trunc(np.asarray(values, dtype=np.float64)) - lo) / max(1.0, hi - lo)
+
+        if spec.kind == "categorical":
+            assert spec.choices is not None and len(spec.choices) > 0
+            if index is None:
+                return [spec.encode(v) for v in values]
+            if len(spec.choices) == 1:
+                return 0.0
+            try:
+                idx = [index.get(v, 0) for v in values]
+            except TypeError:
+                return [spec.encode(v) for v in values]
+            return np.asarray(idx, dtype=np.float64) / float(len(spec.choices) - 1)
 
-def _encode_params(specs: list[ParamSpec], params: dict[str, Any]) -> list[float]:
-    return [spec.encode(params.get(spec.name)) for spec in specs]
+        raise ValueError(f"unsupported param kind: {spec.kind}")
 
 
 def _format_cli_value(value: Any) -> str:
@@ -367,13 +719,72 @@ def _render_command(command_template: str, params: dict[str, Any]) -> list[str]:
     return shlex.split(rendered)
 
 
+# Values made only of these characters split identically before or after shlex.
+_SHELL_SAFE_RE = re.compile(r"[\w@%+=:,./-]+")
+
+
+class _CommandTemplate:
+    """
+    `_render_command` with the template tokenized once.
+
+    Each shlex token is kept as alternating literal/placeholder parts, so a
+    trial only joins strings. Values that are not shell-safe (spaces, quotes,
+    empty, ...) could tokenize differently once substituted, so those trials
+    go through `_render_command` unchanged.
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self.tokens = [_PARAM_PLACEHOLDER_RE.split(tok) for tok in shlex.split(template)]
+        self.keys = {key for parts in self.tokens for key in parts[1::2]}
+
+    def render(self, params: dict[str, Any]) -> list[str]:
+        values: dict[str, str] = {}
+        for key in self.keys:
+            if key in params:
+                value = _format_cli_value(params[key])
+                if not _SHELL_SAFE_RE.fullmatch(value):
+                    return _render_command(self.template, params)
+                values[key] = value
+        argv: list[str] = []
+        for parts in self.tokens:
+            if len(parts) == 1:
+                argv.append(parts[0])
+                continue
+            argv.append(
+                "".join(
+                    values.get(part, "{" + part + "}") if i % 2 else part
+                    for i, part in enumerate(parts)
+                )
+            )
+        return argv
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity tokens from json.dumps; let json decide.
+    return json.loads(text)
+
+
+def _iter_lines_reversed(text: str):
+    end = len(text)
+    while end >= 0:
+        start = text.rfind("\n", 0, end) + 1
+        yield text[start:end]
+        end = start - 1
+
+
 def _extract_metric(stdout: str, *, metric_key: str) -> float:
-    lines = [ln.strip() for ln in stdout.splitlines() if ln.strip()]
-    for line in reversed(lines):
+    # The metric line is usually last: scan backwards and stop at the first hit.
+    for raw in _iter_lines_reversed(stdout):
+        line = raw.strip()
         if not (line.startswith("{") and line.endswith("}")):
             continue
         try:
-            obj = json.loads(line)
+            obj = _json_loads(line)
         except Exception:
             continue
         if not isinstance(obj, dict):
@@ -383,44 +794,145 @@ def _extract_metric(stdout: str, *, metric_key: str) -> float:
 
     txt = stdout.strip()
     if txt.startswith("{") and txt.endswith("}"):
-        obj = json.loads(txt)
+        obj = _json_loads(txt)
         if isinstance(obj, dict) and metric_key in obj:
             return _to_float(obj[metric_key], key=f"metric {metric_key}")
     raise ValueError(f"metric_key={metric_key!r} not found in stdout JSON")
 
 
+_STDOUT_TAIL_BYTES = 64 * 1024
+_STDERR_TAIL_BYTES = 8 * 1024
+_JSON_LINES_KEPT = 32
+
+
+class _PipeTail:
+    """
+    Drain a child's pipe on a background thread, keeping only a bounded tail.
+
+    Trainers can print megabytes of progress over a long run; only the last
+    lines (and the JSON-looking ones, where the metric lives) are retained.
+    """
+
+    def __init__(self, pipe: Any, *, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.lines: deque[bytes] = deque()
+        self.json_lines: deque[bytes] = deque(maxlen=_JSON_LINES_KEPT)
+        self.size = 0
+        self.truncated = False
+        self._thread = threading.Thread(target=self._drain, args=(pipe,), daemon=True)
+        self._thread.start()
+
+    def _drain(self, pipe: Any) -> None:
+        with pipe:
+            for line in pipe:
+                stripped = line.strip()
+                if stripped.startswith(b"{") and stripped.endswith(b"}"):
+                    self.json_lines.append(stripped)
+                self.lines.append(line)
+                self.size += len(line)
+                while self.size > self.max_bytes and len(self.lines) > 1:
+                    self.size -= len(self.lines.popleft())
+                    self.truncated = True
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def text(self) -> str:
+        """Full output when it fit in the tail, else only the JSON-looking lines."""
+        raw = b"\n".join(self.json_lines) if self.truncated else b"".join(self.lines)
+        return raw.decode("utf-8", errors="replace")
+
+    def last_line(self) -> str:
+        for line in reversed(self.lines):
+            stripped = line.strip()
+            if stripped:
+                return stripped.decode("utf-8", errors="replace")
+        return ""
+
+
 def _build_command_objective(
     *,
     runner: RunnerConfig,
     metric_key: str,
 ) -> Callable[[dict[str, Any]], tuple[float, str]]:
     workdir = runner.workdir
+    template = _CommandTemplate(runner.command)
 
     def objective(params: dict[str, Any]) -> tuple[float, str]:
-        argv = _render_command(runner.command, params)
+        argv = template.render(params)
         if not argv:
             raise ValueError("empty command")
         started = time.time()
-        cp = subprocess.run(
+        proc = subprocess.Popen(
             argv,
             cwd=str(workdir),
-            capture_output=True,
-            text=True,
-            timeout=runner.timeout_sec,
-            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
+        out = _PipeTail(proc.stdout, max_bytes=_STDOUT_TAIL_BYTES)
+        err = _PipeTail(proc.stderr, max_bytes=_STDERR_TAIL_BYTES)
+        try:
+            returncode = proc.wait(timeout=runner.timeout_sec)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            out.join()
+            err.join()
         elapsed = time.time() - started
         cmd_str = " ".join(argv)
-        if cp.returncode != 0:
-            tail = (cp.stderr or cp.stdout or "").strip().splitlines()[-1:] or [""]
-            msg = f"exit={cp.returncode} ({elapsed:.2f}s): {tail[0]}"
+        if returncode != 0:
+            msg = f"exit={returncode} ({elapsed:.2f}s): {err.last_line() or out.last_line()}"
             raise RuntimeError(msg)
-        score = _extract_metric(cp.stdout or "", metric_key=metric_key)
+        score = _extract_metric(out.text(), metric_key=metric_key)
         return score, cmd_str
 
     return objective
 
 
+def _run_trial(
+    objective: Callable[[dict[str, Any]], tuple[float, str]],
+    trial_id: int,
+    params: dict[str, Any],
+) -> TrialResult:
+    started_at_ms = int(time.time() * 1000.0)
+    t0 = time.perf_counter()
+    try:
+        score, command = objective(params)
+        duration_ms = int((time.perf_counter() - t0) * 1000.0)
+        return TrialResult(
+            trial_id=trial_id,
+            params=params,
+            status="ok",
+            score=float(score),
+            started_at_ms=started_at_ms,
+            duration_ms=duration_ms,
+            command=command,
+        )
+    except Exception as exc:
+        duration_ms = int((time.perf_counter() - t0) * 1000.0)
+        return TrialResult(
+            trial_id=trial_id,
+            params=params,
+            status="error",
+            score=None,
+            started_at_ms=started_at_ms,
+            duration_ms=duration_ms,
+            command="",
+            error=str(exc),
+        )
+
+
+def _trial_executor(parallelism: int, *, use_processes: bool) -> concurrent.futures.Executor:
+    if not use_processes:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=parallelism)
+    # Prefer fork where available: the objective need not be importable by name.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=parallelism, mp_context=ctx)
+
+
 def optimize(
     *,
     specs: list[ParamSpec],
@@ -432,111 +944,91 @@ def optimize(
     seed: int,
     candidate_pool: int,
     exploration: float,
+    use_processes: bool = False,
 ) -> dict[str, Any]:
-    rng = random.Random(seed)
-    surrogate = RbfSurrogate()
+    """
+    Run the study and return best params plus every trial record.
+
+    Trials run on a thread pool by default, which suits subprocess objectives.
+    `use_processes=True` runs them on a process pool instead, so an in-process
+    CPU-bound objective is not serialized by the GIL; `objective` must then be
+    picklable (a module-level function). Suggestion and bookkeeping stay in
+    the parent either way.
+    """
+    gen = np.random.default_rng(seed)
+    surrogate = RbfSurrogate(ard=True)
+    history = _History.allocate(n_trials, len(specs))
+    encoder = _Encoder(specs)
+    # Back-to-back suggestions with no completion in between reuse the last fit.
+    fitted_n = -1
+    fitted_best = 0.0
 
     successful: list[TrialResult] = []
     trials: list[TrialResult] = []
-    seen_hashes: set[str] = set()
-    pending_hashes: set[str] = set()
+    seen_hashes: set[tuple] = set()
+    pending_hashes: set[tuple] = set()
 
     launched = 0
     completed = 0
-    running: dict[concurrent.futures.Future[TrialResult], tuple[int, str]] = {}
-
-    def suggest_params() -> dict[str, Any]:
-        if len(successful) < init_random or len(successful) < 2:
-            return _sample_params(specs, rng)
-
-        x_hist = np.asarray(
-            [_encode_params(specs, t.params) for t in successful],
-            dtype=np.float64,
-        )
-        y_hist = np.asarray(
-            [float(t.score) if t.score is not None else float("nan") for t in successful],
-            dtype=np.float64,
-        )
-        if not maximize:
-            y_hist = -y_hist
-        if not np.all(np.isfinite(y_hist)):
-            return _sample_params(specs, rng)
-
-        y_mu = float(np.mean(y_hist))
-        y_sigma = float(np.std(y_hist))
-        if y_sigma < 1e-12:
-            y_sigma = 1.0
-        y_norm = (y_hist - y_mu) / y_sigma
-
-        surrogate.fit(x_hist, y_norm)
-
-        candidate_params = [_sample_params(specs, rng) for _ in range(candidate_pool)]
-        candidate_x = np.asarray(
-            [_encode_params(specs, p) for p in candidate_params],
-            dtype=np.float64,
-        )
+    running: dict[concurrent.futures.Future[TrialResult], tuple[int, tuple, np.ndarray]] = {}
+
+    def suggest_params() -> tuple[dict[str, Any], Optional[np.ndarray]]:
+        """Next candidate, plus its encoding when the acquisition step already has it."""
+        nonlocal fitted_n, fitted_best
+        if history.n < init_random or history.n < 2:
+            return _sample_batch(specs, gen, 1)[0], None
+        if not history.finite:
+            return _sample_batch(specs, gen, 1)[0], None
+
+        if history.n != fitted_n:
+            x_hist, y_norm, fitted_best = history.normalized()
+            surrogate.fit(x_hist, y_norm)
+            fitted_n = history.n
+        best = fitted_best
+
+        candidate_params = _sample_candidates(specs, gen, candidate_pool)
+        candidate_x = encoder.encode(candidate_params)
         mu, sigma = surrogate.predict(candidate_x)
-        best = float(np.max(y_norm))
-        ei = _expected_improvement(mu, sigma, best, exploration=exploration)
+        if sp_special is not None:
+            ei = _log_expected_improvement(mu, sigma, best, exploration=exploration)
+        else:
+            ei = _expected_improvement(mu, sigma, best, exploration=exploration)
         best_idx = int(np.argmax(ei))
-        return candidate_params[best_idx]
-
-    def run_trial(trial_id: int, params: dict[str, Any]) -> TrialResult:
-        started_at_ms = int(time.time() * 1000.0)
-        t0 = time.perf_counter()
-        try:
-            score, command = objective(params)
-            duration_ms = int((time.perf_counter() - t0) * 1000.0)
-            return TrialResult(
-                trial_id=trial_id,
-                params=params,
-                status="ok",
-                score=float(score),
-                started_at_ms=started_at_ms,
-                duration_ms=duration_ms,
-                command=command,
-            )
-        except Exception as exc:
-            duration_ms = int((time.perf_counter() - t0) * 1000.0)
-            return TrialResult(
-                trial_id=trial_id,
-                params=params,
-                status="error",
-                score=None,
-                started_at_ms=started_at_ms,
-                duration_ms=duration_ms,
-                command="",
-                error=str(exc),
-            )
+        return candidate_params[best_idx], candidate_x[best_idx].copy()
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=parallelism) as pool:
+    with _trial_executor(parallelism, use_processes=use_processes) as pool:
         while completed < n_trials:
             while launched < n_trials and len(running) < parallelism:
-                candidate = suggest_params()
+                candidate, encoded = suggest_params()
                 h = _hash_params(candidate)
                 retries = 0
                 while (h in seen_hashes or h in pending_hashes) and retries < 32:
-                    candidate = _sample_params(specs, rng)
+                    candidate, encoded = _sample_batch(specs, gen, 1)[0], None
                     h = _hash_params(candidate)
                     retries += 1
+                if encoded is None:
+                    encoded = encoder.encode([candidate])[0]
                 trial_id = launched
                 launched += 1
                 pending_hashes.add(h)
-                fut = pool.submit(run_trial, trial_id, candidate)
-                running[fut] = (trial_id, h)
+                fut = pool.submit(_run_trial, objective, trial_id, candidate)
+                running[fut] = (trial_id, h, encoded)
 
             done, _ = concurrent.futures.wait(
                 list(running.keys()),
                 return_when=concurrent.futures.FIRST_COMPLETED,
             )
             for fut in done:
-                trial_id, h = running.pop(fut)
+                trial_id, h, encoded = running.pop(fut)
                 pending_hashes.discard(h)
                 result = fut.result()
+                result.encoded = encoded
                 trials.append(result)
-                seen_hashes.add(_hash_params(result.params))
+                seen_hashes.add(h)
                 if result.status == "ok":
                     successful.append(result)
+                    score = float(result.score) if result.score is not None else math.nan
+                    history.append(result.encoded, score if maximize else -score)
                 completed += 1
                 if completed >= n_trials:
                     break
@@ -570,6 +1062,22 @@ def optimize(
     }
 
 
+def _write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    """Pretty-printed JSON written to a sibling temp file, then renamed into place."""
+    data: Optional[bytes] = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            data = None  # e.g. ints beyond 64 bits: let json handle it
+    if data is None:
+        data = (json.dumps(payload, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description=(
@@ -632,11 +1140,7 @@ def main() -> int:
         "trials": result["trials"],
     }
 
-    study.output_path.parent.mkdir(parents=True, exist_ok=True)
-    study.output_path.write_text(
-        json.dumps(artifact, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    _write_json_atomic(study.output_path, artifact)
 
     print(
         json.dumps(
@@ -17,7 +17,7 @@ import math
 import sys
 import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import numpy as np
 
@@ -45,15 +45,75 @@ def _policy_kwargs_for_net_arch(net_arch: str) -> dict[str, Any]:
     return {"net_arch": [128, 128]}
 
 
+class _RunningSharpe:
+    """Welford accumulator: mean / sample std * sqrt(n) without storing returns."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, r: float) -> None:
+        self.n += 1
+        delta = r - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (r - self.mean)
+
+    def value(self) -> float:
+        if self.n < 2:
+            return 0.0
+        var = self.m2 / (self.n - 1)
+        if not math.isfinite(var) or var <= 0.0:
+            return 0.0
+        std = math.sqrt(var)
+        if std <= 1e-12:
+            return 0.0
+        return self.mean / std * math.sqrt(float(self.n))
+
+
 def _sharpe_like(returns: list[float]) -> float:
-    if len(returns) < 2:
-        return 0.0
-    arr = np.asarray(returns, dtype=np.float64)
-    mu = float(np.mean(arr))
-    std = float(np.std(arr, ddof=1))
-    if not np.isfinite(std) or std <= 1e-12:
-        return 0.0
-    return mu / std * math.sqrt(float(arr.shape[0]))
+    acc = _RunningSharpe()
+    for r in returns:
+        acc.push(float(r))
+    return acc.value()
+
+
+def _make_eval_actor(model: Any) -> Callable[[Any], Any]:
+    """
+    Deterministic single-observation actor for the evaluation loop.
+
+    `model.predict()` re-validates the observation, converts numpy->tensor and
+    back, and toggles training mode on every call. For Discrete-action policies
+    (PPO over Kairos Gym) we call `policy._predict()` under
+    `torch.inference_mode()` instead, as agent-drl does when serving.
+    """
+
+    def generic(obs: Any) -> Any:
+        action, _state = model.predict(obs, deterministic=True)
+        return action
+
+    policy = getattr(model, "policy", None)
+    if policy is None or not hasattr(policy, "_predict"):
+        return generic
+    if type(getattr(policy, "action_space", None)).__name__ != "Discrete":
+        return generic
+    try:
+        import torch  # type: ignore
+    except Exception:  # pragma: no cover
+        return generic
+
+    policy.set_training_mode(False)
+    device = policy.device
+
+    def direct(obs: Any) -> int:
+        x = torch.as_tensor(np.asarray(obs, dtype=np.float32), device=device).reshape(1, -1)
+        with torch.inference_mode():
+            action = policy._predict(x, deterministic=True)
+        return int(action.reshape(-1)[0])
+
+    return direct
 
 
 def _model_path_for_trial(
@@ -157,7 +217,7 @@ def main() -> int:
 
         obs, info = gym_env.reset(seed=int(args.seed) + 1)
         rewards: list[float] = []
-        returns: list[float] = []
+        sharpe = _RunningSharpe()
 
         prev_eq: Optional[float] = None
         if isinstance(info, dict):
@@ -165,8 +225,9 @@ def main() -> int:
             if isinstance(val, (int, float)):
                 prev_eq = float(val)
 
+        act = _make_eval_actor(model)
         for _ in range(max(1, int(args.eval_steps))):
-            action, _ = model.predict(obs, deterministic=True)
+            action = act(obs)
             obs, reward, terminated, truncated, info = gym_env.step(action)
             rewards.append(float(reward))
 
@@ -177,7 +238,7 @@ def main() -> int:
                     eq = float(val)
 
             if prev_eq is not None and eq is not None and abs(prev_eq) > 1e-12:
-                returns.append((eq / prev_eq) - 1.0)
+                sharpe.push((eq / prev_eq) - 1.0)
             if eq is not None:
                 prev_eq = eq
 
@@ -186,7 +247,7 @@ def main() -> int:
 
         elapsed_ms = int((time.perf_counter() - started) * 1000.0)
         out = {
-            "val_sharpe": float(_sharpe_like(returns)),
+            "val_sharpe": float(sharpe.value()),
             "eval_total_reward": float(sum(rewards)),
             "eval_steps": int(len(rewards)),
             "model_path": str(model_path),
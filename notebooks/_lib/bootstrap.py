@@ -1,10 +1,60 @@
 from __future__ import annotations
 
+import concurrent.futures
+import math
+import multiprocessing
+import os
 from dataclasses import dataclass
 from typing import Callable, Optional
 
 import numpy as np
 
+try:  # Optional: JIT-compiles the index walk (falls back to plain Python)
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
+
+def _fill_sb_indices(idx: np.ndarray, u: np.ndarray, jumps: np.ndarray, p: float) -> None:
+    """
+    Walk stationary-bootstrap indices from pre-drawn uniforms and jump targets.
+
+    A new block starts at jumps[t] when u[t] < p; otherwise the previous index advances (wrapping at n).
+    """
+    n = idx.shape[0]
+    idx[0] = jumps[0]
+    for t in range(1, n):
+        if u[t] < p:
+            idx[t] = jumps[t]
+        else:
+            nxt = idx[t - 1] + 1
+            idx[t] = 0 if nxt == n else nxt
+
+
+def _sb_indices_from_draws(u: np.ndarray, jumps: np.ndarray, p: float) -> np.ndarray:
+    """
+    Vectorized `_fill_sb_indices` over the last axis of (rows, n) draws.
+
+    Each position continues the block started at its most recent restart (u < p, plus t == 0), so
+    idx[t] = (jumps[r] + t - r) % n with r found by a running maximum over restart positions.
+    """
+    n = u.shape[-1]
+    t = np.arange(n)
+    start = np.where(u < p, t, 0)
+    np.maximum.accumulate(start, axis=-1, out=start)
+    idx = np.take_along_axis(jumps, start, axis=-1)
+    idx += t
+    idx -= start
+    if n & (n - 1) == 0:
+        idx &= n - 1  # power-of-two n: mask instead of an integer division per element
+    else:
+        idx %= n
+    return idx
+
+
+if numba is not None:  # pragma: no cover
+    _fill_sb_indices = numba.njit(cache=True, fastmath=True)(_fill_sb_indices)
+
 
 def stationary_bootstrap_indices(
     n: int,
@@ -23,38 +73,165 @@ def stationary_bootstrap_indices(
         return rng.integers(0, n, size=n, dtype=int)
 
     p = 1.0 / float(mean_block_len)
+    u = rng.random(n)
+    jumps = rng.integers(0, n, size=n, dtype=int)
+    if numba is None:
+        return _sb_indices_from_draws(u, jumps, p)
     idx = np.empty(n, dtype=int)
-    idx[0] = int(rng.integers(0, n))
-    for t in range(1, n):
-        if float(rng.random()) < p:
-            idx[t] = int(rng.integers(0, n))
-        else:
-            idx[t] = (idx[t - 1] + 1) % n
+    _fill_sb_indices(idx, u, jumps, p)
     return idx
 
 
+def stationary_bootstrap_matrix(
+    n: int,
+    n_boot: int,
+    *,
+    mean_block_len: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    `n_boot` stationary bootstrap index rows at once.
+
+    Returns an index matrix of shape (n_boot, n).
+    """
+    if n <= 0 or n_boot <= 0:
+        return np.empty((max(n_boot, 0), max(n, 0)), dtype=int)
+    if mean_block_len <= 1:
+        return rng.integers(0, n, size=(n_boot, n), dtype=int)
+
+    p = 1.0 / float(mean_block_len)
+    u = rng.random((n_boot, n))
+    jumps = rng.integers(0, n, size=(n_boot, n), dtype=int)
+    if numba is None:
+        return _sb_indices_from_draws(u, jumps, p)
+    idx = np.empty((n_boot, n), dtype=int)
+    for i in range(n_boot):
+        _fill_sb_indices(idx[i], u[i], jumps[i], p)
+    return idx
+
+
+# Elements per (rows, n) resample block: 8 MiB per int64/float64 array. About five are alive at once
+# (u/jumps and the index walk, then idx, x[idx] and the reduction temporaries), so ~40 MiB peak.
+_VEC_BLOCK_ELEMS = 1 << 20
+
+_VEC_STATS = ("mean", "sum", "std", "sharpe")
+
+
+def _vectorized_stat(vals: np.ndarray, stat_name: str, *, eps: float = 1e-12) -> np.ndarray:
+    if stat_name == "mean":
+        return vals.mean(axis=1)
+    if stat_name == "sum":
+        return vals.sum(axis=1)
+    if vals.shape[1] < 2:
+        return np.zeros(vals.shape[0], dtype=float)
+    sd = vals.std(axis=1, ddof=1)
+    if stat_name == "std":
+        return sd
+    # Same conventions as metrics.sharpe: zero when the resample has no dispersion.
+    ok = np.isfinite(sd) & (sd >= eps)
+    out = np.zeros(vals.shape[0], dtype=float)
+    np.divide(vals.mean(axis=1), sd, out=out, where=ok)
+    return out
+
+
+def _boot_stats(
+    x: np.ndarray,
+    stat_fn: Optional[Callable[[np.ndarray], float]],
+    stat_name: Optional[str],
+    *,
+    n_boot: int,
+    mean_block_len: int,
+    seed: int | np.random.SeedSequence,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    stats = np.empty(n_boot, dtype=float)
+    # Both paths draw the same blocks of index rows, so stat_name="mean" and stat_fn=np.mean
+    # see identical resamples for a given seed.
+    rows = max(1, _VEC_BLOCK_ELEMS // x.size)
+    for start in range(0, n_boot, rows):
+        stop = min(n_boot, start + rows)
+        idx = stationary_bootstrap_matrix(x.size, stop - start, mean_block_len=mean_block_len, rng=rng)
+        if stat_name is not None:
+            stats[start:stop] = _vectorized_stat(x[idx], stat_name)
+        else:
+            for i, row in enumerate(idx, start):
+                stats[i] = float(stat_fn(x[row]))
+    return stats
+
+
+# Below this many resamples a full sort (np.quantile) is as fast as partitioning.
+_PARTITION_MIN = 512
+
+
+def _linear_quantiles(stats: np.ndarray, qs: tuple[float, ...]) -> list[float]:
+    """
+    np.quantile(stats, qs) with the default "linear" method, via one np.partition call.
+    """
+    n = stats.size
+    # np.partition sorts NaN to the end instead of propagating it, so defer to np.quantile (-> NaN).
+    if n < _PARTITION_MIN or np.isnan(stats).any():
+        return [float(v) for v in np.quantile(stats, qs)]
+    pos = [(n - 1) * float(q) for q in qs]
+    ks = sorted({k for h in pos for k in (int(math.floor(h)), min(int(math.floor(h)) + 1, n - 1))})
+    part = np.partition(stats, ks)
+    out = []
+    for h in pos:
+        k = int(math.floor(h))
+        lo = float(part[k])
+        hi = float(part[min(k + 1, n - 1)])
+        out.append(lo + (h - k) * (hi - lo))
+    return out
+
+
 def bootstrap_ci(
     x: np.ndarray,
-    stat_fn: Callable[[np.ndarray], float],
+    stat_fn: Optional[Callable[[np.ndarray], float]] = None,
     *,
     n_boot: int = 2000,
     alpha: float = 0.05,
     mean_block_len: int = 24,
     seed: int = 0,
+    stat_name: Optional[str] = None,
+    n_jobs: int = 1,
 ) -> tuple[float, float]:
     """
     Bootstrap CI using stationary bootstrap by default (time-series friendly).
+
+    Pass `stat_name` ("mean", "sum", "std" or "sharpe") instead of `stat_fn` to compute the
+    statistic for whole blocks of resamples with NumPy reductions; "sharpe" matches `metrics.sharpe`
+    with `risk_free=0`. A custom `stat_fn` is evaluated once per resample, on the same resamples
+    (same seed) as the matching `stat_name`.
+
+    `n_jobs > 1` (or `-1` for all cores) splits the resamples across worker processes, each seeded
+    from `SeedSequence(seed).spawn(n_jobs)`; `stat_fn` must then be picklable (no lambdas). Results are
+    reproducible for a given `(seed, n_jobs)` but differ from the serial stream.
     """
+    if stat_name is not None and stat_name not in _VEC_STATS:
+        raise ValueError(f"stat_name must be one of {_VEC_STATS}, got {stat_name!r}")
+    if stat_name is None and stat_fn is None:
+        raise ValueError("either stat_fn or stat_name is required")
+
     x = np.asarray(x, dtype=float)
     if x.size == 0:
         return (0.0, 0.0)
 
-    rng = np.random.default_rng(seed)
-    stats = np.empty(n_boot, dtype=float)
-    for i in range(n_boot):
-        idx = stationary_bootstrap_indices(x.size, mean_block_len=mean_block_len, rng=rng)
-        stats[i] = float(stat_fn(x[idx]))
-    lo = float(np.quantile(stats, alpha / 2.0))
-    hi = float(np.quantile(stats, 1.0 - alpha / 2.0))
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(int(n_jobs), n_boot))
+    if n_jobs == 1:
+        stats = _boot_stats(x, stat_fn, stat_name, n_boot=n_boot, mean_block_len=mean_block_len, seed=seed)
+    else:
+        children = np.random.SeedSequence(seed).spawn(n_jobs)
+        sizes = [n_boot // n_jobs + (i < n_boot % n_jobs) for i in range(n_jobs)]
+        # Prefer fork where available: stat_fn need not be importable by name.
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs, mp_context=ctx) as pool:
+            futs = [
+                pool.submit(_boot_stats, x, stat_fn, stat_name, n_boot=size, mean_block_len=mean_block_len, seed=child)
+                for size, child in zip(sizes, children)
+            ]
+            stats = np.concatenate([f.result() for f in futs])
+    lo, hi = _linear_quantiles(stats, (alpha / 2.0, 1.0 - alpha / 2.0))
     return lo, hi
 
@@ -14,6 +14,11 @@ except Exception:  # pragma: no cover
 
 import pandas as pd
 
+try:
+    from .dataframes import read_csv_fast
+except ImportError:  # notebooks put notebooks/_lib itself on sys.path and import `cpcv` flat
+    from dataframes import read_csv_fast  # type: ignore
+
 try:  # Optional at import-time; required by notebooks/requirements.txt
     from sklearn.model_selection import BaseCrossValidator
 except Exception:  # pragma: no cover
@@ -85,8 +90,23 @@ def run_cpcv(
     return CpcvRun(out_csv=Path(payload["out_csv"]), json=payload)
 
 
+CPCV_DTYPES = {
+    "fold_id": "int64",
+    "set": "str",
+    "segment_id": "int64",
+    "start_idx": "int64",
+    "end_idx": "int64",
+    "start_ts": "int64",
+    "end_ts": "int64",
+    # Keep RFC3339 strings as text (PyArrow would otherwise infer timestamps); groups are "0|3".
+    "start_utc": "str",
+    "end_utc": "str",
+    "test_groups": "str",
+}
+
+
 def read_cpcv_csv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = read_csv_fast(path, dtype=CPCV_DTYPES)
     expected = [
         "fold_id",
         "set",
@@ -129,6 +149,21 @@ class KairosCPCV(BaseCrossValidator):
         self._out_csv = Path(out_csv)
         self._strict_len_check = bool(strict_len_check)
         self._tmpdir = _tmpdir
+        # (fold_id, set) -> (start_idx, end_idx) arrays ordered by segment_id; built once so split()
+        # never rescans the DataFrame.
+        self._segments = _segment_index(folds_df)
+        # fold_id -> (train_idx, test_idx), filled lazily by split() and shared by later passes.
+        self._fold_cache: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_fold_cache"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # Unpickled copies (e.g. in parallel CV workers) rebuild their own index arrays.
+        self._fold_cache = {}
 
     @property
     def n_samples(self) -> int:
@@ -217,40 +252,53 @@ class KairosCPCV(BaseCrossValidator):
                     "Ensure X was built from the same time window used to generate CPCV."
                 )
 
-        fold_ids = sorted(int(v) for v in self._df["fold_id"].unique())
+        empty = (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        fold_ids = sorted({fold_id for (fold_id, _) in self._segments})
         for fold_id in fold_ids:
-            train_segments = _segments_for_fold(self._df, fold_id, "train")
-            test_segments = _segments_for_fold(self._df, fold_id, "test")
-            train_idx = _expand_segments(train_segments)
-            test_idx = _expand_segments(test_segments)
-            yield train_idx, test_idx
-
-
-def _segments_for_fold(
-    df: pd.DataFrame,
-    fold_id: int,
-    set_name: str,
-) -> list[tuple[int, int]]:
-    subset = df[(df["fold_id"] == fold_id) & (df["set"] == set_name)].copy()
-    if subset.empty:
-        return []
-    subset = subset.sort_values("segment_id", kind="stable")
-    out: list[tuple[int, int]] = []
-    for row in subset.itertuples(index=False):
-        start = int(getattr(row, "start_idx"))
-        end = int(getattr(row, "end_idx"))
-        if end < start:
-            raise ValueError(f"invalid segment: start_idx={start} end_idx={end}")
-        out.append((start, end))
+            cached = self._fold_cache.get(fold_id)
+            if cached is None:
+                train_idx = _expand_segments(*self._segments.get((fold_id, "train"), empty))
+                test_idx = _expand_segments(*self._segments.get((fold_id, "test"), empty))
+                # Shared across split() calls, so callers get read-only views.
+                train_idx.flags.writeable = False
+                test_idx.flags.writeable = False
+                cached = self._fold_cache[fold_id] = (train_idx, test_idx)
+            yield cached
+
+
+def _segment_index(df: pd.DataFrame) -> dict[tuple[int, str], tuple["np.ndarray", "np.ndarray"]]:
+    if df.empty:
+        return {}
+    segment_id = df["segment_id"].to_numpy()
+    starts = df["start_idx"].to_numpy(dtype=np.int64)
+    ends = df["end_idx"].to_numpy(dtype=np.int64)
+    bad = np.flatnonzero(ends < starts)
+    if bad.size:
+        i = int(bad[0])
+        raise ValueError(f"invalid segment: start_idx={int(starts[i])} end_idx={int(ends[i])}")
+
+    out: dict[tuple[int, str], tuple[np.ndarray, np.ndarray]] = {}
+    for (fold_id, set_name), rows in df.groupby(["fold_id", "set"], sort=False).indices.items():
+        rows = rows[np.argsort(segment_id[rows], kind="stable")]
+        out[(int(fold_id), str(set_name))] = (starts[rows], ends[rows])
     return out
 
 
-def _expand_segments(segments: list[tuple[int, int]]) -> "np.ndarray":
+def _expand_segments(starts: "np.ndarray", ends: "np.ndarray") -> "np.ndarray":
+    """
+    Concatenate the inclusive ranges [starts[i], ends[i]] into one index array.
+
+    Built with a single arange plus a per-segment offset (start minus the segment's output position),
+    instead of one arange per segment.
+    """
     if np is None:  # pragma: no cover
         raise RuntimeError(
             "numpy is required for KairosCPCV. Install notebooks/requirements.txt."
         )
-    if not segments:
+    if starts.size == 0:
         return np.array([], dtype=np.int64)
-    parts = [np.arange(s, e + 1, dtype=np.int64) for (s, e) in segments]
-    return np.concatenate(parts, axis=0)
+    lens = ends - starts + 1
+    offsets = np.cumsum(lens) - lens
+    idx = np.arange(int(lens.sum()), dtype=np.int64)
+    idx += np.repeat(starts - offsets, lens)
+    return idx
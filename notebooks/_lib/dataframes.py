@@ -2,12 +2,61 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 
+try:  # Optional: faster JSON decoding (falls back to stdlib json)
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # Optional: multithreaded CSV/JSONL parsing (falls back to pandas' C engine / json)
+    import pyarrow
+    import pyarrow.json as pa_json
+except Exception:  # pragma: no cover
+    pyarrow = None  # type: ignore
+    pa_json = None  # type: ignore
+
+# Column types as written by the Rust reporters; declaring them lets the parser skip inference.
+TRADES_DTYPES = {
+    "timestamp_utc": "int64",
+    "symbol": "str",
+    "side": "str",
+    "qty": "float64",
+    "price": "float64",
+    "fee": "float64",
+    "slippage": "float64",
+    "strategy_id": "str",
+    "reason": "str",
+}
+EQUITY_DTYPES = {
+    "timestamp_utc": "int64",
+    "equity": "float64",
+    "cash": "float64",
+    "position_qty": "float64",
+    "unrealized_pnl": "float64",
+    "realized_pnl": "float64",
+}
+
+
+def read_csv_fast(path: Path, *, dtype: Optional[dict[str, str]] = None) -> pd.DataFrame:
+    """
+    pd.read_csv using the PyArrow engine when pyarrow is installed.
+
+    Results keep the default (NumPy) dtype backend either way; `dtype` entries for absent columns are
+    ignored so the callers' missing-column checks still report them.
+    """
+    if pyarrow is None:
+        return pd.read_csv(path, dtype=dtype)
+    if dtype:
+        header = pd.read_csv(path, nrows=0).columns
+        dtype = {k: v for k, v in dtype.items() if k in header}
+    return pd.read_csv(path, engine="pyarrow", dtype=dtype or None)
+
 
 def read_trades_csv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = read_csv_fast(path, dtype=TRADES_DTYPES)
     expected = [
         "timestamp_utc",
         "symbol",
@@ -26,7 +75,7 @@ def read_trades_csv(path: Path) -> pd.DataFrame:
 
 
 def read_equity_csv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = read_csv_fast(path, dtype=EQUITY_DTYPES)
     expected = [
         "timestamp_utc",
         "equity",
@@ -41,16 +90,40 @@ def read_equity_csv(path: Path) -> pd.DataFrame:
     return df
 
 
+def _read_logs_jsonl_arrow(path: Path) -> Optional[pd.DataFrame]:
+    try:
+        table = pa_json.read_json(str(path))
+    except pyarrow.ArrowInvalid:
+        # Ragged schemas (a field changing type across lines) are left to the Python path.
+        return None
+    if table.num_rows == 0:
+        return pd.DataFrame()
+    # Nested objects become "parent.child" columns, the same naming as json_normalize.
+    while any(pyarrow.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table.to_pandas()
+
+
 def read_logs_jsonl(path: Path) -> pd.DataFrame:
+    if pa_json is not None:
+        df = _read_logs_jsonl_arrow(path)
+        if df is not None:
+            return df
+    loads = orjson.loads if orjson is not None else json.loads
     rows: list[dict] = []
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        raw = raw.strip()
-        if not raw:
-            continue
-        rows.append(json.loads(raw))
+    # Stream line by line so the whole file is never held as text next to the parsed rows.
+    with path.open("rb") as f:
+        for raw in f:
+            raw = raw.strip()
+            if not raw:
+                continue
+            rows.append(loads(raw))
     if not rows:
         return pd.DataFrame()
-    return pd.json_normalize(rows)
+    # json_normalize only matters for nested records; flat ones go straight to the constructor.
+    if any(isinstance(v, dict) for row in rows for v in row.values()):
+        return pd.json_normalize(rows)
+    return pd.DataFrame(rows)
 
 
 def maybe_head(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
@@ -5,6 +5,40 @@ from typing import Optional
 
 import numpy as np
 
+try:  # Optional: JIT-compiles the single-pass moments (falls back to NumPy reductions)
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
+
+def _mean_std(r: np.ndarray) -> tuple[float, float]:
+    # One pass (Welford) over r: mean and ddof=1 standard deviation.
+    mean = 0.0
+    m2 = 0.0
+    n = r.shape[0]
+    for i in range(n):
+        d = r[i] - mean
+        mean += d / (i + 1)
+        m2 += d * (r[i] - mean)
+    sd = (m2 / (n - 1)) ** 0.5 if n > 1 else 0.0
+    return mean, sd
+
+
+def _abs_diff_sum(p: np.ndarray) -> float:
+    # One pass: sum of |p[i] - p[i-1]|.
+    s = 0.0
+    prev = p[0]
+    for i in range(1, p.shape[0]):
+        v = p[i]
+        s += abs(v - prev)
+        prev = v
+    return s
+
+
+if numba is not None:  # pragma: no cover
+    _mean_std = numba.njit(cache=True)(_mean_std)
+    _abs_diff_sum = numba.njit(cache=True)(_abs_diff_sum)
+
 
 def sharpe(returns: np.ndarray, *, risk_free: float = 0.0, eps: float = 1e-12) -> float:
     """
@@ -17,9 +51,13 @@ def sharpe(returns: np.ndarray, *, risk_free: float = 0.0, eps: float = 1e-12) -
     r = np.asarray(returns, dtype=float)
     if r.size == 0:
         return 0.0
-    ex = r - float(risk_free)
-    mu = float(np.mean(ex))
-    sd = float(np.std(ex, ddof=1)) if ex.size > 1 else 0.0
+    # The standard deviation is shift-invariant, so the excess-return array is never materialized.
+    if numba is not None and r.ndim == 1:
+        mu, sd = _mean_std(r)
+    else:
+        mu = float(np.mean(r))
+        sd = float(np.std(r, ddof=1)) if r.size > 1 else 0.0
+    mu -= float(risk_free)
     if not np.isfinite(sd) or sd < eps:
         return 0.0
     return mu / sd
@@ -33,7 +71,11 @@ def turnover(position: np.ndarray) -> float:
     p = np.asarray(position, dtype=float)
     if p.size <= 1:
         return 0.0
-    return float(np.sum(np.abs(np.diff(p))))
+    if numba is not None and p.ndim == 1:
+        return float(_abs_diff_sum(p))
+    d = np.subtract(p[..., 1:], p[..., :-1])
+    np.abs(d, out=d)
+    return float(d.sum())
 
 
 @dataclass(frozen=True)
@@ -3,8 +3,32 @@ from __future__ import annotations
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+# Series longer than this many points per horizontal pixel are decimated before plotting.
+_DECIMATE_POINTS_PER_PX = 4
+
+
+def _minmax_decimate_idx(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Positions keeping each bucket's min and max (in time order) plus both endpoints.
+
+    At one bucket per pixel column the decimated line covers the same pixels as the full series.
+    """
+    n = int(y.size)
+    k = -(-n // buckets)
+    m = n // k
+    body = y[: m * k].reshape(m, k)
+    base = np.arange(m) * k
+    lo = base + np.argmin(body, axis=1)
+    hi = base + np.argmax(body, axis=1)
+    pairs = np.sort(np.stack([lo, hi], axis=1), axis=1).ravel()
+    tail = np.arange(m * k, n)
+    if tail.size:
+        tail = np.unique(tail[[np.argmin(y[tail]), np.argmax(y[tail])]])
+    return np.unique(np.concatenate(([0], pairs, tail, [n - 1])))
+
 
 def plot_equity_curve(
     equity: pd.DataFrame,
@@ -20,6 +44,14 @@ def plot_equity_curve(
         raise ValueError("equity dataframe missing 'equity' column")
 
     fig, ax = plt.subplots(figsize=(10, 4))
+    width_px = int(fig.get_figwidth() * fig.dpi)
+    if len(y) > _DECIMATE_POINTS_PER_PX * width_px:
+        idx = _minmax_decimate_idx(y.to_numpy(dtype=float), width_px)
+        x = x.take(idx)
+        y = y.take(idx)
+    if pd.api.types.is_object_dtype(x.dtype) or pd.api.types.is_string_dtype(x.dtype):
+        # Parse timestamp strings once (cache=True reuses repeated values) instead of per draw.
+        x = pd.to_datetime(x, utc=True, cache=True)
     ax.plot(x, y, linewidth=1.5)
     ax.set_title(title)
     ax.set_xlabel("timestamp")
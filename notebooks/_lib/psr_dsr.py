@@ -17,12 +17,52 @@ from typing import Optional
 import math
 import numpy as np
 
+try:  # Optional: JIT-compiles the single-pass moments (falls back to NumPy reductions)
+    import numba
+except Exception:  # pragma: no cover
+    numba = None  # type: ignore
+
 
 def _phi(x: float) -> float:
     # Standard normal CDF via erf.
     return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
 
 
+def _central_moments_loop(r: np.ndarray) -> tuple[float, float, float, float]:
+    # One pass (Terriberry's online update): mean and central sums of powers 2..4.
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(r.shape[0]):
+        k = i + 1.0
+        delta = r[i] - mean
+        delta_n = delta / k
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * i
+        mean += delta_n
+        m4 += term1 * delta_n2 * (k * k - 3.0 * k + 3.0) + 6.0 * delta_n2 * m2 - 4.0 * delta_n * m3
+        m3 += term1 * delta_n * (k - 2.0) - 3.0 * delta_n * m2
+        m2 += term1
+    return mean, m2, m3, m4
+
+
+if numba is not None:  # pragma: no cover
+    _central_moments_loop = numba.njit(cache=True)(_central_moments_loop)
+
+
+def _central_moments(r: np.ndarray) -> tuple[float, float, float, float]:
+    """
+    Mean and central sums (sum d**2, sum d**3, sum d**4) with d = r - mean.
+    """
+    if numba is not None:
+        return _central_moments_loop(r)
+    mean = float(np.mean(r))
+    d = r - mean
+    d2 = d * d
+    return mean, float(d2.sum()), float(np.dot(d2, d)), float(np.dot(d2, d2))
+
+
 @dataclass(frozen=True)
 class PsrResult:
     psr: float
@@ -47,17 +87,16 @@ def probabilistic_sharpe_ratio(
     if n < 2:
         return PsrResult(psr=0.0, sr=0.0, sr_ref=float(sr_ref), n=n)
 
-    mu = float(np.mean(r))
-    sd = float(np.std(r, ddof=1))
+    mu, m2, m3, m4 = _central_moments(r.ravel())
+    sd = math.sqrt(m2 / (n - 1.0))
     if not np.isfinite(sd) or sd <= 0:
         return PsrResult(psr=0.0, sr=0.0, sr_ref=float(sr_ref), n=n)
 
     sr = mu / sd
 
-    # Very lightweight moment estimates.
-    z = (r - mu) / sd
-    skew = float(np.mean(z**3))
-    kurt = float(np.mean(z**4))
+    # Very lightweight moment estimates: mean(z**3), mean(z**4) with z = (r - mu) / sd.
+    skew = m3 / n / sd**3
+    kurt = m4 / n / sd**4
 
     denom = 1.0 - skew * sr + ((kurt - 1.0) / 4.0) * (sr**2)
     if denom <= 0.0:
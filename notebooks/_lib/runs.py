@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import functools
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Iterable, Optional
 
+try:  # Optional: faster JSON decoding (falls back to stdlib json)
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 def _read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
 def _read_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(_read_text(path))
 
 
@@ -33,6 +42,23 @@ def _read_toml(path: Path) -> dict[str, Any]:
     return tomllib.loads(raw)
 
 
+def _file_key(path: Path) -> tuple[str, int, int]:
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+# Parsed run metadata keyed by (path, mtime_ns, size): rewriting a file invalidates its entry.
+# Cached objects are shared between load_run calls, so treat them as read-only.
+@functools.lru_cache(maxsize=256)
+def _cached_read_json(key: tuple[str, int, int]) -> Any:
+    return _read_json(Path(key[0]))
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_read_toml(key: tuple[str, int, int]) -> dict[str, Any]:
+    return _read_toml(Path(key[0]))
+
+
 @dataclass(frozen=True)
 class RunArtifacts:
     run_dir: Path
@@ -71,6 +97,12 @@ def list_runs(
 
 
 def load_run(run_dir: Path | str) -> RunArtifacts:
+    """
+    Load a run directory's metadata.
+
+    summary/config/manifest are memoized per file version; the returned dicts are shared across calls
+    and must not be mutated.
+    """
     run_dir = Path(run_dir)
     run_id = run_dir.name
 
@@ -81,9 +113,9 @@ def load_run(run_dir: Path | str) -> RunArtifacts:
     logs_path = run_dir / "logs.jsonl"
     manifest_path = run_dir / "manifest.json"
 
-    summary = _read_json(summary_path) if summary_path.exists() else None
-    config_snapshot = _read_toml(config_path) if config_path.exists() else None
-    manifest = _read_json(manifest_path) if manifest_path.exists() else None
+    summary = _cached_read_json(_file_key(summary_path)) if summary_path.exists() else None
+    config_snapshot = _cached_read_toml(_file_key(config_path)) if config_path.exists() else None
+    manifest = _cached_read_json(_file_key(manifest_path)) if manifest_path.exists() else None
 
     return RunArtifacts(
         run_dir=run_dir,
@@ -107,16 +139,22 @@ def latest_run(runs_dir: Path | str = Path("runs")) -> Optional[Path]:
 def iter_loaded_runs(
     runs: Iterable[Path],
     require_files: tuple[str, ...] = ("trades.csv", "equity.csv"),
+    max_workers: Optional[int] = None,
 ) -> Iterable[RunArtifacts]:
-    for run_dir in runs:
-        ok = True
-        for name in require_files:
-            if not (run_dir / name).exists():
-                ok = False
-                break
-        if not ok:
-            continue
-        yield load_run(run_dir)
+    """
+    Load the runs that have all `require_files`, in input order.
+
+    Runs are loaded on a thread pool (default: up to 32 threads) since load_run is mostly file I/O.
+    """
+    selected = [run_dir for run_dir in runs if all((run_dir / name).exists() for name in require_files)]
+    if not selected:
+        return
+    workers = max_workers if max_workers is not None else min(32, len(selected))
+    if workers <= 1:
+        yield from map(load_run, selected)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(load_run, selected)
 
 
 def select_runs_by_manifest(
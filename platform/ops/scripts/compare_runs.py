@@ -8,12 +8,14 @@ Checks:
   - summary.json (exact match after normalizing volatile fields)
 
 Usage:
-  platform/ops/scripts/compare_runs.py /path/to/runA /path/to/runB
+  platform/ops/scripts/compare_runs.py /path/to/runA /path/to/runB [--print-digest]
 """
 
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import filecmp
 import hashlib
 import json
 import os
@@ -23,11 +25,21 @@ from typing import Any, Dict, Tuple
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: the read/update loop runs in C.
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
+
+
+def sha256_pair(a: Path, b: Path) -> Tuple[str, str]:
+    # hashlib releases the GIL while digesting, so both files hash concurrently.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        fa = pool.submit(sha256_file, a)
+        fb = pool.submit(sha256_file, b)
+        return fa.result(), fb.result()
 
 
 def first_diff_line(a: Path, b: Path) -> Tuple[int, str, str]:
@@ -76,17 +88,28 @@ def ensure_run_dir(path: Path) -> None:
         raise SystemExit(f"not a directory: {path}")
 
 
-def compare_csv(name: str, a: Path, b: Path) -> bool:
+def compare_csv(name: str, a: Path, b: Path, *, print_digest: bool = False) -> bool:
     if not a.exists() or not b.exists():
         print(f"[ERR] missing {name}: {a} or {b}")
         return False
-    ha = sha256_file(a)
-    hb = sha256_file(b)
-    if ha == hb:
-        print(f"[OK]  {name}: identical ({ha[:12]})")
+    # Different sizes cannot match; equal sizes are compared byte-wise (stops at the first difference).
+    # Hashing is only needed when the digest is reported.
+    size_a = a.stat().st_size
+    size_b = b.stat().st_size
+    if size_a == size_b and filecmp.cmp(a, b, shallow=False):
+        if print_digest:
+            print(f"[OK]  {name}: identical ({sha256_file(a)[:12]})")
+        else:
+            print(f"[OK]  {name}: identical")
         return True
     line_no, la, lb = first_diff_line(a, b)
-    print(f"[DIFF] {name}: sha256 differs ({ha[:12]} != {hb[:12]})")
+    if print_digest:
+        ha, hb = sha256_pair(a, b)
+        print(f"[DIFF] {name}: sha256 differs ({ha[:12]} != {hb[:12]})")
+    elif size_a != size_b:
+        print(f"[DIFF] {name}: size differs ({size_a} != {size_b} bytes)")
+    else:
+        print(f"[DIFF] {name}: content differs")
     if line_no:
         print(f"       first diff at line {line_no}")
         print(f"       A: {la}")
@@ -118,6 +141,11 @@ def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("run_a", type=Path)
     parser.add_argument("run_b", type=Path)
+    parser.add_argument(
+        "--print-digest",
+        action="store_true",
+        help="report sha256 prefixes for the compared CSVs (hashes both files in full)",
+    )
     args = parser.parse_args()
 
     run_a = args.run_a
@@ -126,8 +154,9 @@ def main() -> int:
     ensure_run_dir(run_b)
 
     ok = True
-    ok &= compare_csv("equity.csv", run_a / "equity.csv", run_b / "equity.csv")
-    ok &= compare_csv("trades.csv", run_a / "trades.csv", run_b / "trades.csv")
+    digest = bool(args.print_digest)
+    ok &= compare_csv("equity.csv", run_a / "equity.csv", run_b / "equity.csv", print_digest=digest)
+    ok &= compare_csv("trades.csv", run_a / "trades.csv", run_b / "trades.csv", print_digest=digest)
     ok &= compare_summary(run_a / "summary.json", run_b / "summary.json")
 
     return 0 if ok else 2